@@ -0,0 +1 @@
+# Streamlit 화면 없이 실행하는 성능 측정 모음 (python -m benchmarks)
@@ -0,0 +1,98 @@
+# 성능 측정 실행 (프로젝트 폴더에서)
+#
+#   python -m benchmarks                       # 전체 측정 -> cache/benchmarks/<커밋>.json
+#   python -m benchmarks --only predict data   # 일부만 (load, data, predict, pages)
+#   python -m benchmarks --output result.json
+#   python -m benchmarks --compare 이전.json 이후.json   # 중앙값 기준 변화율 비교
+#
+# 결과 JSON은 커밋마다 저장해 두고 --compare로 비교하면 느려진 단계를 찾을 수 있음.
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import sys  # 명령줄 인수
+import json  # 결과 저장
+import argparse  # 명령줄 인수 처리
+
+# 측정 중에는 메트릭 엔드포인트를 띄우지 않음 (utils 모듈 import 전에 설정)
+os.environ.setdefault("BALAB_METRICS_PORT", "0")
+
+from utils.설정 import CACHE_DIR  # noqa: E402
+from benchmarks.공통 import environment  # noqa: E402
+
+SUITES = ["load", "data", "predict", "pages"]
+BENCHMARK_DIR = os.path.join(CACHE_DIR, "benchmarks")
+
+
+def run_suites(suites, quick=False):
+    results = {"environment": environment()}
+    if "load" in suites:
+        from benchmarks import 모델로드
+        print("모델 콜드 로드 측정 중...", file=sys.stderr)
+        results["load"] = 모델로드.run()
+    if "data" in suites:
+        from benchmarks import 데이터
+        print("CSV 읽기/레이더 조회 측정 중...", file=sys.stderr)
+        results["data"] = 데이터.run(runs=2 if quick else 5, lookups=200 if quick else 2000)
+    if "predict" in suites:
+        from benchmarks import 예측
+        print("예측 처리량 측정 중...", file=sys.stderr)
+        results["predict"] = 예측.run(sizes=[1, 1000] if quick else 예측.BATCH_SIZES)
+    if "pages" in suites:
+        from benchmarks import 페이지
+        print("페이지 재실행 측정 중...", file=sys.stderr)
+        results["pages"] = 페이지.run(reruns=2 if quick else 5)
+    return results
+
+
+def _medians(node, prefix=""):
+    # 결과 JSON에서 (경로, 중앙값 또는 단일 측정값)을 모두 꺼냄
+    if not isinstance(node, dict):
+        return {}
+    found = {}
+    for key, value in node.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict) and "median_seconds" in value:
+            found[path] = value["median_seconds"]
+        elif key.endswith("_seconds") and isinstance(value, (int, float)):
+            found[path] = value
+        elif isinstance(value, dict) and key != "environment":
+            found.update(_medians(value, path))
+    return found
+
+
+def compare(before_path, after_path, threshold=0.10):
+    # 두 결과 파일의 중앙값을 비교해 threshold 이상 느려진 항목 수를 반환
+    with open(before_path, encoding="utf-8") as f:
+        before = _medians(json.load(f))
+    with open(after_path, encoding="utf-8") as f:
+        after = _medians(json.load(f))
+    regressions = 0
+    for path in sorted(before.keys() & after.keys()):
+        old, new = before[path], after[path]
+        change = (new - old) / old if old else 0.0
+        mark = "▲" if change >= threshold else "▼" if change <= -threshold else " "
+        regressions += change >= threshold
+        print(f"{mark} {path}: {old * 1000:.3f}ms -> {new * 1000:.3f}ms ({change * 100:+.1f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="BALAB 성능 측정")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES, help="실행할 측정 종류")
+    parser.add_argument("--quick", action="store_true", help="반복 횟수를 줄이고 10만 행 예측을 건너뜀")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: cache/benchmarks/<커밋>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="두 결과 JSON 비교")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare(*args.compare) else 0
+
+    results = run_suites(args.only, args.quick)
+    output = args.output or os.path.join(BENCHMARK_DIR, f"{results['environment']['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
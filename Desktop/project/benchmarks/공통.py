@@ -0,0 +1,74 @@
+# 측정 공용 함수: 반복 측정 요약, 최대 메모리, 실행 환경 정보
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import sys  # 실행 환경 확인
+import time  # 시간 측정
+import platform  # 실행 환경 정보
+import subprocess  # git 커밋 확인
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import PROJECT_DIR
+
+
+def summarize(samples):
+    # 측정값 목록(초)을 최소/중앙값/p90/최대로 요약
+    samples = np.asarray(samples, dtype=float)
+    return {
+        "runs": int(len(samples)),
+        "min_seconds": float(samples.min()),
+        "median_seconds": float(np.median(samples)),
+        "p90_seconds": float(np.quantile(samples, 0.9)),
+        "max_seconds": float(samples.max()),
+    }
+
+
+def repeat(func, runs=5, warmup=1):
+    # func()를 warmup번 버리고 runs번 측정해 요약과 마지막 결과를 반환
+    for _ in range(warmup):
+        func()
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples), result
+
+
+def get_peak_rss_mb():
+    # 프로세스 시작 이후 최대 상주 메모리(MB) (맥은 바이트, 리눅스는 KB 단위)
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def git_commit():
+    # 측정한 소스의 커밋 (git이 없거나 저장소가 아니면 None)
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True,
+        )
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--", "."], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    # 결과를 비교할 때 같은 환경인지 확인하기 위한 정보
+    import pandas as pd
+    import sklearn
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
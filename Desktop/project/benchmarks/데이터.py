@@ -0,0 +1,111 @@
+# 팀 성과 CSV 읽기 시간, 레이더 차트 데이터 조회 지연 시간 (5, 6페이지), 팀 지표 추세 조회 시간 (7페이지)
+import time  # 시간 측정
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import TEAM_METRICS_FILE, TEAM_AVERAGES_FILE, COLUMNS_FOR_SPIDER
+from utils.데이터캐시 import read_table
+from utils.팀데이터 import read_team_metrics, read_team_averages, TeamMetricsStore, RADAR_COLUMNS, INDEX_COLUMNS
+from utils.레이더 import RadarPayloads
+from utils.순위 import TeamRankings
+from utils.유사팀 import SimilarSeasons
+from benchmarks.공통 import repeat, summarize
+
+
+def parse_times(runs=5):
+    # CSV 원본 파싱과 Feather 캐시 읽기 (레이더 페이지가 쓰는 열만)
+    results = {}
+    for source_name, reader in [(TEAM_METRICS_FILE, read_team_metrics), (TEAM_AVERAGES_FILE, read_team_averages)]:
+        csv, data = repeat(reader, runs)
+        results[source_name] = {"rows": int(len(data)), "columns": int(data.shape[1]), "read_csv": csv}
+    columns = INDEX_COLUMNS + RADAR_COLUMNS
+    results[TEAM_METRICS_FILE]["read_feather_radar_columns"], _ = repeat(
+        lambda: read_table(TEAM_METRICS_FILE, read_team_metrics, columns), runs
+    )
+    return results
+
+
+def radar_lookup_latency(lookups=2000, seed=0):
+    # 5페이지(팀 하나)와 6페이지(팀 둘)가 재실행마다 하는 조회: 무작위 팀-시즌으로 한 번씩 측정
+    data = read_team_metrics()
+    store = TeamMetricsStore(data[INDEX_COLUMNS + RADAR_COLUMNS])
+    keys = list(store.data.index)
+    rng = np.random.default_rng(seed)
+    picks = [keys[i] for i in rng.integers(len(keys), size=lookups)]
+    diff_columns = [col + '_diff' for col in COLUMNS_FOR_SPIDER]
+    store.values(*picks[0], diff_columns)  # 열 행렬을 미리 만들어 둠 (페이지에서도 프로세스당 한 번)
+
+    def timed_lookups(lookup, keys=picks):
+        samples = []
+        for key in keys:
+            start = time.perf_counter()
+            lookup(key)
+            samples.append(time.perf_counter() - start)
+        return summarize(samples)
+
+    # 5, 6페이지: 미리 계산한 레이더 차트 데이터에서 시리즈 항목을 꺼냄
+    payloads = RadarPayloads.from_store(store)
+
+    def page5(key):
+        return payloads.series_item(*key, "#FF5733")
+
+    def page6(key):
+        return page5(key), payloads.series_item(*picks[-1], "#3375FF")
+
+    # 비교용: 미리 계산하지 않고 저장소에서 한 행을 읽어 반올림하는 방식
+    def store_lookup(key):
+        values = store.values(*key, diff_columns)
+        return [round(val, 3) for val in values.tolist()]
+
+    # 비교용: 저장소 도입 전처럼 매번 전체 데이터에 불리언 마스크를 적용하는 방식 (느려서 200회만)
+    def boolean_mask(key):
+        year, league, team = key
+        mask = (data["year"] == year) & (data["league_id"] == league) & (data["team_id"] == team)
+        return data.loc[mask, diff_columns].iloc[0].round(3).tolist()
+
+    # 리그 내 순위: 팀 하나의 백분위/표준 점수 조회와 전체 순위 행렬 계산
+    rankings = TeamRankings.from_store(store)
+
+    def rank_lookup(key):
+        return rankings.get(*key)
+
+    # 비슷한 팀-시즌 5개 (KD-트리 조회)
+    similar = SimilarSeasons.from_store(store)
+
+    def similar_query(key):
+        return similar.query(*key, k=5)
+
+    return {
+        "team_seasons": len(keys),
+        "page5_single_team": timed_lookups(page5),
+        "page6_two_teams": timed_lookups(page6),
+        "store_lookup_baseline": timed_lookups(store_lookup),
+        "payload_build": repeat(lambda: RadarPayloads.from_store(store), 3)[0],
+        "boolean_mask_baseline": timed_lookups(boolean_mask, picks[:200]),
+        "rank_lookup": timed_lookups(rank_lookup),
+        "rank_build": repeat(lambda: TeamRankings.from_store(store), 3)[0],
+        "similar_query": timed_lookups(similar_query),
+        "similar_build": repeat(lambda: SimilarSeasons.from_store(store), 3)[0],
+    }
+
+
+def trend_latency(runs=200):
+    # 팀 지표 추세 페이지: 가장 긴 팀 시계열의 구간 조회 + 이동 통계, LTTB 점 수 줄이기
+    from utils.팀추세 import TeamTrendStore, downsample_lttb
+
+    store = TeamTrendStore(read_team_averages())
+    team = store.teams[0]
+    metric = store.metrics[0]
+    years, _, mean, _ = store.trend(team, metric, 5)
+    return {
+        "team": team,
+        "seasons": int(len(years)),
+        "build": repeat(lambda: TeamTrendStore(read_team_averages()), 3)[0],
+        "trend_full_history": repeat(lambda: store.trend(team, metric, 5), runs)[0],
+        "trend_20_seasons": repeat(lambda: store.trend(team, metric, 5, int(years[-20]), int(years[-1])), runs)[0],
+        "downsample_lttb": repeat(lambda: downsample_lttb(years, mean), runs)[0],
+    }
+
+
+def run(runs=5, lookups=2000):
+    return {"parse": parse_times(runs), "radar_lookup": radar_lookup_latency(lookups), "trend": trend_latency()}
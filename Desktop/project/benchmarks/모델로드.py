@@ -0,0 +1,74 @@
+# 모델 파일 콜드 로드 시간과 최대 메모리
+#
+# 같은 프로세스에서 두 번째로 로드하면 파일이 페이지 캐시에 남아 있고 클래스도 이미
+# import되어 있어 실제 첫 로드보다 빠르게 나옴. 모델마다 새 파이썬 프로세스를 띄워
+# 한 번씩만 로드하고, 그 프로세스의 최대 RSS를 기록함.
+# sklearn/numpy import 비용은 로드 전에 미리 치르므로 결과에는 파일 로드만 포함됨.
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import sys  # 하위 프로세스 실행
+import json  # 하위 프로세스 결과 전달
+import time  # 시간 측정
+import subprocess  # 모델마다 새 프로세스
+
+from utils.설정 import MODEL_FILES, PIPELINES, PROJECT_DIR, project_path
+
+
+def _load_in_this_process(name, kind):
+    # 하위 프로세스에서 실행: 로드 한 번의 시간과 메모리를 JSON 한 줄로 출력
+    import joblib  # noqa: F401  (import 비용 제외)
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+    from utils.공통함수 import get_rss_mb, load_model, get_predictor, get_pipeline
+    from benchmarks.공통 import get_peak_rss_mb
+
+    rss_before = get_rss_mb()
+    start = time.perf_counter()
+    if kind == "pickle":
+        load_model(name)
+    elif kind == "predictor":
+        get_predictor(name)
+    else:
+        get_pipeline(name)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "load_seconds": elapsed,
+        "rss_delta_mb": get_rss_mb() - rss_before,
+        "peak_rss_mb": get_peak_rss_mb(),
+        "baseline_rss_mb": rss_before,
+    }))
+
+
+def cold_load(name, kind="pickle"):
+    # 새 프로세스에서 한 번 로드한 결과 (실패하면 error 항목에 이유를 기록)
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.모델로드", name, kind],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+        env={**os.environ, "BALAB_METRICS_PORT": "0"},
+    )
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["unknown error"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(names=None):
+    # pkl 원본, flat 배열 변환본(mmap), 스케일러를 합친 파이프라인의 콜드 로드
+    from utils.모델저장 import read_meta, is_fresh
+
+    results = {}
+    for name in names or MODEL_FILES:
+        path = project_path(MODEL_FILES[name])
+        entry = {"file": MODEL_FILES[name], "file_mb": os.path.getsize(path) / (1024 * 1024) if os.path.exists(path) else None}
+        entry["pickle"] = cold_load(name, "pickle")
+        if is_fresh(read_meta(name)):
+            entry["predictor_mmap"] = cold_load(name, "predictor")
+        results[name] = entry
+    for name in PIPELINES:
+        if names and not any(part in names for part in PIPELINES[name]):
+            continue
+        if is_fresh(read_meta(name)):
+            results[name] = {"pipeline_mmap": cold_load(name, "pipeline")}
+    return results
+
+
+if __name__ == "__main__":
+    _load_in_this_process(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else "pickle")
@@ -0,0 +1,62 @@
+# 한 행 예측 지연 시간과 1천/10만 행 예측 처리량
+#
+# 페이지가 실제로 쓰는 예측기(get_predictor/get_pipeline: 변환본이 있으면 mmap FlatForest,
+# 없으면 pkl 모델)를 그대로 측정함. 한 행은 배치 서비스(작업 프로세스 풀 포함)를
+# 거친 경우도 함께 측정해 페이지에서 버튼 한 번에 걸리는 시간과 비교할 수 있게 함.
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import PIPELINES
+from utils.공통함수 import get_predictor, get_pipeline
+from utils.추론엔진 import predict_with_proba_timed, sample_inputs
+from utils.배치서버 import BATCHED_MODELS, predict_row
+from benchmarks.공통 import repeat
+
+# 측정할 예측기: 이름 -> (불러오는 함수, 배치 서비스 모델 이름 또는 None)
+PREDICTORS = {
+    "rf_model": (get_predictor, "rf_model"),
+    **{name: (get_pipeline, None) for name in PIPELINES},
+}
+for _model_name, _pipeline_name in BATCHED_MODELS.items():
+    if _pipeline_name in PREDICTORS:
+        PREDICTORS[_pipeline_name] = (get_pipeline, _model_name)
+
+BATCH_SIZES = [1, 1000, 100000]
+
+
+def _inputs(predictor, n_rows, seed=0):
+    # 분기 기준값 근처의 입력 (flat 배열이 없는 pkl 모델은 표준정규분포 입력)
+    if hasattr(predictor, "threshold"):
+        return sample_inputs(predictor, n_rows, seed)
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n_rows, predictor.n_features_in_))
+
+
+def _predict_func(name, predictor, X):
+    if name == "rf_model":
+        return lambda: predict_with_proba_timed(predictor, X)
+    return lambda: predictor.predict(X)
+
+
+def run(names=None, sizes=BATCH_SIZES):
+    results = {}
+    for name, (load, batched_model) in PREDICTORS.items():
+        if names and name not in names:
+            continue
+        try:
+            predictor = load(name)
+        except (OSError, KeyError, EOFError, ValueError) as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        entry = {"predictor": type(predictor).__name__}
+        for n_rows in sizes:
+            X = _inputs(predictor, n_rows)
+            # 큰 배치는 한 번에 오래 걸리므로 반복 횟수를 줄임
+            runs = 200 if n_rows == 1 else 20 if n_rows <= 1000 else 3
+            summary, _ = repeat(_predict_func(name, predictor, X), runs)
+            summary["rows_per_second"] = n_rows / summary["median_seconds"]
+            entry[f"rows_{n_rows}"] = summary
+        if batched_model is not None:
+            row = _inputs(predictor, 1)[0]
+            entry["batcher_single_row"], _ = repeat(lambda: predict_row(batched_model, row), 50)
+        results[name] = entry
+    return results
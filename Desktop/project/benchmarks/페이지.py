@@ -0,0 +1,62 @@
+# 페이지 스크립트 전체 재실행 시간 (Streamlit AppTest, 브라우저 없이 실행)
+#
+# 페이지마다 첫 실행(이 프로세스에서 처음 여는 경우), 같은 입력으로 다시 실행한 경우,
+# 첫 번째 버튼(예측/분석)을 누른 경우를 측정함. 같은 버튼을 다시 누르면 예측 결과 캐시를
+# 쓰므로 button_repeat는 캐시 적중 시의 재실행 시간임.
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import glob  # 페이지 파일 목록
+import time  # 시간 측정
+
+from utils.설정 import PROJECT_DIR
+from benchmarks.공통 import summarize
+
+MAIN_PAGE = "데이터톤_메인.py"
+
+
+def page_files():
+    # 메인 페이지 + pages 폴더의 페이지 (사이드바 순서)
+    return [os.path.join(PROJECT_DIR, MAIN_PAGE)] + sorted(glob.glob(os.path.join(PROJECT_DIR, "pages", "*.py")))
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    errors = [str(e.value) for e in at.exception]
+    return elapsed, errors
+
+
+def measure_page(path, reruns=5, timeout=120):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(path, default_timeout=timeout)
+    first, errors = _timed_run(at)
+    entry = {"first_run_seconds": first}
+    if errors:
+        entry["errors"] = errors
+        return entry
+
+    entry["rerun"] = summarize([_timed_run(at)[0] for _ in range(reruns)])
+    if len(at.button):
+        entry["button"] = at.button[0].label
+        at.button[0].click()
+        entry["button_first_seconds"], errors = _timed_run(at)
+        if errors:
+            entry["errors"] = errors
+            return entry
+        samples = []
+        for _ in range(reruns):
+            at.button[0].click()
+            samples.append(_timed_run(at)[0])
+        entry["button_repeat"] = summarize(samples)
+    return entry
+
+
+def run(pages=None, reruns=5):
+    results = {}
+    for path in page_files():
+        name = os.path.basename(path)
+        if pages and not any(p in name for p in pages):
+            continue
+        results[name] = measure_page(path, reruns)
+    return results
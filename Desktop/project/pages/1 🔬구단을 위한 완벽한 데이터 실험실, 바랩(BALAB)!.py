@@ -10,6 +10,8 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.이미지 import get_slider_html, best_image  # 포스터 슬라이더 HTML (프로세스 캐시), 크기별 변환 이미지
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 # 페이지 설정
 st.set_page_config(
@@ -18,6 +20,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("1_balab")
+
 
 
 # 사이드바 상단에 제목 추가
@@ -51,11 +56,6 @@ menu = st.sidebar.radio(
 if menu == "바랩(BALAB)":
     
 
-    # Base64로 이미지 변환 함수
-    def image_to_base64(image_path):
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    
     # 이미지 파일 경로 설정
     # 현재 파일 기준 디렉토리 설정
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -69,86 +69,12 @@ if menu == "바랩(BALAB)":
         "003.png",  # 세 번째 이미지
         
     ]
-    image_files = [os.path.join(image_folder, f) for f in image_files]
-    
-    # HTML로 이미지 슬라이더 생성
-    slider_html = f"""
-    <div style="display: flex; align-items: center; justify-content: center; padding: 100px;">
-      <div style="max-width: 891px; max-height: 1260px; border: 2px solid #ddd; border-radius: 10px; overflow: hidden;">
-        <div class="slideshow-container">
-            {''.join(f'''
-            <div class="mySlides fade">
-                <img src="data:image/png;base64,{image_to_base64(img)}" style="width: 100%; height: auto; object-fit: contain;">
-                <div class="caption">{caption}</div>
-            </div>
-            ''' for img, caption in zip(image_files, ['"연봉?그거_어떻게_아는건데_바랩(BALAB)_포스터"', '"이_선수_계속_뛸_수_있을까?_바랩(BALAB)_포스터"', '"올해_안엔_가을야구_가능할까?_바랩(BALAB)_포스터"', "네 번째 이미지 캡션"]))}
-        </div>
-      </div>
-    </div>
-
-    <style>
-    .slideshow-container {{
-      position: relative;
-      max-width: 700px; /* 컨테이너 너비를 제한 */
-      margin: auto;
-    }}
-
-    .mySlides {{
-      display: none;
-      text-align: center; /* 캡션을 중앙 정렬 */
-    }}
-
-    .fade {{
-      -webkit-animation-name: fade;
-      -webkit-animation-duration: 1.5s;
-      animation-name: fade;
-      animation-duration: 1.5s;
-    }}
-
-    @-webkit-keyframes fade {{
-      from {{opacity: .4}} 
-      to {{opacity: 1}}
-    }}
-
-    @keyframes fade {{
-      from {{opacity: .4}} 
-      to {{opacity: 1}}
-    }}
-
-    .slideshow-container img {{
-      border-radius: 10px;
-    }}
-
-    .caption {{
-      background-color: rgba(0, 0, 0, 0.5); /* 반투명한 검정 배경 */
-      color: white; /* 텍스트 색상 */
-      padding: 10px;
-      font-size: 16px;
-      position: absolute;
-      bottom: 0; /* 이미지 하단에 배치 */
-      width: 100%; /* 캡션 너비를 이미지에 맞춤 */
-      text-align: center; /* 중앙 정렬 */
-      box-sizing: border-box; /* 패딩 포함 크기 계산 */
-    }}
-    </style>
-
-    <script>
-    var slideIndex = 0;
-    showSlides();
-
-    function showSlides() {{
-      var i;
-      var slides = document.getElementsByClassName("mySlides");
-      for (i = 0; i < slides.length; i++) {{
-        slides[i].style.display = "none";
-      }}
-      slideIndex++;
-      if (slideIndex > slides.length) {{slideIndex = 1}}
-      slides[slideIndex-1].style.display = "block";
-      setTimeout(showSlides, 5000); // Change image every 5 seconds
-    }}
-    </script>
-    """
+    # 슬라이더 표시 너비(700px)에 맞게 변환된 WebP가 있으면 그 파일을 사용
+    image_files = [best_image(os.path.join(image_folder, f), 700) for f in image_files]
+    captions = ['"연봉?그거_어떻게_아는건데_바랩(BALAB)_포스터"', '"이_선수_계속_뛸_수_있을까?_바랩(BALAB)_포스터"', '"올해_안엔_가을야구_가능할까?_바랩(BALAB)_포스터"']
+
+    # HTML로 이미지 슬라이더 생성 (Base64 인코딩 결과는 프로세스 안에서 재사용)
+    slider_html = get_slider_html(image_files, captions)
 
     
     # 레이아웃 구성
@@ -203,7 +129,7 @@ if menu == "바랩(BALAB)":
         )
 
         st.image(
-        "images/005.png",  # 이미지 경로
+        best_image(os.path.join(image_folder, "005.png"), 700),  # 이미지 경로 (700px용 변환본 우선)
         caption="구단을 위한 완벽한 데이터 실험실, BALAB!",  # 이미지 캡션
         width=700,  # 이미지 너비 설정
         use_container_width=False  # 컨테이너 너비 사용 여부
@@ -575,3 +501,5 @@ else:
             - **정지훈** - Streamlit 구현 및 발표 자료 제작  
             """
         )
+
+page_run.finish()
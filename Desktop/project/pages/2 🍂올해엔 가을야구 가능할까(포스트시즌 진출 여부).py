@@ -10,6 +10,13 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.공통함수 import get_predictor, run_stages, show_model_stats  # 프로세스 공용 모델 레지스트리
+from utils.예측캐시 import cached_predict  # 같은 입력의 예측 결과 재사용
+from utils.배치서버 import get_batcher  # 동시 요청을 모아 한 번에 예측
+from utils.배치예측 import score_frame  # 여러 팀-시즌 일괄 예측
+from utils.팀데이터 import get_team_store  # 팀 성과 데이터 저장소
+from utils.피처벡터 import get_schema  # 모델 입력 벡터 조립
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 
 # 페이지 설정
@@ -19,6 +26,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("2_postseason")
+
 # 사이드바 상단에 제목 추가
 with st.sidebar:
     st.markdown(
@@ -38,18 +48,12 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
 
-# 현재 파일의 디렉토리 경로 설정
-base_dir = os.path.dirname(os.path.abspath(__file__))
-
-# 모델 파일 경로 설정 (루트 디렉토리 기준으로 변경)
-model_path = os.path.join(base_dir, "../rf_model.pkl")
-
- # 모델 로드
-with open(model_path, "rb") as file:
-    model = pickle.load(file)
+# 모델 로드 (프로세스당 한 번만 로드되고 이후 재실행에서는 재사용)
+# flat 배열 변환본이 있으면 벡터화 엔진으로, 없으면 sklearn 모델로 예측
+model = get_predictor("rf_model")
 
-# 학습에 사용된 모든 feature 확인
-all_features = model.feature_names_in_
+# 입력 피처가 모델의 어느 열에 들어가는지 담은 스키마 (나머지 피처는 0)
+postseason_schema = get_schema("postseason")
 
 # 사용자에게 입력받을 주요 변수와 기본값 설정
 important_features_defaults = {
@@ -71,53 +75,100 @@ left_col, right_col = st.columns(2)
 # 왼쪽 열: 예측 기능
 with left_col:
     st.header("[포스트시즌 진출 여부 예측]")
-    inputs = {}
-    for feature, default_value in important_features_defaults.items():
-        inputs[feature] = st.number_input(f"{feature} 입력", min_value=0.0, value=default_value)
-
-    if st.button("🤖바랩! 예측해줘!"):
-        try:
-            # 모든 feature를 0으로 초기화
-            input_data = {feature: 0 for feature in all_features}
-
-            # 입력받은 feature만 사용자 입력값으로 업데이트
-            for feature, value in important_features_defaults.items():
-                input_data[feature] = inputs[feature]
-
-            # DataFrame 생성
-            input_data_df = pd.DataFrame([input_data])
 
-            # 동적 문구 컨테이너 생성
-            progress_message = st.empty()
-
-            # 로딩 메시지 업데이트
-            for i in range(5):
-                message = f"🤖바랩이 가을야구를 할 수 있을지 예측 중이에요{'.' * (i + 1)}"
-                progress_message.text(message)  # 메시지 업데이트
-                time.sleep(1)  # 1초 대기
-
-            # 예측 수행
-            prediction = model.predict(input_data_df)
-            prob = model.predict_proba(input_data_df)[0][1]
-
-            # 로딩 메시지 완료 문구로 교체
-            progress_message.text("🤖바랩이 가을야구를 할 수 있을지 예측했어요!")
-
-            # 결과 출력
-            result = "🙆🏻‍♀️올해엔 포스트 시즌 진출 가능성이 높습니다!🙆🏻‍♂️" if prediction[0] == 1 else "🤦🏻‍♀️올해엔 포스트 시즌 진출 가능성이 낮습니다🤦🏻‍♂️"
-            st.subheader(f"바랩이 예측한 결과는?: {result}")
-            st.write(f"바랩이 예측한 진출 확률은 {prob*100:.2f}% 입니다!")
-
-            # 간단한 분석
-            st.subheader("📜바랩이 알려주는 포스트 시즌 진출이 어려운 이유 간단분석!📜:")
-            if input_data['승률'] < 0.5:
-                st.write("⚠️ 승률이 낮습니다. 더 많은 승리가 필요합니다.")
-            if input_data['총_실점수'] > 700:
-                st.write("⚠️ 총 실점수가 많습니다. 투수력 강화가 필요합니다.")
-            if input_data['세이브_횟수'] < 30:
-                st.write("⚠️ 세이브 횟수가 적습니다. 마무리 투수의 안정이 필요합니다.")
-        except Exception as e:
-            st.error(f"예측 중 오류 발생: {e}")
+    # 예측 방식 선택: 한 팀씩 입력하거나, 여러 팀-시즌을 한 번에 예측
+    mode = st.radio("예측 방식을 선택하세요:", ("단일 팀 예측", "일괄 예측"), horizontal=True)
+
+    if mode == "단일 팀 예측":
+        inputs = {}
+        for feature, default_value in important_features_defaults.items():
+            inputs[feature] = st.number_input(f"{feature} 입력", min_value=0.0, value=default_value)
+
+        if st.button("🤖바랩! 예측해줘!"):
+            try:
+                # 입력값을 모델 피처 순서의 float32 벡터로 변환 (열 순서는 스키마에 저장돼 있어 DataFrame 불필요)
+                input_vector = postseason_schema.row(inputs)
+
+                # 예측 수행 (실제 예측이 끝나면 진행 표시를 완료 문구로 교체)
+                # 같은 입력으로 이미 예측한 적이 있으면 저장된 결과를 재사용
+                timings = {}
+
+                def predict_once(_):
+                    # 동시에 들어온 다른 세션의 요청과 한 배치로 예측하고 단계별 소요 시간을 받아옴
+                    future = get_batcher("rf_model").submit(input_vector)
+                    result = future.result()
+                    timings.update(future.timings)
+                    return result
+
+                (label, row_proba), cache_hit = cached_predict(
+                    ["rf_model"],
+                    input_vector,
+                    lambda: run_stages(
+                        "🤖바랩이 가을야구를 할 수 있을지 예측 중이에요...",
+                        [("모델 예측", predict_once)],
+                        "🤖바랩이 가을야구를 할 수 있을지 예측했어요!",
+                    ),
+                )
+                if cache_hit:
+                    st.caption("⚡ 같은 입력의 이전 예측 결과를 재사용했어요")
+                else:
+                    st.caption(
+                        f"⏱️ 배치 대기 {timings['batch_wait'] * 1000:.2f}ms · 검증 {timings['validation'] * 1000:.2f}ms · "
+                        f"변환 {timings['conversion'] * 1000:.2f}ms · 트리 순회 {timings['traversal'] * 1000:.2f}ms"
+                    )
+                prediction, proba = [label], [row_proba]
+                prob = proba[0][1]
+
+                # 결과 출력
+                result = "🙆🏻‍♀️올해엔 포스트 시즌 진출 가능성이 높습니다!🙆🏻‍♂️" if prediction[0] == 1 else "🤦🏻‍♀️올해엔 포스트 시즌 진출 가능성이 낮습니다🤦🏻‍♂️"
+                st.subheader(f"바랩이 예측한 결과는?: {result}")
+                st.write(f"바랩이 예측한 진출 확률은 {prob*100:.2f}% 입니다!")
+
+                # 간단한 분석
+                st.subheader("📜바랩이 알려주는 포스트 시즌 진출이 어려운 이유 간단분석!📜:")
+                if inputs['승률'] < 0.5:
+                    st.write("⚠️ 승률이 낮습니다. 더 많은 승리가 필요합니다.")
+                if inputs['총_실점수'] > 700:
+                    st.write("⚠️ 총 실점수가 많습니다. 투수력 강화가 필요합니다.")
+                if inputs['세이브_횟수'] < 30:
+                    st.write("⚠️ 세이브 횟수가 적습니다. 마무리 투수의 안정이 필요합니다.")
+            except Exception as e:
+                st.error(f"예측 중 오류 발생: {e}")
+
+    else:
+        st.write("팀 성과 데이터 전체 또는 업로드한 CSV의 모든 팀-시즌을 한 번에 예측합니다.")
+        source = st.radio("데이터 선택:", ("팀 성과 데이터 전체 (1871~2015)", "CSV 업로드"))
+        if source == "CSV 업로드":
+            uploaded = st.file_uploader("팀 성과 CSV 파일", type="csv")
+            batch_data = pd.read_csv(uploaded) if uploaded is not None else None
+        else:
+            batch_data = get_team_store().data.reset_index()
+
+        if batch_data is not None and st.button("🤖바랩! 한 번에 예측해줘!"):
+            try:
+                # 실제로 예측한 행 수만큼 진행 표시 갱신
+                progress_bar = st.progress(0.0, text="🤖바랩이 팀들의 가을야구 가능성을 예측 중이에요...")
+                batch_result, feature_mapping = score_frame(
+                    model, batch_data,
+                    on_progress=lambda done, total: progress_bar.progress(
+                        done / total, text=f"🤖바랩이 팀들의 가을야구 가능성을 예측 중이에요... ({done:,}/{total:,})"
+                    ),
+                )
+                progress_bar.empty()
+
+                st.success(f"🤖바랩이 {len(batch_result):,}개 팀-시즌을 예측했어요! (진출 예측 {(batch_result['포스트시즌_진출_예측'] == '진출').sum():,}개)")
+                missing = [feature for feature, column in feature_mapping.items() if column is None]
+                if missing:
+                    st.caption(f"⚠️ 데이터에 없어 0으로 채운 피처 {len(missing)}개: {', '.join(missing)}")
+                st.dataframe(batch_result, use_container_width=True)
+                st.download_button(
+                    "📥 예측 결과 다운로드 (CSV)",
+                    batch_result.to_csv(index=False).encode("utf-8-sig"),
+                    file_name="포스트시즌_일괄_예측.csv",
+                    mime="text/csv",
+                )
+            except Exception as e:
+                st.error(f"예측 중 오류 발생: {e}")
 
 
 
@@ -145,3 +196,6 @@ with right_col:
     이 모델은 향후 팀의 연간 성적을 예측하거나 특정 선수의 성과를 추적하는 데 확장될 수 있습니다. 
     MLB 구단뿐만 아니라 다양한 스포츠 팀에서도 활용 가능한 데이터 기반 솔루션입니다.
     """)
+    show_model_stats(["rf_model"])
+
+page_run.finish()
@@ -10,6 +10,12 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.공통함수 import run_stages, show_model_stats  # 프로세스 공용 모델 레지스트리
+from utils.예측캐시 import cached_predict  # 같은 입력의 예측 결과 재사용
+from utils.배치서버 import predict_row  # 동시 요청을 모아 한 번에 예측
+from utils.연봉엔진 import estimate_roster, roster_template  # 로스터 일괄 연봉 예측
+from utils.피처벡터 import get_schema  # 모델 입력 벡터 조립
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 
 # 페이지 설정
@@ -19,6 +25,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("3_salary")
+
 # 사이드바 상단에 제목 추가
 with st.sidebar:
     st.markdown(
@@ -38,16 +47,12 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
 
-# 모델 및 스케일러 로드
-hitter_model = joblib.load("hitter_model.pkl")  # 타자 모델 파일
-hitter_scaler = joblib.load("hitter_scaler.pkl")  # 타자 스케일러 파일
-
-pitcher_model = joblib.load("pitcher_model.pkl")  # 투수 모델 파일
-pitcher_scaler = joblib.load("pitcher_scaler.pkl")  # 투수 스케일러 파일
+# 스케일러와 모델(또는 둘을 합친 파이프라인)은 배치 서비스(utils/배치서버.py)가
+# 첫 예측 때 한 번만 로드해서 모든 세션이 함께 사용함
 
-# 각 컬럼의 평균값 (임의 데이터로 설정)
-hitter_avg_values = np.full(80, 100.0)  # 타자: 모델이 요구하는 80개의 피처 평균값
-pitcher_avg_values = np.full(67, 50.0)  # 투수: 모델이 요구하는 67개의 피처 평균값
+# 입력하지 않은 피처는 평균값(타자 100, 투수 50)으로 채우는 입력 스키마
+hitter_schema = get_schema("hitter_salary")
+pitcher_schema = get_schema("pitcher_salary")
 
 # Streamlit UI
 st.title("💰올해는 얼마나 받을 수 있을까?: 야구선수 연봉 예측💰")
@@ -79,27 +84,30 @@ if "연봉 예측":
             on_base = st.number_input("출루율 (On Base Percentage)", min_value=0.0, max_value=1.0, value=0.4)
 
             # 사용자 입력값을 배열로 변환
-            input_data = hitter_avg_values.copy()  # 평균값으로 초기화
-            input_data[:10] = [hits, strikeouts, homeruns, stolen_bases, caught_stealing, games, at_bats, slugging, avg, on_base]
+            input_data = hitter_schema.row([hits, strikeouts, homeruns, stolen_bases, caught_stealing, games, at_bats, slugging, avg, on_base])
 
             # 예측 버튼
             if st.button("🤖바랩! 예측해줘!", key="hitter_predict"):
-                # 결과 로딩 애니메이션
-                progress_message = st.empty()
-                for i in range(5):
-                    message = f"🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 중이에요{'.' * (i + 1)}"
-                    progress_message.text(message)
-                    time.sleep(1)
-
-                # 입력 데이터를 스케일링
-                scaled_data = hitter_scaler.transform([input_data])
-
-                # 모델 예측
-                prediction = hitter_model.predict(scaled_data)
-
-                # 최종 메시지 및 결과 출력
-                progress_message.text("🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 했어요!")
-                st.success(f"🤖바랩이 예측한 타자의 연봉은: ${int(prediction[0]):,},000")
+                try:
+                    # 같은 입력으로 이미 예측한 적이 있으면 스케일링과 예측을 건너뜀
+                    prediction, cache_hit = cached_predict(
+                        ["hitter_scaler", "hitter_model"],
+                        input_data,
+                        lambda: run_stages(
+                            "🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 중이에요...",
+                            # 동시에 들어온 다른 세션의 요청과 한 배치로 스케일링/예측
+                            [("모델 예측", lambda _: [predict_row("hitter_model", input_data)])],
+                            "🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 했어요!",
+                        ),
+                    )
+                    if cache_hit:
+                        st.caption("⚡ 같은 입력의 이전 예측 결과를 재사용했어요")
+
+                    # 결과 출력
+                    st.success(f"🤖바랩이 예측한 타자의 연봉은: ${int(prediction[0]):,},000")
+                except TimeoutError as e:
+                    # 작업 프로세스의 예측이 시간 안에 끝나지 않은 경우 (utils/프로세스풀.py)
+                    st.error(str(e))
 
         elif player_type == "투수":
             # 투수 입력 필드
@@ -112,27 +120,60 @@ if "연봉 예측":
             strikeouts = st.number_input("삼진 (Strikeouts)", min_value=0.0, max_value=300.0, value=210.0)
 
             # 사용자 입력값을 배열로 변환
-            input_data = pitcher_avg_values.copy()  # 평균값으로 초기화
-            input_data[:6] = [era, whip, k_bb, innings, saves, strikeouts]
+            input_data = pitcher_schema.row([era, whip, k_bb, innings, saves, strikeouts])
 
             # 예측 버튼
             if st.button("🤖바랩! 예측해줘!", key="pitcher_predict"):
-                # 결과 로딩 애니메이션
-                progress_message = st.empty()
-                for i in range(5):
-                    message = f"🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 중이에요{'.' * (i + 1)}"
-                    progress_message.text(message)
-                    time.sleep(1)
-
-                # 입력 데이터를 스케일링
-                scaled_data = pitcher_scaler.transform([input_data])
-
-                # 모델 예측
-                prediction = pitcher_model.predict(scaled_data)
-
-                # 최종 메시지 및 결과 출력
-                progress_message.text("🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 했어요!")
-                st.success(f"🤖바랩이 예측한 투수의 연봉은: ${int(prediction[0]):,},000")
+                try:
+                    # 같은 입력으로 이미 예측한 적이 있으면 스케일링과 예측을 건너뜀
+                    prediction, cache_hit = cached_predict(
+                        ["pitcher_scaler", "pitcher_model"],
+                        input_data,
+                        lambda: run_stages(
+                            "🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 중이에요...",
+                            # 동시에 들어온 다른 세션의 요청과 한 배치로 스케일링/예측
+                            [("모델 예측", lambda _: [predict_row("pitcher_model", input_data)])],
+                            "🤖바랩이 연봉을 얼마나 받을 수 있을지 예측 했어요!",
+                        ),
+                    )
+                    if cache_hit:
+                        st.caption("⚡ 같은 입력의 이전 예측 결과를 재사용했어요")
+
+                    # 결과 출력
+                    st.success(f"🤖바랩이 예측한 투수의 연봉은: ${int(prediction[0]):,},000")
+                except TimeoutError as e:
+                    # 작업 프로세스의 예측이 시간 안에 끝나지 않은 경우 (utils/프로세스풀.py)
+                    st.error(str(e))
+
+        # 로스터 일괄 예측: 연봉 전용 모델로 팀 전체 선수를 한 번에 예측
+        st.header("[로스터 일괄 연봉 예측]")
+        st.write("선수유형(타자/투수) 열이 있는 로스터 CSV를 올리면 모든 선수의 연봉을 한 번에 예측합니다.")
+        st.download_button(
+            "📄 로스터 예시 CSV 받기",
+            roster_template().to_csv(index=False).encode("utf-8-sig"),
+            file_name="로스터_예시.csv",
+            mime="text/csv",
+        )
+        roster_file = st.file_uploader("로스터 CSV 파일", type="csv", key="roster_file")
+        if roster_file is not None and st.button("🤖바랩! 로스터 연봉 예측해줘!", key="roster_predict"):
+            try:
+                roster_result = run_stages(
+                    "🤖바랩이 로스터 선수들의 연봉을 예측 중이에요...",
+                    [
+                        ("로스터 읽기", lambda _: pd.read_csv(roster_file)),
+                        ("타자/투수 연봉 예측", estimate_roster),
+                    ],
+                    "🤖바랩이 로스터 선수들의 연봉을 예측 했어요!",
+                )
+                st.dataframe(roster_result, use_container_width=True)
+                st.download_button(
+                    "📥 예측 결과 다운로드 (CSV)",
+                    roster_result.to_csv(index=False).encode("utf-8-sig"),
+                    file_name="로스터_연봉_예측.csv",
+                    mime="text/csv",
+                )
+            except Exception as e:
+                st.error(f"예측 중 오류 발생: {e}")
 
 # 오른쪽 열: 설명
 with right_col:
@@ -159,3 +200,6 @@ with right_col:
         - **데이터 기반 분석**: 선수의 강점과 약점을 명확히 파악하여 훈련 방향을 설정하는 데 기여합니다.
         """
     )
+    show_model_stats(["hitter_pipeline", "hitter_model", "hitter_scaler", "pitcher_pipeline", "pitcher_model", "pitcher_scaler"])
+
+page_run.finish()
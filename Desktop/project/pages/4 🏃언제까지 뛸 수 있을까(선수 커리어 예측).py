@@ -10,6 +10,11 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.공통함수 import wait_for_future, show_model_stats  # 프로세스 공용 모델 레지스트리
+from utils.예측캐시 import cached_predict  # 같은 입력의 예측 결과 재사용
+from utils.배치서버 import get_batcher  # 동시 요청을 모아 작업 프로세스에서 예측
+from utils.피처벡터 import get_schema  # 모델 입력 벡터 조립
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 # 페이지 설정
 st.set_page_config(
@@ -18,6 +23,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("4_career")
+
 # 사이드바 상단에 제목 추가
 with st.sidebar:
     st.markdown(
@@ -37,11 +45,8 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
 
-# 모델 및 스케일러 로드
-hitter_model = joblib.load("hitter_model.pkl")  # 타자 모델 파일
-hitter_scaler = joblib.load("hitter_scaler.pkl")  # 타자 스케일러 파일
-pitcher_model = joblib.load("pitcher_model.pkl")  # 투수 모델 파일
-pitcher_scaler = joblib.load("pitcher_scaler.pkl")  # 투수 스케일러 파일
+# 스케일러와 모델(또는 둘을 합친 파이프라인)은 배치 서비스(utils/배치서버.py)가
+# 첫 예측 때 한 번만 로드해서 모든 세션이 함께 사용함
 
 # Streamlit UI
 st.title("🏃언제까지 뛸 수 있을까?: 선수 커리어 예측🏃")
@@ -71,32 +76,32 @@ with left_col:
         height = st.number_input("키 (Height, cm)", min_value=140, max_value=220, value=180)
         last_game_month = st.number_input("마지막 경기 월 (Last Game Month)", min_value=1, max_value=12, value=6)
 
-        # 사용자 입력값을 배열로 변환
-        input_data = np.array([games, birth_year, debut_age, position_diversity, year,
-                               weight, last_game_days, debut_days, height, last_game_month])
-
-        # 모델이 요구하는 피처 수에 맞게 데이터 패딩
-        hitter_features = 80  # 타자 모델이 요구하는 총 피처 수
-        padded_data = np.zeros(hitter_features)  # 0으로 초기화된 배열 생성
-        padded_data[:len(input_data)] = input_data  # 입력값으로 상위 데이터 채우기
+        # 사용자 입력값을 모델이 요구하는 피처 수(스케일러 기준)의 벡터로 변환 (나머지는 0)
+        padded_data = get_schema("hitter_career").row([games, birth_year, debut_age, position_diversity, year,
+                                                       weight, last_game_days, debut_days, height, last_game_month])
 
         # 예측 버튼
         if st.button("🤖바랩! 예측해줘!"):
-            # 결과 로딩 애니메이션
-            progress_message = st.empty()
-            for i in range(6):
-                message = f"🤖바랩이 선수의 커리어를 예측 중이에요{'.' * i}"
-                progress_message.text(message)
-                time.sleep(1)
-
-            # 입력 데이터를 스케일링
-            scaled_data = hitter_scaler.transform([padded_data])
-            # 모델 예측
-            prediction = hitter_model.predict(scaled_data)
-
-            # 결과 출력
-            progress_message.text("🤖바랩이 커리어를 예측 했어요!")
-            st.success(f"🤖바랩이 예측한 타자의 커리어 일수: {prediction[0]:.2f} 일")
+            try:
+                # 같은 입력으로 이미 예측한 적이 있으면 스케일링과 예측을 건너뜀
+                prediction, cache_hit = cached_predict(
+                    ["hitter_scaler", "hitter_model"],
+                    padded_data,
+                    # 예측은 배치 서비스를 거쳐 작업 프로세스에서 실행되고, 화면은 완료 여부만 확인
+                    lambda: [wait_for_future(
+                        get_batcher("hitter_model").submit(padded_data),
+                        "🤖바랩이 선수의 커리어를 예측 중이에요...",
+                        "🤖바랩이 커리어를 예측 했어요!",
+                    )],
+                )
+                if cache_hit:
+                    st.caption("⚡ 같은 입력의 이전 예측 결과를 재사용했어요")
+
+                # 결과 출력
+                st.success(f"🤖바랩이 예측한 타자의 커리어 일수: {prediction[0]:.2f} 일")
+            except TimeoutError as e:
+                # 작업 프로세스의 예측이 시간 안에 끝나지 않은 경우 (utils/프로세스풀.py)
+                st.error(str(e))
 
     elif player_type == "투수":
         # 투수 입력 필드
@@ -112,32 +117,32 @@ with left_col:
         debut_days = st.number_input("데뷔 이후 경과 일수 (Days since debut)", min_value=0, max_value=20000, value=5000)
         height = st.number_input("키 (Height, cm)", min_value=140, max_value=220, value=180)
 
-        # 사용자 입력값을 배열로 변환
-        input_data = np.array([innings_pitched, birth_year, debut_age, strikeouts, wins,
-                               era, weight, last_game_days, debut_days, height])
-
-        # 모델이 요구하는 피처 수에 맞게 데이터 패딩
-        pitcher_features = 67  # 투수 모델이 요구하는 총 피처 수
-        padded_data = np.zeros(pitcher_features)  # 0으로 초기화된 배열 생성
-        padded_data[:len(input_data)] = input_data  # 입력값으로 상위 데이터 채우기
+        # 사용자 입력값을 모델이 요구하는 피처 수(스케일러 기준)의 벡터로 변환 (나머지는 0)
+        padded_data = get_schema("pitcher_career").row([innings_pitched, birth_year, debut_age, strikeouts, wins,
+                                                        era, weight, last_game_days, debut_days, height])
 
         # 예측 버튼
         if st.button("🤖바랩! 예측해줘!"):
-            # 결과 로딩 애니메이션
-            progress_message = st.empty()
-            for i in range(6):
-                message = f"🤖바랩이 선수의 커리어를 예측 중이에요{'.' * i}"
-                progress_message.text(message)
-                time.sleep(1)
-
-            # 입력 데이터를 스케일링
-            scaled_data = pitcher_scaler.transform([padded_data])
-            # 모델 예측
-            prediction = pitcher_model.predict(scaled_data)
-
-            # 결과 출력
-            progress_message.text("🤖바랩이 선수의 커리어를 예측 했어요!")
-            st.success(f"🤖바랩이 예측한 투수의 커리어 일수: {prediction[0]:.2f} 일")
+            try:
+                # 같은 입력으로 이미 예측한 적이 있으면 스케일링과 예측을 건너뜀
+                prediction, cache_hit = cached_predict(
+                    ["pitcher_scaler", "pitcher_model"],
+                    padded_data,
+                    # 예측은 배치 서비스를 거쳐 작업 프로세스에서 실행되고, 화면은 완료 여부만 확인
+                    lambda: [wait_for_future(
+                        get_batcher("pitcher_model").submit(padded_data),
+                        "🤖바랩이 선수의 커리어를 예측 중이에요...",
+                        "🤖바랩이 선수의 커리어를 예측 했어요!",
+                    )],
+                )
+                if cache_hit:
+                    st.caption("⚡ 같은 입력의 이전 예측 결과를 재사용했어요")
+
+                # 결과 출력
+                st.success(f"🤖바랩이 예측한 투수의 커리어 일수: {prediction[0]:.2f} 일")
+            except TimeoutError as e:
+                # 작업 프로세스의 예측이 시간 안에 끝나지 않은 경우 (utils/프로세스풀.py)
+                st.error(str(e))
 
 # 오른쪽 열: 설명
 with right_col:
@@ -162,3 +167,6 @@ with right_col:
     ### 🚀 **활용 가능성**
     이 모델은 특정 선수의 커리어 추적 외에도 팀 전체의 잠재력을 평가하거나 신인 드래프트에서 활용될 수 있는 혁신적인 도구입니다.
     """)
+    show_model_stats(["hitter_pipeline", "hitter_model", "hitter_scaler", "pitcher_pipeline", "pitcher_model", "pitcher_scaler"])
+
+page_run.finish()
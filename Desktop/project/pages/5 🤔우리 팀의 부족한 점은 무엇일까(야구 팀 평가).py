@@ -10,6 +10,13 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.팀데이터 import get_team_store, RADAR_COLUMNS  # 팀 성과 데이터 저장소
+from utils.레이더 import get_radar_payloads, radar_option, scaled_series_item, RADAR_SCALES  # 미리 계산한 레이더 차트 데이터
+from utils.순위 import get_team_rankings  # 리그 내 백분위/표준 점수
+from utils.유사팀 import get_similar_seasons  # 비슷한 팀-시즌 검색 (KD-트리)
+from utils.팀분석 import get_weakness_analyzer  # 약점 분석
+from utils.설정 import COLUMNS_FOR_SPIDER
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 # 페이지 설정
 st.set_page_config(
@@ -18,6 +25,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("5_team_eval")
+
 # 사이드바 상단에 제목 추가
 with st.sidebar:
     st.markdown(
@@ -38,74 +48,33 @@ with st.sidebar:
     )
 
 
-# 팀 이름 매핑
-team_name_mapping = {
-    "CHN": "Chicago Cubs",
-    "PHI": "Philadelphia Phillies",
-    "PIT": "Pittsburgh Pirates",
-    "CIN": "Cincinnati Reds",
-    "SLN": "St. Louis Cardinals",
-    "WAS": "Washington Nationals",
-    "BOS": "Boston Red Sox",
-    "CHA": "Chicago White Sox",
-    "CLE": "Cleveland Indians",
-    "DET": "Detroit Tigers",
-    "NYA": "New York Yankees",
-    "BAL": "Baltimore Orioles",
-    "LAN": "Los Angeles Dodgers",
-    "SFN": "San Francisco Giants",
-    "LAA": "Los Angeles Angels",
-    "MIN": "Minnesota Twins",
-    "HOU": "Houston Astros",
-    "NYN": "New York Mets",
-    "ATL": "Atlanta Braves",
-    "OAK": "Oakland Athletics",
-    "KCA": "Kansas City Royals",
-    "SDN": "San Diego Padres",
-    "TEX": "Texas Rangers",
-    "SEA": "Seattle Mariners",
-    "TOR": "Toronto Blue Jays",
-    "COL": "Colorado Rockies",
-    "ARI": "Arizona Diamondbacks",
-    "MIL": "Milwaukee Brewers",
-    "TBA": "Tampa Bay Rays",
-    "MIA": "Miami Marlins"
-}
-
-# 데이터 로드
-data_path = '팀_성과_지표_시각화.csv'  # Replace with your file path
-data = pd.read_csv(data_path)
-
-# 팀 이름 매핑 적용
-data['team_id'] = data['team_id'].map(team_name_mapping)
-
-# 레이더 차트에 필요한 열 정의
-columns_for_spider = ['SLG', 'OPS', 'era', 'WP', 'PAR', 'PARA', 'BA', 'OBP']
+# 데이터 로드 (프로세스당 한 번만, 레이더 차트에 필요한 열만 읽고 (연도, 리그, 팀) 인덱스로 조회)
+store = get_team_store(RADAR_COLUMNS)
+
+# 팀-시즌별 레이더 차트 값 (미리 계산해 둔 결과에서 조회)
+payloads = get_radar_payloads()
 
 # 사이드바에서 팀 정보 선택
 with st.sidebar:
     st.header("팀 선택")
-    selected_year = st.selectbox("년도", options=sorted(data['year'].unique()), index=sorted(data['year'].unique()).index(1982), key="year")
-    selected_league = st.selectbox("리그", options=data['league_id'].unique(), index=list(data['league_id'].unique()).index("AL"), key="league")
-    available_teams = data[(data['year'] == selected_year) & (data['league_id'] == selected_league)]['team_id'].unique()
+    selected_year = st.selectbox("년도", options=store.years, index=store.years.index(1982), key="year")
+    selected_league = st.selectbox("리그", options=store.leagues, index=store.leagues.index("AL"), key="league")
+    available_teams = store.teams(selected_year, selected_league)
     selected_team = st.selectbox("팀", options=available_teams, index=0, key="team")
 
-# 데이터 필터링
-filtered_data = data[(data['year'] == selected_year) &
-                     (data['league_id'] == selected_league) &
-                     (data['team_id'] == selected_team)]
+    # 레이더 차트 척도 (리그 평균 대비 차이는 지표마다 단위가 달라 백분위/표준 점수로도 볼 수 있음)
+    st.header("차트 척도")
+    radar_scale = st.radio(
+        "차트 척도", list(RADAR_SCALES), format_func=lambda scale: RADAR_SCALES[scale]["label"],
+        key="radar_scale", label_visibility="collapsed",
+    )
 
-series_data = []
+    st.header("비슷한 팀-시즌")
+    similar_k = st.slider("찾을 팀-시즌 수", min_value=1, max_value=10, value=5, key="similar_k")
 
-if not filtered_data.empty:
-    values = [round(val, 3) for val in filtered_data[[col + '_diff' for col in columns_for_spider]].iloc[0].values.tolist()]
-    series_data.append({
-        "value": values,
-        "name": f"{selected_team} ({selected_year})",
-        "itemStyle": {"color": "#FF5733"},
-        "lineStyle": {"color": "#FF5733"},
-        "areaStyle": {"opacity": 0.2, "color": "#FF5733"}
-    })
+# 데이터 조회 (dict 조회 한 번)
+series_item = scaled_series_item(payloads, selected_year, selected_league, selected_team, "#FF5733", radar_scale)
+series_data = [series_item] if series_item is not None else []
 
 # Streamlit UI
 st.title("🤔우리 팀의 부족한 점은 무엇일까?: 팀 성과지표 평가🤔")
@@ -119,65 +88,46 @@ left_col, right_col = st.columns(2)
 with left_col:
     st.header("[MLB 팀 성과 현황 지표]")
     # Echarts 옵션 설정
-    option = {
-        "title": {
-            "text": f"{selected_team} ({selected_year}) 성과 지표",
-        },
-        "tooltip": {},
-        "radar": {
-            "indicator": [
-                {"name": col, "max": 1, "min": -1} for col in columns_for_spider
-            ]
-        },
-        "series": [
-            {
-                "name": "Team Performance",
-                "type": "radar",
-                "data": series_data
-            }
-        ]
-    }
+    option = radar_option(series_data, {"text": f"{selected_team} ({selected_year}) 성과 지표"}, scale=radar_scale)
 
     # Streamlit에 그래프 표시
     st_echarts(options=option, height="500px")
 
+    # 같은 시즌, 같은 리그 안에서의 순위 (미리 계산한 순위 행렬에서 한 행 조회)
+    rank_row = get_team_rankings().get(selected_year, selected_league, selected_team)
+    if rank_row is not None:
+        n_metrics = len(COLUMNS_FOR_SPIDER)
+        st.markdown(f"**{selected_year} {selected_league} 리그 내 순위** (ERA, PARA는 낮을수록 높은 백분위)")
+        st.dataframe(pd.DataFrame({
+            "지표": COLUMNS_FOR_SPIDER,
+            "백분위": (rank_row[:n_metrics].astype(float) * 100).round(1),
+            "표준 점수": rank_row[n_metrics:].astype(float).round(2),
+        }).set_index("지표").T, use_container_width=True)
+
+    # 8개 지표 차이를 표준화했을 때 가장 가까운 팀-시즌 (미리 만든 KD-트리에서 조회 한 번)
+    similar = get_similar_seasons().query(selected_year, selected_league, selected_team, similar_k)
+    if similar:
+        similar_positions = store.positions([key for key, _ in similar])
+        st.markdown(f"**{selected_team} ({selected_year})와 지표가 가장 비슷한 팀-시즌**")
+        st.dataframe(pd.DataFrame({
+            "연도": [year for (year, _, _), _ in similar],
+            "리그": [league for (_, league, _), _ in similar],
+            "팀": [team for (_, _, team), _ in similar],
+            "거리": [round(distance, 2) for _, distance in similar],
+            "승률(WP)": store.matrix(["WP"])[similar_positions, 0].round(3),
+        }), use_container_width=True)
+
     # "바랩! 분석해줘!" 버튼 추가
     if st.button("🤖바랩! 분석해줘!"):
-        # 동적 문구 컨테이너 생성
-        status_message = st.empty()
-
-        # 분석 중 문구 표시
-        status_message.markdown("**🤖바랩이 해당 팀의 성과지표를 분석중입니다...**")
-
-        # 로딩바 구현
-        progress_bar = st.progress(0)  # 진행률 초기화
-        for percent in range(1, 101):  # 1%부터 100%까지
-            time.sleep(0.05)  # 진행률 업데이트 간격 (0.05초)
-            progress_bar.progress(percent)  # 진행률 업데이트
+        # 분석 완료 문구 (인위적인 대기 없이 바로 결과 표시)
+        st.markdown("**🤖바랩이 해당 팀의 성과지표를 분석했어요!**")
 
-        # 로딩바 제거
-        progress_bar.empty()
-
-        # 분석 완료 문구 업데이트
-        status_message.markdown("**🤖바랩이 해당 팀의 성과지표를 분석했어요!**")
-
-        # 분석 결과 출력
-        st.markdown("""
-        ### 📋 전반적 제안
-        1. **공격력 강화**: 
-           - 장타력(SLG)과 출루율(OBP)을 동시에 개선하는 전략이 필요합니다.
-           - 타자들의 훈련 프로그램 강화, 특히 선구안과 파워 향상에 초점을 맞추세요.
-
-        2. **투수력 개선**:
-           - ERA를 안정적으로 낮출 수 있는 불펜 및 선발 로테이션 강화가 필요합니다.
-           - 경기 후반을 책임질 불펜 투수의 보강을 고려하세요.
-
-        3. **전술적 개선**:
-           - 클러치 상황에서 타격력을 높이고, 경기 전략을 더 세밀하게 구성하여 승률(WP)을 높이는 방안을 고려하세요.
-
-        4. **선수 보강**:
-           - 조정된 대체 가치(PARA)가 낮으므로 약점이 되는 포지션을 보강하거나 팀 내 균형을 맞추는 것이 중요합니다.
-        """)
+        # 분석 결과 출력 (리그 내 백분위와 포스트시즌 진출 팀 기준으로 계산, 팀-시즌마다 한 번만 계산해 보관)
+        report = get_weakness_analyzer().analyze(selected_year, selected_league, selected_team)
+        if report is None:
+            st.info("선택한 팀-시즌의 데이터가 없습니다.")
+        else:
+            st.markdown(report["markdown"])
 
 
 # 오른쪽 열: 설명
@@ -191,6 +141,7 @@ with right_col:
     1. 팀 간 성과 비교
     2. 시각적 이해 제공 (SLG, OPS, ERA 등 주요 지표 포함)
     3. 필터링 기능 (연도, 리그, 팀 이름으로 선택)
+    4. 지표 구성이 가장 비슷한 과거 팀-시즌 찾기 (8개 지표 차이를 표준화한 거리 기준)
 
     #### 📋 주요 지표
     - **SLG (Slugging Percentage):** 타격 생산성을 측정하는 지표.
@@ -206,3 +157,5 @@ with right_col:
     2. 상대 팀 비교를 통해 특정 지표에서의 상대적 우위 파악.
     3. 과거 데이터를 기반으로 팀 성과를 평가 및 개선 방향 도출.
     """)
+
+page_run.finish()
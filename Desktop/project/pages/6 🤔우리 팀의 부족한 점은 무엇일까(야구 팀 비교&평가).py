@@ -10,6 +10,9 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.팀데이터 import get_team_store, RADAR_COLUMNS  # 팀 성과 데이터 저장소
+from utils.레이더 import get_radar_payloads, overlay_series, radar_option, scaled_series_item, RADAR_SCALES  # 미리 계산한 레이더 차트 데이터
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 # 페이지 설정
 st.set_page_config(
@@ -18,6 +21,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("6_team_compare")
+
 # 사이드바 상단에 제목 추가
 with st.sidebar:
     st.markdown(
@@ -37,124 +43,122 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
 
-# 팀 이름 매핑
-team_name_mapping = {
-    "CHN": "Chicago Cubs",
-    "PHI": "Philadelphia Phillies",
-    "PIT": "Pittsburgh Pirates",
-    "CIN": "Cincinnati Reds",
-    "SLN": "St. Louis Cardinals",
-    "WAS": "Washington Nationals",
-    "BOS": "Boston Red Sox",
-    "CHA": "Chicago White Sox",
-    "CLE": "Cleveland Indians",
-    "DET": "Detroit Tigers",
-    "NYA": "New York Yankees",
-    "BAL": "Baltimore Orioles",
-    "LAN": "Los Angeles Dodgers",
-    "SFN": "San Francisco Giants",
-    "LAA": "Los Angeles Angels",
-    "MIN": "Minnesota Twins",
-    "HOU": "Houston Astros",
-    "NYN": "New York Mets",
-    "ATL": "Atlanta Braves",
-    "OAK": "Oakland Athletics",
-    "KCA": "Kansas City Royals",
-    "SDN": "San Diego Padres",
-    "TEX": "Texas Rangers",
-    "SEA": "Seattle Mariners",
-    "TOR": "Toronto Blue Jays",
-    "COL": "Colorado Rockies",
-    "ARI": "Arizona Diamondbacks",
-    "MIL": "Milwaukee Brewers",
-    "TBA": "Tampa Bay Rays",
-    "MIA": "Miami Marlins"
-}
-
-# 데이터 로드
-data_path = '팀_성과_지표_시각화.csv'  # Replace with your file path
-data = pd.read_csv(data_path)
-
-# 팀 이름 매핑 적용
-data['team_id'] = data['team_id'].map(team_name_mapping)
-
-# 레이더 차트에 필요한 열 정의
-columns_for_spider = ['SLG', 'OPS', 'era', 'WP', 'PAR', 'PARA', 'BA', 'OBP']
-
-# 사이드바: 팀 1 선택
-with st.sidebar:
-    st.header("첫 번째 팀 선택")
-    # 팀 1 기본값 설정
-    default_year_1 = 1982
-    default_league_1 = "AL"
-    default_team_1 = "Boston Red Sox"
-
-    # 첫 번째 팀 선택 옵션
-    selected_year_1 = st.selectbox("년도", options=sorted(data['year'].unique()), index=sorted(data['year'].unique()).index(default_year_1), key="year_1")
-    selected_league_1 = st.selectbox("리그", options=data['league_id'].unique(), index=list(data['league_id'].unique()).index(default_league_1), key="league_1")
-    available_teams_1 = data[(data['year'] == selected_year_1) & (data['league_id'] == selected_league_1)]['team_id'].unique()
-    selected_team_1 = st.selectbox("팀", options=available_teams_1, index=list(available_teams_1).index(default_team_1), key="team_1")
-
-# 사이드바: 팀 2 선택
+# 데이터 로드 (프로세스당 한 번만, 레이더 차트에 필요한 열만 읽고 (연도, 리그, 팀) 인덱스로 조회)
+store = get_team_store(RADAR_COLUMNS)
+
+# 팀-시즌별 레이더 차트 값 (미리 계산해 둔 결과에서 조회)
+payloads = get_radar_payloads()
+
+# 여러 팀 비교에서 팀-시즌을 추려서 표시했을 때 보여줄 안내 문구
+overlay_note = None
+
+# 사이드바: 비교 방식 선택
 with st.sidebar:
-    st.header("두 번째 팀 선택")
-    # 팀 2 기본값 설정
-    default_year_2 = 1983
-    default_league_2 = "AL"
-    default_team_2 = "Boston Red Sox"
-
-    # 두 번째 팀 선택 옵션
-    year_range = list(range(default_year_1 - 5, default_year_1 + 6))
-    available_years_2 = [year for year in year_range if year in data['year'].unique()]
-    selected_year_2 = st.selectbox("년도", options=sorted(available_years_2), index=sorted(available_years_2).index(default_year_2), key="year_2")
-    selected_league_2 = st.selectbox("리그", options=data['league_id'].unique(), index=list(data['league_id'].unique()).index(default_league_2), key="league_2")
-    available_teams_2 = data[(data['year'] == selected_year_2) & (data['league_id'] == selected_league_2)]['team_id'].unique()
-    selected_team_2 = st.selectbox("팀", options=available_teams_2, index=list(available_teams_2).index(default_team_2), key="team_2")
-
-# 데이터 필터링
-filtered_data_1 = data[(data['year'] == selected_year_1) &
-                       (data['league_id'] == selected_league_1) &
-                       (data['team_id'] == selected_team_1)]
-
-filtered_data_2 = data[(data['year'] == selected_year_2) &
-                       (data['league_id'] == selected_league_2) &
-                       (data['team_id'] == selected_team_2)]
-
-# 그래프 데이터 설정
-series_data = []
-if not filtered_data_1.empty:
-    values_1 = [round(val, 3) for val in filtered_data_1[[col + '_diff' for col in columns_for_spider]].iloc[0].values.tolist()]
-    series_data.append({
-        "value": values_1,
-        "name": f"{selected_team_1} ({selected_year_1})",
-        "itemStyle": {"color": "#FF5733"},
-        "lineStyle": {"color": "#FF5733"},
-        "areaStyle": {"opacity": 0.2, "color": "#FF5733"}
-    })
-
-if not filtered_data_2.empty:
-    values_2 = [round(val, 3) for val in filtered_data_2[[col + '_diff' for col in columns_for_spider]].iloc[0].values.tolist()]
-    series_data.append({
-        "value": values_2,
-        "name": f"{selected_team_2} ({selected_year_2})",
-        "itemStyle": {"color": "#3375FF"},
-        "lineStyle": {"color": "#3375FF"},
-        "areaStyle": {"opacity": 0.2, "color": "#3375FF"}
-    })
-
-# Echarts 옵션 설정
-team1_label = f"{selected_team_1} ({selected_year_1})" if not filtered_data_1.empty else "팀1"
-team2_label = f"{selected_team_2} ({selected_year_2})" if not filtered_data_2.empty else "팀2"
-
-option = {
-    "title": {
-        "text": f"{team1_label} 성과지표 vs {team2_label} 성과지표",
+    st.header("비교 방식")
+    compare_mode = st.radio(
+        "비교 방식", ["두 팀 비교", "지구 전체 비교", "구단 시즌별 비교"],
+        key="compare_mode", label_visibility="collapsed",
+    )
+    # 레이더 차트 척도 (리그 평균 대비 차이는 지표마다 단위가 달라 백분위/표준 점수로도 볼 수 있음)
+    st.header("차트 척도")
+    radar_scale = st.radio(
+        "차트 척도", list(RADAR_SCALES), format_func=lambda scale: RADAR_SCALES[scale]["label"],
+        key="radar_scale", label_visibility="collapsed",
+    )
+
+if compare_mode == "두 팀 비교":
+    # 사이드바: 팀 1 선택
+    with st.sidebar:
+        st.header("첫 번째 팀 선택")
+        # 팀 1 기본값 설정
+        default_year_1 = 1982
+        default_league_1 = "AL"
+        default_team_1 = "Boston Red Sox"
+
+        # 첫 번째 팀 선택 옵션
+        selected_year_1 = st.selectbox("년도", options=store.years, index=store.years.index(default_year_1), key="year_1")
+        selected_league_1 = st.selectbox("리그", options=store.leagues, index=store.leagues.index(default_league_1), key="league_1")
+        available_teams_1 = store.teams(selected_year_1, selected_league_1)
+        selected_team_1 = st.selectbox("팀", options=available_teams_1, index=list(available_teams_1).index(default_team_1), key="team_1")
+
+    # 사이드바: 팀 2 선택
+    with st.sidebar:
+        st.header("두 번째 팀 선택")
+        # 팀 2 기본값 설정
+        default_year_2 = 1983
+        default_league_2 = "AL"
+        default_team_2 = "Boston Red Sox"
+
+        # 두 번째 팀 선택 옵션
+        year_range = list(range(default_year_1 - 5, default_year_1 + 6))
+        available_years_2 = [year for year in year_range if year in store.year_set]
+        selected_year_2 = st.selectbox("년도", options=sorted(available_years_2), index=sorted(available_years_2).index(default_year_2), key="year_2")
+        selected_league_2 = st.selectbox("리그", options=store.leagues, index=store.leagues.index(default_league_2), key="league_2")
+        available_teams_2 = store.teams(selected_year_2, selected_league_2)
+        selected_team_2 = st.selectbox("팀", options=available_teams_2, index=list(available_teams_2).index(default_team_2), key="team_2")
+
+    # 데이터 조회 (팀마다 dict 조회 한 번)
+    series_item_1 = scaled_series_item(payloads, selected_year_1, selected_league_1, selected_team_1, "#FF5733", radar_scale)
+    series_item_2 = scaled_series_item(payloads, selected_year_2, selected_league_2, selected_team_2, "#3375FF", radar_scale)
+
+    # 그래프 데이터 설정
+    series_data = [item for item in (series_item_1, series_item_2) if item is not None]
+
+    # Echarts 옵션 설정
+    team1_label = series_item_1["name"] if series_item_1 is not None else "팀1"
+    team2_label = series_item_2["name"] if series_item_2 is not None else "팀2"
+    chart_title = f"{team1_label} 성과지표 vs {team2_label} 성과지표"
+    legend_labels = [team1_label, team2_label]
+
+else:
+    with st.sidebar:
+        if compare_mode == "지구 전체 비교":
+            # 같은 시즌, 같은 지구의 모든 팀 (지구 구분이 없던 시즌은 리그 전체)
+            st.header("지구 선택")
+            group_year = st.selectbox("년도", options=store.years, index=store.years.index(1982), key="group_year")
+            group_league = st.selectbox("리그", options=store.leagues, index=store.leagues.index("AL"), key="group_league")
+            divisions = store.divisions(group_year, group_league)
+            if divisions:
+                group_division = st.selectbox("지구", options=divisions, key="group_division")
+                positions = store.division_positions(group_year, group_league, group_division)
+                group_label = f"{group_year} {group_league} {group_division}지구"
+            else:
+                st.caption("이 시즌은 지구 구분이 없어 리그 전체를 비교합니다.")
+                positions = store.season_positions(group_year, group_league)
+                group_label = f"{group_year} {group_league}"
+        else:
+            # 한 구단의 여러 시즌 (기본: 최근 20시즌)
+            st.header("구단 선택")
+            franchises = store.group_values("franchise_id")
+            franchise = st.selectbox("구단", options=franchises, index=franchises.index("BOS"), key="franchise",
+                                     format_func=lambda f: f"{f} ({store.keys_at(store.franchise_positions(f)[-1:])[0][2]})")
+            franchise_years = [year for year, _, _ in store.keys_at(store.franchise_positions(franchise))]
+            first_year, last_year = franchise_years[0], franchise_years[-1]
+            if first_year < last_year:
+                start_year, end_year = st.slider("시즌 범위", first_year, last_year,
+                                                 (max(first_year, last_year - 19), last_year), key="franchise_years")
+            else:
+                start_year = end_year = first_year
+            positions = store.franchise_positions(franchise, start_year, end_year)
+            group_label = f"{franchise} {start_year}~{end_year}"
+
+    # 선택한 팀-시즌을 한 번에 가져와 시리즈를 만듦
+    series_data, total_series = overlay_series(store, positions, scale=radar_scale)
+    if total_series > len(series_data):
+        overlay_note = f"팀-시즌 {total_series}개 중 {len(series_data)}개를 고른 간격으로 골라 표시합니다."
+    chart_title = f"{group_label} 성과지표 비교"
+    legend_labels = [item["name"] for item in series_data]
+
+option = radar_option(
+    series_data,
+    title={
+        "text": chart_title,
         "left": "center",
         "textStyle": {"fontSize": 18, "fontWeight": "bold"}
     },
-    "tooltip": {},  # 툴팁 추가
-    "legend": {
-        "data": [team1_label, team2_label],  # 범례에 팀 이름 추가
+    legend={
+        "data": legend_labels,  # 범례에 팀 이름 추가
+        "type": "scroll",  # 팀이 많으면 범례를 넘겨 보기
         "bottom": "0%",  # 범례 위치 (그래프 하단)
         "textStyle": {
             "fontSize": 14,
@@ -162,18 +166,9 @@ option = {
         },
         "orient": "horizontal"  # 범례를 수평으로 표시
     },
-    "radar": {
-        "indicator": [{"name": col, "max": 1, "min": -1} for col in columns_for_spider]
-    },
-    "series": [
-        {
-            "name": "Team Comparison",
-            "type": "radar",
-            "data": series_data
-        }
-    ]
-}
-
+    series_name="Team Comparison",
+    scale=radar_scale,
+)
 
 # Streamlit UI
 st.title("🤔우리 팀의 부족한 점은 무엇일까?: 팀 성과 지표 비교평가🤔")
@@ -184,6 +179,8 @@ left_col, right_col = st.columns(2)
 # 왼쪽 열: 레이더 차트 표시
 with left_col:
     st.header("[MLB 팀 성과 비교 모델]")
+    if overlay_note:
+        st.caption(overlay_note)
     st_echarts(options=option, height="500px")
 
 # 오른쪽 열: 모델 설명
@@ -197,6 +194,7 @@ with right_col:
     - **팀 간 비교**: 두 팀의 성과를 동일한 기준에서 분석 및 시각화.
     - **레이더 차트**: 주요 성과 지표(SLG, OPS, ERA 등)를 직관적으로 비교.
     - **유연한 필터링**: 연도, 리그, 팀을 독립적으로 선택 가능.
+    - **여러 팀 비교**: 한 지구의 모든 팀이나 한 구단의 여러 시즌을 한 차트에 겹쳐서 비교.
 
     #### 📋 주요 지표
     - **SLG (Slugging Percentage)**: 타격 생산성을 측정.
@@ -213,3 +211,4 @@ with right_col:
     - **성과 평가**: 과거 데이터를 기반으로 개선 방향 제시.
     """)
 
+page_run.finish()
@@ -0,0 +1,145 @@
+# 필수 라이브러리 정리
+import streamlit as st  # Streamlit 웹 애플리케이션 프레임워크
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+import plotly.graph_objects as go  # 대화형 데이터 시각화를 위한 라이브러리
+from utils.팀추세 import get_trend_store, downsample_lttb, MAX_POINTS  # 팀-연도별 평균 지표 추세 저장소
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
+
+# 페이지 설정
+st.set_page_config(
+    page_title="데이터톤 프로젝트",
+    page_icon="⚾",  # 원하는 아이콘
+    layout="wide"
+)
+
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("7_team_trend")
+
+# 사이드바 상단에 제목 추가
+with st.sidebar:
+    st.markdown(
+        """
+        <style>
+        [data-testid="stSidebar"]::before {
+            content: "⚾ 7조 데이터톤 프로젝트";
+            font-size: 20px;
+            font-weight: bold;
+            margin-left: 10px;
+            margin-top: 10px;
+            display: block;
+            color: #333333;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+# 데이터 로드 (프로세스당 한 번만, 팀별 연도순 배열과 누적합을 미리 만들어 둠)
+store = get_trend_store()
+
+# 지표 이름 (열 이름 -> 화면 표시 이름)
+metric_labels = {
+    "Average_OPS": "OPS (출루율 + 장타율)",
+    "Average_ERA": "ERA (평균자책점)",
+    "Average_WP": "WP (승률)",
+    "Average_PAR": "PAR",
+    "Average_PARA": "PARA",
+    "Average_BA": "BA (타율)",
+    "Average_OBP": "OBP (출루율)",
+}
+colors = ["#FF5733", "#3375FF", "#2ECC71", "#9B59B6", "#F1C40F", "#1ABC9C"]
+
+# 사이드바에서 팀과 지표 선택
+with st.sidebar:
+    st.header("팀 선택")
+    selected_teams = st.multiselect(
+        "팀 (최대 6개)", options=store.teams, default=["BOS", "NYA"],
+        format_func=store.label, max_selections=len(colors), key="trend_teams",
+    )
+    selected_metric = st.selectbox("지표", options=store.metrics, format_func=metric_labels.get, key="trend_metric")
+    window = st.slider("이동 평균 기간 (시즌)", min_value=1, max_value=20, value=5, key="trend_window")
+    show_raw = st.checkbox("시즌별 값 표시", value=True, key="trend_raw")
+    show_band = st.checkbox("이동 표준편차 범위 표시", value=False, key="trend_band")
+
+    if selected_teams:
+        first_year = min(store.year_range(team)[0] for team in selected_teams)
+        last_year = max(store.year_range(team)[1] for team in selected_teams)
+        if first_year < last_year:
+            start_year, end_year = st.slider("연도 범위", first_year, last_year, (first_year, last_year), key="trend_years")
+        else:
+            start_year = end_year = first_year
+
+# Streamlit UI
+st.title("📈시즌마다 어떻게 달라졌을까?: 팀 지표 추세📈")
+
+left_col, right_col = st.columns([2, 1])
+
+with left_col:
+    st.header("[팀 지표 추세]")
+    if not selected_teams:
+        st.info("사이드바에서 팀을 하나 이상 선택하세요.")
+    else:
+        fig = go.Figure()
+        downsampled = []
+        for team, color in zip(selected_teams, colors):
+            # 저장된 배열의 연도 구간 조각과 누적합으로 구한 이동 통계
+            years, values, mean, std = store.trend(team, selected_metric, window, start_year, end_year)
+            if len(years) == 0:
+                continue
+            label = store.label(team)
+
+            # 긴 시계열은 선 모양을 유지하며 점 수를 줄여서 전송
+            keep = downsample_lttb(years, mean)
+            if len(keep) < len(years):
+                downsampled.append(label)
+            if show_band:
+                fig.add_trace(go.Scatter(
+                    x=np.concatenate([years[keep], years[keep][::-1]]),
+                    y=np.concatenate([(mean + std)[keep], (mean - std)[keep][::-1]]),
+                    fill="toself", fillcolor=color, opacity=0.15, line={"width": 0},
+                    hoverinfo="skip", showlegend=False,
+                ))
+            if show_raw:
+                raw_keep = downsample_lttb(years, values)
+                fig.add_trace(go.Scatter(
+                    x=years[raw_keep], y=values[raw_keep], mode="lines", name=f"{label} 시즌별",
+                    line={"color": color, "width": 1}, opacity=0.4,
+                ))
+            fig.add_trace(go.Scatter(
+                x=years[keep], y=mean[keep], mode="lines", name=f"{label} {window}시즌 이동 평균",
+                line={"color": color, "width": 3},
+            ))
+
+        fig.update_layout(
+            xaxis_title="연도",
+            yaxis_title=f"{metric_labels[selected_metric]} (리그 평균 대비)",
+            legend={"orientation": "h", "y": -0.2},
+            height=550,
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        if downsampled:
+            st.caption(f"{', '.join(downsampled)}: 시즌이 많아 팀마다 {MAX_POINTS}개 점으로 줄여서 표시했습니다.")
+
+with right_col:
+    st.header("[설명]")
+    st.markdown("""
+    ### 📊 팀 지표 추세란?
+    각 팀의 시즌별 주요 지표가 **리그 평균과 비교해 어떻게 변해 왔는지**를 보여줍니다.
+    값이 0보다 크면 그 시즌 리그 평균보다 높았다는 뜻입니다. (ERA는 낮을수록 좋습니다)
+
+    #### 🔑 주요 기능
+    - **여러 팀 비교**: 최대 6개 팀의 추세를 한 그래프에서 비교.
+    - **이동 평균**: 시즌별 변동을 줄여 장기적인 흐름을 확인.
+    - **이동 표준편차 범위**: 해당 기간 성적이 얼마나 들쭉날쭉했는지 확인.
+    - **연도 범위 선택**: 원하는 시대만 골라서 보기.
+
+    #### 📋 주요 지표
+    - **OPS**: 출루율과 장타율의 합.
+    - **ERA**: 투수의 평균자책점.
+    - **WP**: 승률.
+    - **PAR/PARA**: 특정 상황에서 선수의 기여도.
+    - **BA**: 타율.
+    - **OBP**: 출루율.
+    """)
+
+page_run.finish()
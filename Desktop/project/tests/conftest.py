@@ -0,0 +1,5 @@
+# 테스트에서 프로젝트 폴더의 utils 패키지를 import할 수 있도록 경로 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
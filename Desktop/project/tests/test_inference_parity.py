@@ -0,0 +1,124 @@
+# flat 배열 추론 엔진(utils/추론엔진.py)이 sklearn과 같은 예측을 내는지 확인
+#
+# 합성 데이터로 학습한 랜덤 포레스트와, 저장소의 rf_model.pkl(Git LFS로 받은 경우에만)을
+# flatten_forest로 변환해 sklearn의 predict/predict_proba와 비교함.
+# 스케일러를 기준값에 합친 파이프라인(fold_scaler)은 scaler.transform 후 model.predict한 결과와 비교함.
+# 실행 (프로젝트 폴더에서): python -m pytest tests
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from utils.설정 import MODEL_FILES, PIPELINES, project_path
+from utils.모델저장 import flatten_forest, fold_scaler
+from utils.추론엔진 import FlatForest, ParityError, ScaledModel, check_parity, sample_inputs
+
+
+def _load_pickle(name):
+    # 저장소의 모델 파일 (LFS 포인터만 있거나 현재 sklearn으로 열 수 없으면 건너뜀)
+    path = project_path(MODEL_FILES[name])
+    if not os.path.exists(path) or os.path.getsize(path) < 1024:
+        pytest.skip(f"{MODEL_FILES[name]}: 모델 파일이 없습니다 (git lfs pull 필요)")
+    try:
+        return joblib.load(path)
+    except Exception as e:
+        pytest.skip(f"{MODEL_FILES[name]}: 로드할 수 없습니다 ({e})")
+
+
+def _synthetic(n_samples=400, n_features=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(scale=[1.0, 10.0, 100.0, 0.1, 1000.0, 5.0][:n_features], size=(n_samples, n_features))
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) + X[:, 2] / 50 + rng.normal(scale=0.1, size=n_samples)
+    return X, y
+
+
+def _flat(model):
+    arrays, meta = flatten_forest(model)
+    return FlatForest(arrays, meta)
+
+
+def test_regressor_matches_sklearn():
+    X, y = _synthetic()
+    model = RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+    forest = _flat(model)
+
+    for inputs in (X, sample_inputs(forest)):
+        np.testing.assert_allclose(forest.predict(inputs), model.predict(inputs), rtol=1e-12, atol=0)
+
+
+def test_classifier_matches_sklearn():
+    X, y = _synthetic(seed=1)
+    labels = np.digitize(y, np.quantile(y, [0.33, 0.66]))
+    model = RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0).fit(X, labels)
+    forest = _flat(model)
+
+    inputs = sample_inputs(forest)
+    predicted, proba = forest.predict_with_proba(inputs)
+    np.testing.assert_array_equal(predicted, model.predict(inputs))
+    np.testing.assert_allclose(proba, model.predict_proba(inputs), rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(forest.predict_proba(inputs), model.predict_proba(inputs), rtol=1e-12, atol=1e-12)
+
+
+def test_check_parity_raises_on_mismatch():
+    X, y = _synthetic()
+    model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0).fit(X, y)
+    arrays, meta = flatten_forest(model)
+    arrays["value"] = arrays["value"] + 1.0
+
+    with pytest.raises(ParityError):
+        check_parity(model, FlatForest(arrays, meta))
+
+
+def test_rf_model_matches_sklearn():
+    model = _load_pickle("rf_model")
+    forest = _flat(model)
+
+    assert check_parity(model, forest) <= 1e-9
+
+
+def _fused(scaler, model):
+    # export_pipeline과 같은 방식으로 스케일러를 기준값에 합친 엔진
+    arrays, meta = flatten_forest(model)
+    arrays["threshold"] = fold_scaler(arrays, scaler)
+    meta["input_dtype"] = "float64"
+    return FlatForest(arrays, meta)
+
+
+def _boundary_inputs(forest, n_samples=2000, seed=0):
+    # 합친 기준값 바로 위/아래 값을 섞은 원래 단위의 입력 (반올림 경계에서 어긋나는지 확인)
+    rng = np.random.default_rng(seed)
+    X = sample_inputs(forest, n_samples, seed)
+    is_split = np.isfinite(forest.threshold)
+    features = np.asarray(forest.feature)[is_split]
+    thresholds = np.asarray(forest.threshold)[is_split]
+    for j in range(forest.n_features_in_):
+        t = thresholds[features == j]
+        if len(t):
+            picked = rng.choice(t, n_samples)
+            X[:, j] = np.where(rng.random(n_samples) < 0.5, picked, np.nextafter(picked, np.inf))
+    return X
+
+
+@pytest.mark.parametrize("scaler_class", [StandardScaler, MinMaxScaler])
+def test_folded_thresholds_match_scaler_transform(scaler_class):
+    X, y = _synthetic(seed=2)
+    scaler = scaler_class().fit(X)
+    model = RandomForestRegressor(n_estimators=20, max_depth=10, random_state=0).fit(scaler.transform(X), y)
+    forest = _fused(scaler, model)
+
+    for inputs in (X, _boundary_inputs(forest)):
+        np.testing.assert_array_equal(forest.predict(inputs), model.predict(scaler.transform(inputs)))
+    assert check_parity(ScaledModel(scaler, model), forest) == 0
+
+
+@pytest.mark.parametrize("pipeline", ["hitter_pipeline", "pitcher_pipeline"])
+def test_pipeline_matches_sklearn(pipeline):
+    scaler_name, model_name = PIPELINES[pipeline]
+    scaler, model = _load_pickle(scaler_name), _load_pickle(model_name)
+    forest = _fused(scaler, model)
+
+    inputs = _boundary_inputs(forest)
+    np.testing.assert_allclose(forest.predict(inputs), ScaledModel(scaler, model).predict(inputs), rtol=1e-9, atol=0)
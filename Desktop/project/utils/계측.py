@@ -0,0 +1,233 @@
+# 단계별 소요 시간/메모리/캐시 적중 계측 (모든 페이지 공용)
+#
+# 모델 로드, 데이터 읽기, 예측, 페이지 재실행 같은 단계를 measure()로 감싸면
+# 소요 시간과 RSS 변화량이 프로세스 공용 기록에 쌓임. 기록은 두 곳에서 볼 수 있음:
+#   - 관리자 화면: 메인 페이지 주소 뒤에 ?admin=1 (예: http://localhost:8501/?admin=1)
+#   - Prometheus 텍스트 형식: http://127.0.0.1:9464/metrics (설정.METRICS_PORT, 0이면 끔)
+import time  # 시간 측정
+import threading  # 여러 세션이 동시에 기록하므로 잠금 사용
+import functools  # 데코레이터
+from collections import deque  # 단계별 최근 기록 보관
+from contextlib import contextmanager  # 측정 구간 지정
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # 메트릭 엔드포인트
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import METRICS_PORT
+from utils.공통함수 import get_rss_mb
+
+MAX_SAMPLES = 2048  # 단계마다 보관하는 최근 측정값 수 (백분위수 계산용)
+QUANTILES = [0.5, 0.9, 0.99]
+
+
+class _Stage:
+    # 한 단계의 누적 횟수/시간과 최근 측정값
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.total_rss_mb = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+
+_stages = {}  # 단계 이름 -> _Stage
+_cache_counts = {}  # 캐시 이름 -> [적중, 미적중]
+_lock = threading.Lock()
+
+
+def record(stage, seconds, rss_delta_mb=0.0):
+    # 측정값 하나를 기록 (다른 곳에서 이미 잰 시간도 그대로 넘길 수 있음)
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = _Stage()
+        entry.count += 1
+        entry.total_seconds += seconds
+        entry.total_rss_mb += rss_delta_mb
+        entry.samples.append(seconds)
+
+
+def record_cache(cache, hit):
+    # 캐시 조회 결과 기록
+    with _lock:
+        counts = _cache_counts.setdefault(cache, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+@contextmanager
+def measure(stage):
+    # with measure("data:read_csv"): ...  형태로 감싼 구간의 시간과 RSS 변화량을 기록
+    rss_before = get_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, get_rss_mb() - rss_before)
+
+
+def timed(stage):
+    # 함수 전체를 한 단계로 기록하는 데코레이터
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class PageRun:
+    # 페이지 재실행 한 번의 전체 시간 (페이지 맨 위에서 시작하고 맨 아래에서 finish)
+
+    def __init__(self, page):
+        self.stage = f"page:{page}"
+        self.rss_before = get_rss_mb()
+        self.start = time.perf_counter()
+
+    def finish(self):
+        record(self.stage, time.perf_counter() - self.start, get_rss_mb() - self.rss_before)
+
+
+def begin_rerun(page):
+    ensure_metrics_server()
+    return PageRun(page)
+
+
+def snapshot():
+    # 단계별 요약 (횟수, 합계, 평균 RSS 변화량, 백분위수)과 최근 측정값, 캐시 적중 횟수
+    with _lock:
+        stages = {
+            name: {
+                "count": s.count,
+                "total_seconds": s.total_seconds,
+                "avg_rss_delta_mb": s.total_rss_mb / s.count if s.count else 0.0,
+                "samples": np.array(s.samples),
+            }
+            for name, s in _stages.items()
+        }
+        caches = {name: {"hits": c[0], "misses": c[1]} for name, c in _cache_counts.items()}
+    for summary in stages.values():
+        samples = summary["samples"]
+        summary["quantiles"] = {q: float(np.quantile(samples, q)) for q in QUANTILES} if len(samples) else {}
+    return stages, caches
+
+
+# ---------------------------------------------------------------
+# Prometheus 텍스트 형식
+# ---------------------------------------------------------------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus():
+    stages, caches = snapshot()
+    lines = [
+        "# HELP balab_stage_seconds 단계별 소요 시간 (최근 측정값 기준 백분위수)",
+        "# TYPE balab_stage_seconds summary",
+    ]
+    for name, s in sorted(stages.items()):
+        label = f'stage="{_escape(name)}"'
+        for q, value in s["quantiles"].items():
+            lines.append(f'balab_stage_seconds{{{label},quantile="{q}"}} {value:.6f}')
+        lines.append(f"balab_stage_seconds_sum{{{label}}} {s['total_seconds']:.6f}")
+        lines.append(f"balab_stage_seconds_count{{{label}}} {s['count']}")
+    lines += [
+        "# HELP balab_stage_rss_delta_mb 단계 한 번에 늘어난 평균 상주 메모리(MB)",
+        "# TYPE balab_stage_rss_delta_mb gauge",
+    ]
+    for name, s in sorted(stages.items()):
+        lines.append(f'balab_stage_rss_delta_mb{{stage="{_escape(name)}"}} {s["avg_rss_delta_mb"]:.3f}')
+    lines += [
+        "# HELP balab_cache_requests_total 캐시 조회 횟수",
+        "# TYPE balab_cache_requests_total counter",
+    ]
+    for name, c in sorted(caches.items()):
+        lines.append(f'balab_cache_requests_total{{cache="{_escape(name)}",result="hit"}} {c["hits"]}')
+        lines.append(f'balab_cache_requests_total{{cache="{_escape(name)}",result="miss"}} {c["misses"]}')
+    lines += [
+        "# HELP balab_process_rss_mb 현재 프로세스 상주 메모리(MB)",
+        "# TYPE balab_process_rss_mb gauge",
+        f"balab_process_rss_mb {get_rss_mb():.3f}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 터미널에 로그를 남기지 않음
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def ensure_metrics_server(port=METRICS_PORT):
+    # 메트릭 엔드포인트를 localhost에서 한 번만 시작 (포트가 사용 중이면 건너뜀)
+    global _server
+    if not port or _server is not None:
+        return _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            except OSError:
+                _server = False  # 다른 Streamlit 프로세스가 이미 사용 중
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server or None
+
+
+# ---------------------------------------------------------------
+# 관리자 화면
+# ---------------------------------------------------------------
+def render_admin_panel():
+    import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+    import plotly.express as px  # 대화형 데이터 시각화를 위한 라이브러리
+    import streamlit as st  # Streamlit 웹 애플리케이션 프레임워크
+
+    st.title("⚙️ 관리자: 단계별 성능 계측")
+    stages, caches = snapshot()
+    st.caption(f"현재 프로세스 메모리: {get_rss_mb():.1f}MB · Prometheus 엔드포인트: "
+               + (f"http://127.0.0.1:{METRICS_PORT}/metrics" if ensure_metrics_server() else "사용 안 함"))
+    if not stages:
+        st.info("아직 기록된 측정값이 없습니다. 다른 페이지를 사용한 뒤 다시 확인하세요.")
+        return
+
+    table = pd.DataFrame([
+        {
+            "단계": name,
+            "횟수": s["count"],
+            **{f"p{int(q * 100)} (ms)": s["quantiles"].get(q, 0.0) * 1000 for q in QUANTILES},
+            "합계 (초)": s["total_seconds"],
+            "평균 메모리 변화 (MB)": s["avg_rss_delta_mb"],
+        }
+        for name, s in stages.items()
+    ]).sort_values("합계 (초)", ascending=False)
+    st.dataframe(table.round(3), use_container_width=True, hide_index=True)
+
+    if caches:
+        st.subheader("캐시 적중")
+        st.dataframe(pd.DataFrame([
+            {"캐시": name, "적중": c["hits"], "미적중": c["misses"],
+             "적중률 (%)": 100 * c["hits"] / max(1, c["hits"] + c["misses"])}
+            for name, c in caches.items()
+        ]).round(1), use_container_width=True, hide_index=True)
+
+    st.subheader("단계별 소요 시간 분포")
+    stage = st.selectbox("단계 선택", list(table["단계"]))
+    samples = stages[stage]["samples"] * 1000
+    fig = px.histogram(pd.DataFrame({"ms": samples}), x="ms", nbins=40, log_y=True)
+    for q, value in stages[stage]["quantiles"].items():
+        fig.add_vline(x=value * 1000, line_dash="dash", annotation_text=f"p{int(q * 100)}")
+    st.plotly_chart(fig, use_container_width=True)
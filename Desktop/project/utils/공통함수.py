@@ -0,0 +1,297 @@
+# 페이지 공통 함수 모음
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import time  # 시간 측정
+import threading  # 여러 세션이 동시에 로드하지 않도록 잠금
+import hashlib  # 파일 체크섬
+import joblib  # 머신러닝 모델 저장 및 로드 (Pickle의 대안)
+
+from utils.설정 import MODEL_FILES, PIPELINES, FOREST_DIR, project_path
+
+
+# ---------------------------------------------------------------
+# 메모리 사용량 측정
+# ---------------------------------------------------------------
+def get_rss_mb():
+    # 현재 프로세스의 상주 메모리(RSS)를 MB 단위로 반환
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # /proc이 없는 환경(맥 등)에서는 최대 RSS로 대체
+        import resource
+        import sys
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # 맥은 바이트, 리눅스는 KB 단위
+        return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    # 파일 체크섬 (캐시/변환 결과가 원본과 맞는지 확인용)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_file_versions = {}  # 경로 -> ((크기, 수정 시각), 체크섬)
+_file_versions_lock = threading.Lock()
+
+
+def file_version(path):
+    # 원본 파일이 바뀌었는지 확인할 때 쓰는 체크섬 (크기/수정 시각이 그대로면 다시 읽지 않음)
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _file_versions_lock:
+        cached = _file_versions.get(path)
+        if cached is None or cached[0] != signature:
+            cached = _file_versions[path] = (signature, file_sha256(path))
+        return cached[1]
+
+
+# ---------------------------------------------------------------
+# 모델 레지스트리: 프로세스당 한 번만 로드해 모든 세션/페이지에서 공유
+# ---------------------------------------------------------------
+# Streamlit은 페이지 스크립트를 매 실행마다 다시 돌리지만 import된 모듈은
+# 프로세스 안에 그대로 남아 있으므로, 여기 저장된 모델은 재실행 시 다시 로드되지 않음
+_models = {}  # 이름 -> 로드된 객체
+_load_stats = {}  # 이름 -> 로드 시간/메모리 정보
+_versions = {}  # 이름 -> 로드할 때의 원본 버전 (load_once의 version)
+_locks = {}  # 이름 -> 로드 잠금
+_locks_guard = threading.Lock()
+_loading = threading.local()  # 스레드별로 로드 중인 항목 스택 (로드 안에서 다른 항목을 로드한 비용 구분)
+
+
+def _lock_for(name):
+    # 모델마다 별도의 잠금 (타자 모델 로드 중에도 투수 모델은 로드 가능)
+    with _locks_guard:
+        if name not in _locks:
+            _locks[name] = threading.Lock()
+        return _locks[name]
+
+
+def _note_nested(key):
+    # 다른 항목의 loader 안에서 가져온 항목이면 바깥 항목에 기록
+    stack = getattr(_loading, "stack", None)
+    if stack:
+        stack[-1]["keys"].append(key)
+
+
+def load_once(key, loader, version=None):
+    # key 기준으로 한 번만 loader()를 실행하고 로드 시간/메모리 증가량을 기록
+    # loader는 (객체, 표시용 파일명, 파일 경로)를 반환
+    # version(원본 파일 체크섬 등)을 주면 로드할 때의 값과 달라졌을 때 다시 로드
+    from utils.계측 import record, record_cache  # 계측 모듈이 이 모듈을 import하므로 함수 안에서
+
+    if key in _models and _versions.get(key) == version:
+        _load_stats[key]["hits"] += 1
+        record_cache("model_registry", True)
+        _note_nested(key)
+        return _models[key]
+
+    with _lock_for(key):
+        # 잠금을 기다리는 동안 다른 세션이 이미 로드했을 수 있음
+        if key in _models and _versions.get(key) == version:
+            _load_stats[key]["hits"] += 1
+            record_cache("model_registry", True)
+            _note_nested(key)
+            return _models[key]
+
+        # loader 안에서 다른 항목을 로드하면 (get_predictor가 load_model을 부르는 경우 등)
+        # 그 비용은 안쪽 항목에만 기록하고 여기서는 뺌
+        stack = getattr(_loading, "stack", None)
+        if stack is None:
+            stack = _loading.stack = []
+        nested = {"seconds": 0.0, "rss_mb": 0.0, "keys": []}
+        stack.append(nested)
+        rss_before = get_rss_mb()
+        start = time.perf_counter()
+        try:
+            model, file_name, path = loader()
+        finally:
+            stack.pop()
+        elapsed = time.perf_counter() - start
+        rss_delta = get_rss_mb() - rss_before
+        if stack:
+            stack[-1]["seconds"] += elapsed
+            stack[-1]["rss_mb"] += rss_delta
+        _note_nested(key)
+        own_seconds = elapsed - nested["seconds"]
+        own_rss = rss_delta - nested["rss_mb"]
+        record(f"load:{key}", own_seconds, own_rss)
+        record_cache("model_registry", False)
+
+        _load_stats[key] = {
+            "name": key,
+            "file": file_name,
+            "file_mb": _path_size(path) / (1024 * 1024),
+            "load_seconds": own_seconds,
+            "rss_delta_mb": own_rss,
+            "loaded_at": time.time(),
+            "hits": 0,
+            # 다른 항목의 객체를 그대로 반환했으면 그 이름 (같은 모델이 두 번 집계되지 않도록 합계에서 제외)
+            "alias_of": next((name for name, obj in list(_models.items()) if obj is model and name != key), None),
+            # loader 안에서 가져온 항목 (파일 크기는 안쪽 항목에서 집계)
+            "includes": nested["keys"],
+        }
+        _versions[key] = version
+        _models[key] = model
+        return model
+
+
+def replace_loaded(objects, version=None):
+    # 로드된 객체들을 새로 만든 객체로 교체 ({이름: 객체}, 새 시즌 반영 등)
+    # 이름마다 참조 하나만 바꾸므로 조회 중인 세션은 이전 객체로 끝까지 진행 (로드된 적 없는 이름은 제외)
+    for key, obj in objects.items():
+        if key not in _load_stats:
+            continue
+        with _lock_for(key):
+            _versions[key] = version
+            _models[key] = obj
+
+
+def _path_size(path):
+    # 파일 또는 폴더(변환된 모델)의 전체 크기
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def load_model(name):
+    # 이름으로 모델/스케일러를 가져옴 (처음 한 번만 디스크에서 로드)
+    if name not in MODEL_FILES:
+        raise KeyError(f"등록되지 않은 모델입니다: {name}")
+    path = project_path(MODEL_FILES[name])
+    # pickle로 저장된 파일도 joblib으로 로드 가능
+    return load_once(name, lambda: (joblib.load(path), MODEL_FILES[name], path))
+
+
+def get_predictor(name):
+    # 예측용 모델을 가져옴: flat 배열 변환본(utils/모델저장.py)이 있으면 메모리 맵으로 열고,
+    # 없으면 pickle 모델을 그대로 사용. 예측 버튼을 누를 때 호출하면
+    # 예측하지 않는 페이지/세션은 모델 메모리를 쓰지 않음
+    from utils.모델저장 import load_forest
+
+    def loader():
+        forest = load_forest(name)
+        if forest is None:
+            path = project_path(MODEL_FILES[name])
+            return load_model(name), MODEL_FILES[name], path
+        return forest, f"cache/models/{name} (mmap)", os.path.join(FOREST_DIR, name)
+
+    return load_once(f"{name}@predictor", loader)
+
+
+def get_pipeline(name):
+    # 스케일러 + 모델 예측기를 가져옴: 스케일러를 기준값에 합친 변환본(utils/모델저장.py)이 있고
+    # 두 원본 파일과 모두 일치하면 그것을 쓰고, 없으면 scaler.transform 후 predict하는 예측기를 사용
+    from utils.모델저장 import load_forest
+    from utils.추론엔진 import ScaledModel
+
+    def loader():
+        fused = load_forest(name)
+        if fused is None:
+            scaler_name, model_name = PIPELINES[name]
+            pipeline = ScaledModel(load_model(scaler_name), get_predictor(model_name))
+            return pipeline, f"{MODEL_FILES[scaler_name]} + {MODEL_FILES[model_name]}", project_path(MODEL_FILES[model_name])
+        return fused, f"cache/models/{name} (mmap, 스케일러 포함)", os.path.join(FOREST_DIR, name)
+
+    return load_once(f"{name}@predictor", loader)
+
+
+def preload_models(names=None):
+    # 서버 시작 시 등 미리 모델을 올려두고 싶을 때 사용
+    for name in names or MODEL_FILES:
+        load_model(name)
+
+
+def model_stats():
+    # 로드된 모델별 로드 시간, 메모리 증가량, 재사용 횟수 목록
+    # (load_seconds/rss_delta_mb는 안쪽에서 로드한 항목을 뺀 자기 비용)
+    return [dict(stats) for stats in _load_stats.values()]
+
+
+def model_stats_total(stats):
+    # 중복 없이 합친 파일 크기, 로드 시간, 메모리 증가량
+    # (다른 항목의 별칭은 빼고, 파일 크기는 다른 항목을 감싼 항목을 빼고 합산)
+    owned = [s for s in stats if not s["alias_of"]]
+    return {
+        "file_mb": sum(s["file_mb"] for s in owned if not s["includes"]),
+        "load_seconds": sum(s["load_seconds"] for s in owned),
+        "rss_delta_mb": sum(s["rss_delta_mb"] for s in owned),
+    }
+
+
+def show_model_stats(names):
+    # 페이지 하단에 모델 로드 정보를 표시
+    import streamlit as st  # Streamlit 웹 애플리케이션 프레임워크
+
+    stats = [s for s in model_stats() if s["name"].split("@")[0] in names]
+    if not stats:
+        return
+    with st.expander("⚙️ 모델 로드 정보"):
+        for s in stats:
+            if s["alias_of"]:
+                st.caption(f"{s['name']}: {s['alias_of']}와 같은 모델 (추가 로드 없음), 재사용 {s['hits']}회")
+                continue
+            st.caption(
+                f"{s['file']}: {s['file_mb']:.1f}MB, 로드 {s['load_seconds']:.2f}초, "
+                f"메모리 +{s['rss_delta_mb']:.1f}MB, 재사용 {s['hits']}회"
+            )
+        total = model_stats_total(stats)
+        st.caption(
+            f"합계: {total['file_mb']:.1f}MB, 로드 {total['load_seconds']:.2f}초, 메모리 +{total['rss_delta_mb']:.1f}MB"
+        )
+        st.caption(f"현재 프로세스 메모리: {get_rss_mb():.1f}MB")
+
+        from utils.예측캐시 import cache_stats
+        cache = cache_stats()
+        st.caption(
+            f"예측 결과 캐시: 적중 {cache['hits']}회, 미적중 {cache['misses']}회 "
+            f"(적중률 {cache['hit_rate'] * 100:.0f}%), 저장 {cache['entries']}개"
+        )
+
+        from utils.프로세스풀 import pool_info
+        pool = pool_info()
+        if pool["workers"]:
+            st.caption(f"예측 작업 프로세스: {pool['workers']}개 ({pool['start_method']}, {'실행 중' if pool['started'] else '대기'})")
+
+        from utils.배치서버 import batcher_stats
+        for b in batcher_stats():
+            if b["name"] in names:
+                st.caption(
+                    f"{b['name']} 배치 서비스: {b['rows']}행을 {b['batches']}번에 처리 "
+                    f"(평균 {b['avg_batch']:.1f}행, 최대 {b['largest_batch']}행)"
+                )
+
+
+# ---------------------------------------------------------------
+# 예측 진행 표시: 인위적인 대기 없이 실제 처리 단계마다 진행률 갱신
+# ---------------------------------------------------------------
+def run_stages(message, stages, done_message):
+    # stages: [(단계 이름, 함수), ...] 각 함수는 이전 단계의 결과를 받아 다음 결과를 반환
+    # 모든 단계가 끝나면 진행 표시를 완료 문구로 바꾸고 마지막 결과를 반환
+    import streamlit as st  # Streamlit 웹 애플리케이션 프레임워크
+
+    placeholder = st.empty()
+    result = None
+    for i, (label, func) in enumerate(stages):
+        placeholder.progress(i / len(stages), text=f"{message} ({label})")
+        result = func(result)
+    placeholder.text(done_message)
+    return result
+
+
+def wait_for_future(future, message, done_message, poll_seconds=0.1):
+    # 작업 프로세스/배치 서비스에 넘긴 예측이 끝날 때까지 경과 시간을 표시하며 기다림
+    # (기다리는 동안 GIL을 놓으므로 같은 서버의 다른 세션은 계속 실행됨)
+    import streamlit as st  # Streamlit 웹 애플리케이션 프레임워크
+
+    placeholder = st.empty()
+    start = time.perf_counter()
+    while not future.done():
+        placeholder.text(f"{message} ({time.perf_counter() - start:.1f}초)")
+        time.sleep(poll_seconds)
+    placeholder.text(done_message)
+    return future.result()
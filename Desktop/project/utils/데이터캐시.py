@@ -0,0 +1,91 @@
+# CSV 데이터를 열 단위 바이너리(Feather) 캐시로 변환해 빠르게 읽는 모듈
+#
+# 팀 성과 CSV는 BA_diff, OPS_diff 같은 실수 열이 많아 텍스트 파싱 비용이 큼.
+# 처음 한 번 자료형이 정해진 Feather 파일(cache/data/)로 저장해 두고, 이후에는
+# 필요한 열만 골라 읽음. 원본 CSV의 체크섬이 바뀌면 캐시를 다시 만듦.
+# (Feather는 Streamlit이 함께 설치하는 pyarrow를 사용하며, 없으면 CSV를 그대로 읽음)
+#
+# 사용법 (프로젝트 폴더에서 실행):
+#   python -m utils.데이터캐시    # 팀 성과 CSV 두 개를 미리 변환
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import json  # 캐시 메타 정보 저장
+import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+
+from utils.설정 import DATA_CACHE_DIR, project_path
+from utils.공통함수 import file_sha256
+from utils.계측 import measure, record_cache
+
+
+def _cache_paths(source_name):
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    return (
+        os.path.join(DATA_CACHE_DIR, f"{stem}.feather"),
+        os.path.join(DATA_CACHE_DIR, f"{stem}.json"),
+    )
+
+
+def _cached_checksum(meta_path):
+    # 캐시를 만들 때 기록한 원본 체크섬 (없으면 None)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f).get("source_sha256")
+
+
+def build_cache(source_name, reader, checksum=None):
+    # reader(원본 경로)로 읽은 DataFrame을 Feather로 저장하고 그 DataFrame을 반환
+    source = project_path(source_name)
+    cache_path, meta_path = _cache_paths(source_name)
+    data = reader(source)
+
+    os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+    # 다른 프로세스가 읽는 도중이거나 같이 만드는 중인 파일을 덮어쓰지 않도록
+    # 프로세스마다 다른 임시 파일에 다 쓴 뒤 교체 (Feather는 기본 RangeIndex만 저장할 수 있음)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    data.reset_index(drop=True).to_feather(tmp_path)
+    os.replace(tmp_path, cache_path)
+    # 메타 파일을 마지막에 써서, 저장 도중 중단된 캐시는 사용되지 않게 함
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"source_file": source_name, "source_sha256": checksum or file_sha256(source)}, f)
+    os.replace(tmp_path, meta_path)
+    return data
+
+
+def read_table(source_name, reader, columns=None):
+    # 캐시가 원본과 일치하면 Feather에서 필요한 열만 읽고, 아니면 원본을 읽어 캐시를 다시 만듦
+    source = project_path(source_name)
+    cache_path, meta_path = _cache_paths(source_name)
+    checksum = file_sha256(source)
+    name = os.path.basename(source_name)
+
+    if os.path.exists(cache_path) and _cached_checksum(meta_path) == checksum:
+        try:
+            with measure(f"data:read_feather:{name}"):
+                data = pd.read_feather(cache_path, columns=columns)
+            record_cache("feather_cache", True)
+            return data
+        except ImportError:
+            pass  # pyarrow가 없는 환경
+
+    record_cache("feather_cache", False)
+    with measure(f"data:read_csv:{name}"):
+        try:
+            data = build_cache(source_name, reader, checksum)
+        except (ImportError, OSError):
+            # pyarrow가 없거나 캐시 폴더에 쓸 수 없으면 CSV 결과를 그대로 사용
+            data = reader(source)
+    return data if columns is None else data[list(columns)]
+
+
+if __name__ == "__main__":
+    from utils.설정 import TEAM_METRICS_FILE, TEAM_AVERAGES_FILE
+    from utils.팀데이터 import read_team_metrics, read_team_averages
+
+    for source_name, reader in [(TEAM_METRICS_FILE, read_team_metrics), (TEAM_AVERAGES_FILE, read_team_averages)]:
+        data = build_cache(source_name, reader)
+        cache_path, _ = _cache_paths(source_name)
+        print(
+            f"{source_name}: {len(data):,}행 x {data.shape[1]}열, "
+            f"{os.path.getsize(project_path(source_name)) / 1024:.0f}KB -> {os.path.getsize(cache_path) / 1024:.0f}KB"
+        )
@@ -0,0 +1,225 @@
+# 레이더 차트 데이터 미리 계산 (5, 6페이지 공용)
+#
+# 레이더 차트는 팀-시즌 하나마다 8개 지표의 리그 평균 대비 차이(_diff)를 소수 셋째 자리로
+# 반올림한 값만 필요함. 모든 (연도, 리그, 팀) 조합(2,805개)의 값을 한 번에 계산해
+# cache/data/radar_payloads.json에 저장해 두고, 페이지에서는 dict 조회 한 번과
+# 정해진 ECharts 옵션 틀에 값을 끼워 넣는 것만 하도록 함.
+# 원본 CSV의 체크섬이 바뀌면 다시 계산함.
+# 리그 내 백분위/표준 점수 척도로 그릴 때는 utils/순위.py의 순위 행렬에서 값을 가져옴.
+#
+# 사용법 (프로젝트 폴더에서 실행):
+#   python -m utils.레이더    # 레이더 차트 데이터를 미리 계산
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import json  # 계산 결과 저장
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import TEAM_METRICS_FILE, COLUMNS_FOR_SPIDER, DATA_CACHE_DIR, project_path
+from utils.공통함수 import load_once, file_sha256
+from utils.순위 import LOWER_IS_BETTER, SCALE_DIGITS, get_team_rankings
+
+DIFF_COLUMNS = [col + '_diff' for col in COLUMNS_FOR_SPIDER]
+PAYLOAD_PATH = os.path.join(DATA_CACHE_DIR, "radar_payloads.json")
+
+# 레이더 차트 척도 (모든 팀-시즌이 같은 축을 사용)
+# diff: 리그 평균 대비 차이, percentile/zscore: 리그 내 백분위/표준 점수 (ERA, PARA는 낮을수록 바깥쪽)
+RADAR_SCALES = {
+    "diff": {"label": "리그 평균 대비 차이", "min": -1, "max": 1},
+    "percentile": {"label": "리그 내 백분위 (0~100)", "min": 0, "max": 100},
+    "zscore": {"label": "리그 내 표준 점수", "min": -3, "max": 3},
+}
+
+
+def radar_indicators(scale="diff"):
+    # 레이더 차트 축 목록
+    bounds = RADAR_SCALES[scale]
+    return [
+        {
+            "name": f"{col} (낮을수록 좋음)" if scale != "diff" and col in LOWER_IS_BETTER else col,
+            "max": bounds["max"],
+            "min": bounds["min"],
+        }
+        for col in COLUMNS_FOR_SPIDER
+    ]
+
+
+RADAR_INDICATORS = radar_indicators()
+
+# 여러 팀 비교: 한 차트에 겹쳐 그릴 최대 시리즈 수와 색상
+# (시리즈가 늘어나면 차트를 알아보기 어렵고 브라우저로 보내는 옵션도 커지므로 넘으면 고르게 추려서 표시)
+MAX_SERIES = 20
+SERIES_COLORS = [
+    "#FF5733", "#3375FF", "#2ECC71", "#F1C40F", "#9B59B6", "#1ABC9C", "#E67E22",
+    "#34495E", "#E84393", "#00B894", "#6C5CE7", "#B33771", "#7F8C8D", "#D35400",
+    "#16A085", "#8E44AD", "#C0392B", "#2980B9", "#27AE60", "#F39C12",
+]
+
+
+def radar_values(values):
+    # 지표 값 배열 -> 레이더 차트에 표시할 반올림 값 목록 (페이지에서 쓰던 방식과 동일)
+    return [round(val, 3) for val in values.tolist()]
+
+
+def series_entry(values, name, color, opacity=0.2):
+    # ECharts 레이더 시리즈 항목 하나
+    return {
+        "value": values,
+        "name": name,
+        "itemStyle": {"color": color},
+        "lineStyle": {"color": color},
+        "areaStyle": {"opacity": opacity, "color": color},
+    }
+
+
+def scaled_series_item(payloads, year, league, team, color, scale="diff", name=None):
+    # 척도에 맞는 시리즈 항목 하나 (차이는 미리 계산한 레이더 차트 데이터, 나머지는 순위 행렬)
+    if scale == "diff":
+        return payloads.series_item(year, league, team, color, name)
+    values = get_team_rankings().radar_values(year, league, team, scale)
+    if values is None:
+        return None
+    return series_entry(values, name or f"{team} ({year})", color)
+
+
+class RadarPayloads:
+    # (연도, 리그, 팀) -> 반올림한 8개 지표 차이 값
+
+    def __init__(self, values, source_sha256=None):
+        self.values = values
+        self.source_sha256 = source_sha256
+
+    @classmethod
+    def from_store(cls, store, source_sha256=None):
+        # 팀 성과 저장소(utils/팀데이터.py)의 모든 행을 한 번에 변환
+        matrix = store.matrix(DIFF_COLUMNS)
+        values = {
+            (int(year), str(league), str(team)): radar_values(row)
+            for (year, league, team), row in zip(store.data.index, matrix)
+        }
+        return cls(values, source_sha256)
+
+    def get(self, year, league, team):
+        # 팀-시즌 하나의 값 (없으면 None)
+        return self.values.get((int(year), str(league), str(team)))
+
+    def update(self, keys, rows, source_sha256=None):
+        # 팀-시즌들의 값을 바꾸거나 추가한 새 객체를 반환 (rows: 행마다 8개 지표 차이 배열)
+        values = dict(self.values)
+        for key, row in zip(keys, rows):
+            values[key] = radar_values(row)
+        return RadarPayloads(values, source_sha256 or self.source_sha256)
+
+    def series_item(self, year, league, team, color, name=None):
+        # ECharts 레이더 시리즈 항목 하나 (없는 팀-시즌이면 None)
+        values = self.get(year, league, team)
+        if values is None:
+            return None
+        return series_entry(values, name or f"{team} ({year})", color)
+
+    def save(self, path=PAYLOAD_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows = [[year, league, team, *values] for (year, league, team), values in self.values.items()]
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source_sha256": self.source_sha256, "columns": DIFF_COLUMNS, "rows": rows},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        # 저장 도중 중단돼도 이전 파일이 깨지지 않도록 다 쓴 뒤 교체
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=PAYLOAD_PATH):
+        # 저장된 결과 (없거나 열 구성이 다르면 None)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("columns") != DIFF_COLUMNS:
+            return None
+        values = {(row[0], row[1], row[2]): row[3:] for row in saved["rows"]}
+        return cls(values, saved.get("source_sha256"))
+
+
+def build_payloads(checksum=None):
+    # 팀 성과 CSV에서 다시 계산해 저장하고 결과를 반환
+    from utils.팀데이터 import get_team_store, RADAR_COLUMNS
+
+    payloads = RadarPayloads.from_store(
+        get_team_store(RADAR_COLUMNS),
+        checksum or file_sha256(project_path(TEAM_METRICS_FILE)),
+    )
+    try:
+        payloads.save()
+    except OSError:
+        pass  # 캐시 폴더에 쓸 수 없는 환경에서는 메모리에만 보관
+    return payloads
+
+
+def get_radar_payloads():
+    # 프로세스당 한 번만 불러와 모든 세션이 공유 (저장된 결과가 원본과 다르면 다시 계산)
+    # 실행 중에 CSV가 바뀌면 (다른 프로세스에서 시즌 추가 등) 다음 호출 때 다시 불러옴
+    from utils.팀데이터 import team_metrics_version
+
+    checksum = team_metrics_version()
+
+    def loader():
+        payloads = RadarPayloads.load()
+        if payloads is None or payloads.source_sha256 != checksum:
+            payloads = build_payloads(checksum)
+        path = PAYLOAD_PATH if os.path.exists(PAYLOAD_PATH) else project_path(TEAM_METRICS_FILE)
+        return payloads, "cache/data/radar_payloads.json", path
+
+    return load_once("radar_payloads", loader, checksum)
+
+
+def downsample(positions, max_series=MAX_SERIES):
+    # 시리즈가 max_series개를 넘으면 처음과 마지막을 포함해 고른 간격으로 추림 (순서 유지)
+    if len(positions) <= max_series:
+        return positions
+    picks = np.unique(np.linspace(0, len(positions) - 1, max_series).round().astype(np.intp))
+    return positions[picks]
+
+
+def overlay_series(store, positions, max_series=MAX_SERIES, colors=SERIES_COLORS, scale="diff"):
+    # 여러 팀-시즌의 레이더 시리즈를 한 번에 만듦
+    # 추린 행들의 지표 값을 저장소(또는 순위) 행렬에서 한 번에 가져오고, 색상은 순서대로 돌려 씀
+    # 반환: (시리즈 항목 목록, 추리기 전 팀-시즌 수)
+    shown = downsample(np.asarray(positions, dtype=np.intp), max_series)
+    keys = store.keys_at(shown)
+    if scale == "diff":
+        values, digits = store.matrix(DIFF_COLUMNS)[shown], 3
+    else:
+        rankings = get_team_rankings()
+        values, digits = rankings.scaled(keys, scale), SCALE_DIGITS[scale]
+    # 겹치는 영역이 많을수록 면 색을 옅게
+    opacity = 0.2 if len(shown) <= 2 else 0.05
+    series = [
+        series_entry([round(val, digits) for val in row.tolist()], f"{team} ({year})", color, opacity)
+        for (year, league, team), row, color in zip(
+            keys, values, (colors[i % len(colors)] for i in range(len(shown)))
+        )
+    ]
+    return series, len(positions)
+
+
+def radar_option(series_data, title, legend=None, series_name="Team Performance", scale="diff"):
+    # 레이더 차트 ECharts 옵션 틀 (title은 ECharts title dict)
+    option = {
+        "title": title,
+        "tooltip": {},
+        "radar": {"indicator": RADAR_INDICATORS if scale == "diff" else radar_indicators(scale)},
+        "series": [
+            {
+                "name": series_name,
+                "type": "radar",
+                "data": series_data,
+            }
+        ],
+    }
+    if legend is not None:
+        option["legend"] = legend
+    return option
+
+
+if __name__ == "__main__":
+    payloads = build_payloads()
+    print(f"{TEAM_METRICS_FILE}: 팀-시즌 {len(payloads.values):,}개의 레이더 차트 데이터를 {PAYLOAD_PATH}에 저장")
@@ -0,0 +1,283 @@
+# 트리 모델을 평평한(flat) 배열 형식으로 저장하고 메모리 맵으로 불러오는 모듈
+#
+# joblib.load는 225MB짜리 포레스트 전체를 프로세스마다 힙에 복사하기 때문에
+# Streamlit 서버 프로세스가 여러 개면 메모리가 금방 부족해짐.
+# 여기서는 모든 트리의 노드를 하나로 이어 붙인 .npy 배열로 저장하고
+# np.load(mmap_mode="r")로 열어, 여러 프로세스가 OS 페이지 캐시의 한 복사본을 공유하고
+# 실제로 예측에 쓰인 페이지만 메모리에 올라오도록 함. (포레스트 순회는 utils/추론엔진.py)
+#
+# 저장 형식 (cache/models/<이름>/):
+#   left.npy, right.npy  (int32)   : 자식 노드 번호 (전체 노드 기준 번호, 리프는 자기 자신)
+#   feature.npy          (int32)   : 분기에 사용하는 피처 번호 (리프는 0)
+#   threshold.npy        (float64) : 분기 기준값 (리프는 +inf)
+#   value.npy            (float64) : 노드 예측값 (n_nodes, n_outputs), 분류 모델은 클래스별 확률
+#   roots.npy            (int32)   : 트리별 루트 노드 번호
+#   meta.json                       : 모델 종류, 피처 수, 최대 깊이, 원본 파일 정보
+#
+# 파이프라인(설정.PIPELINES)은 같은 형식으로 저장하되, 스케일러를 분기 기준값에 합쳐 둠.
+# 표준화 z = (x - a) / b (b > 0)에서 z <= t는 x <= t * b + a와 같으므로, 기준값을 원래 단위로
+# 바꿔 두면 scaler.transform 없이 원본 입력으로 바로 순회할 수 있고,
+# meta.json에 스케일러 파일 정보도 함께 기록해 두 파일이 어긋나면 변환본을 쓰지 않음.
+#
+# 사용법 (프로젝트 폴더에서 실행):
+#   python -m utils.모델저장                    # 등록된 트리 모델과 파이프라인 전체 변환
+#   python -m utils.모델저장 hitter_model       # 특정 모델만 변환
+#   python -m utils.모델저장 hitter_pipeline    # 특정 파이프라인만 변환
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import sys  # 명령행 인자
+import json  # 메타 정보 저장
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+import joblib  # 머신러닝 모델 저장 및 로드 (Pickle의 대안)
+
+from utils.설정 import MODEL_FILES, PIPELINES, FOREST_DIR, project_path
+from utils.공통함수 import file_sha256
+from utils.추론엔진 import ARRAY_NAMES, FlatForest, ScaledModel, ParityError, check_parity
+
+FORMAT_VERSION = 2
+
+
+def _tree_estimators(model):
+    # 앙상블이면 개별 트리 목록, 단일 결정 트리면 자기 자신만 반환
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        estimators = [model]
+    estimators = list(np.ravel(estimators))
+    if not all(hasattr(est, "tree_") for est in estimators):
+        raise TypeError(f"트리 기반 모델만 변환할 수 있습니다: {type(model).__name__}")
+    return estimators
+
+
+def flatten_forest(model):
+    # 모든 트리의 노드를 전체 노드 번호 기준의 연속 배열로 이어 붙임
+    estimators = _tree_estimators(model)
+    is_classifier = hasattr(model, "classes_")
+    if is_classifier and np.ndim(model.classes_) != 1:
+        raise TypeError("다중 출력 분류 모델은 변환할 수 없습니다")
+    lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for est in estimators:
+        tree = est.tree_
+        n = tree.node_count
+        ids = np.arange(offset, offset + n, dtype=np.int64)
+        is_leaf = tree.children_left == -1
+
+        # 리프는 자기 자신을 가리키게 해서 최대 깊이만큼 반복해도 제자리에 머물도록 함
+        lefts.append(np.where(is_leaf, ids, tree.children_left + offset))
+        rights.append(np.where(is_leaf, ids, tree.children_right + offset))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        if is_classifier:
+            # 리프의 클래스별 가중 개수를 확률로 정규화 (sklearn predict_proba와 동일)
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            values.append(counts / totals)
+        else:
+            values.append(tree.value[:, :, 0])
+        roots.append(offset)
+
+        offset += n
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    arrays = {
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "value": np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+    feature_names = getattr(model, "feature_names_in_", None)
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "kind": "classifier" if is_classifier else "regressor",
+        "model_class": type(model).__name__,
+        "n_features": int(model.n_features_in_),
+        "n_outputs": int(arrays["value"].shape[1]),
+        "n_trees": len(estimators),
+        "n_nodes": int(offset),
+        "max_depth": max_depth,
+        "feature_names": None if feature_names is None else [str(f) for f in feature_names],
+        "classes": np.asarray(model.classes_).tolist() if is_classifier else None,
+    }
+    return arrays, meta
+
+
+def _affine_coefficients(scaler):
+    # 피처별 스케일러 변환을 z = (x - a) / b 형태로 (표준화, 최소-최대 정규화 등 선형 변환만 가능)
+    n = scaler.n_features_in_
+    zero = scaler.transform(np.zeros((1, n)))[0]
+    slope = scaler.transform(np.ones((1, n)))[0] - zero
+    if not np.all(slope > 0):
+        raise TypeError(f"피처마다 증가하는 선형 스케일러만 합칠 수 있습니다: {type(scaler).__name__}")
+    X = np.random.default_rng(0).normal(scale=100.0, size=(64, n))
+    if not np.allclose(scaler.transform(X), zero + slope * X, rtol=1e-9, atol=1e-9):
+        raise TypeError(f"선형 변환이 아닌 스케일러는 합칠 수 없습니다: {type(scaler).__name__}")
+    return -zero / slope, 1.0 / slope
+
+
+def _elementwise_transform(scaler):
+    # (피처 번호 배열, 값 배열) -> 스케일된 값: 스케일러의 transform과 같은 연산 순서로 계산
+    # (반올림까지 같아야 분기 경계에서도 결과가 일치함)
+    kind = type(scaler).__name__
+    n = scaler.n_features_in_
+    if kind == "StandardScaler":
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n)
+        return lambda feature, x: (x - mean[feature]) / scale[feature]
+    if kind == "MinMaxScaler":
+        return lambda feature, x: x * scaler.scale_[feature] + scaler.min_[feature]
+    a, b = _affine_coefficients(scaler)
+    return lambda feature, x: (x - a[feature]) / b[feature]
+
+
+def fold_scaler(arrays, scaler):
+    # 스케일된 공간의 분기 기준값 t를 원래 단위의 기준값으로 바꾼 threshold 배열을 반환
+    # 트리는 float32(스케일된 값) <= t 로 비교하므로 실제 경계는 t 이하인 가장 큰 float32와
+    # 그다음 float32의 중간값임. 이 경계를 원래 단위로 옮긴 근사값 주변에서 이분 탐색으로
+    # 조건을 만족하는 가장 큰 원래 값을 찾아 새 기준값으로 사용 (반올림 경계까지 sklearn과 일치)
+    a, b = _affine_coefficients(scaler)
+    transform = _elementwise_transform(scaler)
+    threshold = np.array(arrays["threshold"], dtype=np.float64)
+    split = np.isfinite(threshold)
+    t = threshold[split]
+    feature = np.asarray(arrays["feature"])[split]
+
+    def goes_left(x):
+        return transform(feature, x).astype(np.float32) <= t
+
+    below = t.astype(np.float32)
+    below = np.where(below.astype(np.float64) > t, np.nextafter(below, np.float32(-np.inf)), below)
+    above = np.nextafter(below, np.float32(np.inf))
+    boundary = (below.astype(np.float64) + above.astype(np.float64)) / 2
+    estimate = boundary * b[feature] + a[feature]
+
+    # [lo, hi] 구간에서 lo는 왼쪽, hi는 오른쪽으로 가도록 잡고 두 값이 이웃한 float64가 될 때까지 좁힘
+    margin = 1e-9 * np.maximum(np.abs(estimate), 1.0)
+    lo, hi = estimate - margin, estimate + margin
+    bracketed = goes_left(lo) & ~goes_left(hi)
+    for _ in range(64):
+        narrowing = bracketed & (np.nextafter(lo, np.inf) < hi)
+        if not narrowing.any():
+            break
+        mid = lo + (hi - lo) / 2
+        left = goes_left(mid)
+        lo = np.where(narrowing & left, mid, lo)
+        hi = np.where(narrowing & ~left, mid, hi)
+    threshold[split] = np.where(bracketed, lo, estimate)
+    return threshold
+
+
+def _source_info(prefix, file_name):
+    # meta.json에 기록할 원본 파일 정보 (크기, 수정 시각, 체크섬)
+    path = project_path(file_name)
+    stat = os.stat(path)
+    return {
+        f"{prefix}_file": file_name,
+        f"{prefix}_size": stat.st_size,
+        f"{prefix}_mtime_ns": stat.st_mtime_ns,
+        f"{prefix}_sha256": file_sha256(path),
+    }
+
+
+def _write_artifact(out_dir, arrays, meta):
+    os.makedirs(out_dir, exist_ok=True)
+    for key in ARRAY_NAMES:
+        np.save(os.path.join(out_dir, f"{key}.npy"), arrays[key])
+    # meta.json을 마지막에 써서, 변환 도중 중단된 폴더는 로드되지 않게 함
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def export_forest(name, out_dir=None):
+    # 등록된 모델 하나를 flat 배열 형식으로 변환해 저장 (sklearn과 결과가 같은지 검증 후 저장)
+    model = joblib.load(project_path(MODEL_FILES[name]))
+    arrays, meta = flatten_forest(model)
+    meta["parity_max_error"] = check_parity(model, FlatForest(arrays, meta))
+    meta["name"] = name
+    meta.update(_source_info("source", MODEL_FILES[name]))
+    return _write_artifact(out_dir or os.path.join(FOREST_DIR, name), arrays, meta)
+
+
+def export_pipeline(name, out_dir=None):
+    # 스케일러 + 트리 모델을 스케일러가 합쳐진 flat 배열 하나로 저장
+    # (scaler.transform 후 sklearn으로 예측한 결과와 같은지 검증 후 저장)
+    scaler_name, model_name = PIPELINES[name]
+    scaler = joblib.load(project_path(MODEL_FILES[scaler_name]))
+    model = joblib.load(project_path(MODEL_FILES[model_name]))
+    if scaler.n_features_in_ != model.n_features_in_:
+        raise ValueError(f"{name}: 스케일러와 모델의 피처 수가 다릅니다")
+    arrays, meta = flatten_forest(model)
+    arrays["threshold"] = fold_scaler(arrays, scaler)
+    meta["input_dtype"] = "float64"
+    meta["parity_max_error"] = check_parity(ScaledModel(scaler, model), FlatForest(arrays, meta))
+    meta["name"] = name
+    meta.update(_source_info("source", MODEL_FILES[model_name]))
+    meta.update(_source_info("scaler", MODEL_FILES[scaler_name]))
+    return _write_artifact(out_dir or os.path.join(FOREST_DIR, name), arrays, meta)
+
+
+def read_meta(name):
+    # 변환된 모델의 메타 정보 (없으면 None)
+    path = os.path.join(FOREST_DIR, name, "meta.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _source_matches(meta, prefix):
+    # meta에 기록된 원본 파일이 지금 파일과 같은지 확인
+    source = project_path(meta[f"{prefix}_file"])
+    if not os.path.exists(source):
+        # 원본이 없는 배포 환경에서는 변환 결과만 사용
+        return True
+    stat = os.stat(source)
+    if stat.st_size != meta[f"{prefix}_size"]:
+        return False
+    if stat.st_mtime_ns == meta[f"{prefix}_mtime_ns"]:
+        return True
+    # git checkout 등으로 수정 시간만 바뀐 경우 체크섬으로 확인
+    return file_sha256(source) == meta[f"{prefix}_sha256"]
+
+
+def is_fresh(meta):
+    # 변환 결과가 현재 원본 pickle(파이프라인은 스케일러까지)과 같은 파일에서 만들어졌는지 확인
+    if meta is None or meta.get("format_version") != FORMAT_VERSION:
+        return False
+    if not _source_matches(meta, "source"):
+        return False
+    return "scaler_file" not in meta or _source_matches(meta, "scaler")
+
+
+def load_forest(name):
+    # 변환된 모델이 있고 원본과 일치하면 메모리 맵으로 열어서 반환 (없으면 None)
+    meta = read_meta(name)
+    if not is_fresh(meta):
+        return None
+    return FlatForest.load(os.path.join(FOREST_DIR, name))
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(MODEL_FILES) + list(PIPELINES)
+    failed = []
+    for name in names:
+        try:
+            meta = export_pipeline(name) if name in PIPELINES else export_forest(name)
+        except TypeError as e:
+            # 트리 모델이 아닌 파일(스케일러 등)이나 합칠 수 없는 스케일러
+            print(f"{name}: 건너뜀 ({e})")
+            continue
+        except ParityError as e:
+            # sklearn과 결과가 다르면 저장하지 않음 (페이지는 pickle 모델을 그대로 사용)
+            print(f"{name}: 검증 실패로 건너뜀 ({e})")
+            failed.append(name)
+            continue
+        print(
+            f"{name}: 트리 {meta['n_trees']}개, 노드 {meta['n_nodes']:,}개, 최대 깊이 {meta['max_depth']}, "
+            f"sklearn 대비 최대 오차 {meta['parity_max_error']:.3g}"
+        )
+    if failed:
+        sys.exit(f"검증에 실패한 모델: {', '.join(failed)}")
@@ -0,0 +1,189 @@
+# 동시 예측 요청을 모아서 한 번에 처리하는 마이크로 배치 추론 서비스 (프로세스 내부)
+#
+# 여러 세션이 동시에 예측 버튼을 누르면 세션 스레드마다 한 행씩 scaler.transform과
+# predict를 따로 호출하게 됨. 모델마다 대기열과 작업 스레드를 하나씩 두고,
+# 짧은 시간(window_ms) 동안 들어온 행을 모아 행렬 하나로 스케일링/예측한 뒤
+# 각 요청의 Future에 자기 행의 결과를 돌려줌. 동시 요청이 많을수록 배치가 커지므로
+# 처리량이 스레드 수가 아니라 배치 크기에 비례해서 늘어남.
+# 배치는 작업 프로세스 풀(utils/프로세스풀.py)에 넘긴 뒤 결과를 기다리지 않고 다음 배치를 모으며,
+# 모델마다 작업 프로세스 수만큼의 배치가 동시에 실행될 수 있음. 결과는 배치가 끝났을 때
+# 콜백에서 각 요청에 나눠 줌.
+import queue  # 요청 대기열
+import threading  # 모델별 작업 스레드
+import time  # 배치 대기 시간 계산
+from concurrent.futures import Future  # 요청별 결과 전달
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import INFERENCE_WORKERS
+from utils.공통함수 import get_predictor, get_pipeline
+from utils.추론엔진 import predict_with_proba_timed
+from utils.계측 import record
+
+DEFAULT_WINDOW_MS = 5  # 첫 요청 이후 같은 배치로 모을 시간
+DEFAULT_MAX_BATCH = 256
+
+# 배치 서비스가 처리하는 모델: 모델 이름 -> 스케일러까지 포함한 파이프라인 이름 (스케일러가 없으면 None)
+BATCHED_MODELS = {
+    "hitter_model": "hitter_pipeline",
+    "pitcher_model": "pitcher_pipeline",
+    "rf_model": None,
+}
+
+
+class MicroBatcher:
+    # 한 모델에 대한 요청 대기열과 이를 처리하는 작업 스레드
+
+    def __init__(self, name, predict_batch, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH, max_in_flight=1):
+        # predict_batch(X): (행 수 x 피처 수) 행렬을 받아, (행 순서대로의 결과 목록, 단계별 소요 시간)을
+        # 결과로 갖는 Future를 바로 반환
+        # max_in_flight: 동시에 실행할 수 있는 배치 수 (다 차면 그동안 들어온 요청은 다음 배치로 모임)
+        self.name = name
+        self.predict_batch = predict_batch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self._last_batch_size = 0
+        self._stats_lock = threading.Lock()
+        self._in_flight = threading.Semaphore(max_in_flight)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        # 한 행을 대기열에 넣고 결과를 받을 Future를 반환 (페이지에서 done()으로 완료 여부 확인 가능)
+        # 결과가 나오면 future.timings에 배치 대기 시간과 단계별 소요 시간(초)이 기록됨
+        future = Future()
+        future.timings = {}
+        future.batch_size = 0
+        row = np.asarray(row)
+        # 호출한 쪽이 입력 버퍼를 재사용해도 되도록 복사해서 보관 (float32 입력은 float32 그대로)
+        self._queue.put((np.array(row, dtype=np.result_type(row.dtype, np.float32)).ravel(), future, time.perf_counter()))
+        return future
+
+    def _collect(self):
+        # 첫 요청이 올 때까지 기다린 뒤, window 동안 또는 max_batch까지 요청을 더 모음
+        # 직전 배치도 한 행뿐이었고 대기 중인 요청이 없으면(동시 사용자 없음) 기다리지 않고 바로 처리
+        batch = [self._queue.get()]
+        if self._last_batch_size <= 1 and self._queue.empty():
+            return batch
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # 실행 중인 배치가 max_in_flight개면 하나가 끝날 때까지 기다림 (그동안 온 요청은 대기열에 쌓임)
+            self._in_flight.acquire()
+            # 대기열에 쌓인 요청을 이번 배치에 더 담음
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # 응답을 기다리지 않고 취소된 요청은 제외
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                self._in_flight.release()
+                continue
+            self._last_batch_size = len(batch)
+            started = time.perf_counter()
+            try:
+                pending = self.predict_batch(np.vstack([row for row, _, _ in batch]))
+            except Exception as e:
+                pending = Future()
+                pending.set_exception(e)
+            # 배치가 끝나면 결과를 나눠 줌 (이미 끝났으면 바로 실행)
+            pending.add_done_callback(lambda done, batch=batch, started=started: self._deliver(batch, started, done))
+
+    def _deliver(self, batch, started, done):
+        # 끝난 배치의 결과를 각 요청의 Future에 나눠 줌
+        self._in_flight.release()
+        try:
+            results, timings = done.result()
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        record(f"predict:{self.name}", time.perf_counter() - started)
+        for stage, seconds in timings.items():
+            record(f"predict:{self.name}:{stage}", seconds)
+        for (_, future, submitted), result in zip(batch, results):
+            future.timings = {"batch_wait": started - submitted, **timings}
+            record(f"predict:{self.name}:batch_wait", started - submitted)
+            future.batch_size = len(batch)
+            future.set_result(result)
+        with self._stats_lock:
+            self.batches += 1
+            self.rows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "batches": self.batches,
+                "rows": self.rows,
+                "avg_batch": self.rows / self.batches if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+            }
+
+
+def predict_matrix(name, X):
+    # 모델 종류에 맞게 행렬 하나를 예측해 (행 순서대로의 결과 목록, 단계별 소요 시간)을 반환
+    # (작업 프로세스에서도 실행되므로 모듈 최상위 함수로 둠)
+    pipeline_name = BATCHED_MODELS[name]
+    if pipeline_name is None:
+        # 분류 모델은 행마다 (예측 클래스, 클래스별 확률)을 돌려줌
+        labels, proba, timings = predict_with_proba_timed(get_predictor(name), X)
+        return list(zip(labels, proba)), timings
+
+    # 스케일링이 합쳐진 파이프라인은 원래 단위의 입력으로 한 번에 예측
+    start = time.perf_counter()
+    predictions = get_pipeline(pipeline_name).predict(X)
+    return list(predictions), {"traversal": time.perf_counter() - start}
+
+
+def _batch_predictor(name):
+    # 배치 하나를 작업 프로세스 풀에 넘기고 Future를 반환 (풀을 쓰지 않으면 이 스레드에서 직접 예측)
+    from utils.프로세스풀 import submit
+
+    def predict_batch(X):
+        return submit(predict_matrix, name, X)
+
+    return predict_batch
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(name):
+    # 모델별 배치 서비스 (프로세스당 하나, 처음 요청할 때 작업 스레드 시작)
+    if name not in BATCHED_MODELS:
+        raise KeyError(f"배치 서비스가 지원하지 않는 모델입니다: {name}")
+    with _batchers_lock:
+        if name not in _batchers:
+            # 작업 프로세스 수만큼 배치를 동시에 실행 (풀을 쓰지 않으면 한 번에 하나)
+            _batchers[name] = MicroBatcher(name, _batch_predictor(name), max_in_flight=max(INFERENCE_WORKERS, 1))
+        return _batchers[name]
+
+
+def predict_row(name, row, timeout=None):
+    # 한 행을 배치 서비스로 예측하고 결과가 나올 때까지 기다림
+    return get_batcher(name).submit(row).result(timeout=timeout)
+
+
+def batcher_stats():
+    with _batchers_lock:
+        return [batcher.stats() for batcher in _batchers.values()]
@@ -0,0 +1,92 @@
+# 포스트시즌 진출 여부 일괄 예측 (팀 성과 데이터 전체 또는 업로드한 CSV)
+#
+# 입력 표의 열을 모델 피처(rf_model.feature_names_in_)에 맞춰 한 번에 행렬로 만들고,
+# 일정 행 수씩 나눠 predict_proba를 벡터화해서 실행함.
+# 피처 이름과 같은 열이 있으면 그대로 쓰고, 없으면 팀 성과 CSV의 영문 열 이름(별칭)을 찾고,
+# 그래도 없으면 단일 예측과 같이 0으로 채움.
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+
+from utils.추론엔진 import predict_with_proba
+
+# 모델 피처 이름 -> 팀 성과 CSV(팀_성과_지표_시각화.csv)의 열 이름
+FEATURE_ALIASES = {
+    '승률': 'WP',
+    '승리횟수': 'w',
+    '패배횟수': 'l',
+    '경기수': 'g',
+    '세이브_횟수': 'sv',
+    '총_실점수': 'ra',
+    '자책점': 'er',
+    '득점': 'r',
+    '타수': 'ab',
+    '안타횟수': 'h',
+    '홈런횟수': 'hr',
+    '2루타횟수': 'double',
+    '3루타횟수': 'triple',
+    '볼넷횟수': 'bb',
+    '타자_삼진횟수': 'so',
+    '도루횟수': 'sb',
+    '평균자책점': 'era',
+    '완투': 'cg',
+    '완봉': 'sho',
+    '실책': 'e',
+    '타율': 'BA',
+    '출루율': 'OBP',
+    '장타율': 'SLG',
+    'OPS': 'OPS',
+}
+
+# 결과 표에 함께 보여줄 식별 열 (있는 것만 사용)
+ID_COLUMNS = ['year', 'league_id', 'team_id', 'name']
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def map_features(frame, feature_names):
+    # 입력 표에서 모델 피처 순서대로 열을 골라 float32 행렬을 만듦
+    # 반환: (행렬, {피처 이름: 사용한 열 이름 또는 None})
+    X = np.zeros((len(frame), len(feature_names)), dtype=np.float32)
+    mapping = {}
+    for j, feature in enumerate(feature_names):
+        column = feature if feature in frame.columns else FEATURE_ALIASES.get(feature)
+        if column is not None and column in frame.columns:
+            X[:, j] = pd.to_numeric(frame[column], errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+            mapping[feature] = column
+        else:
+            mapping[feature] = None
+    return X, mapping
+
+
+def _model_input(model, X):
+    # sklearn 모델이 피처 이름으로 학습됐으면 DataFrame으로 넘겨야 경고 없이 동작
+    if not hasattr(model, "predict_with_proba") and hasattr(model, "feature_names_in_"):
+        return pd.DataFrame(X, columns=model.feature_names_in_)
+    return X
+
+
+def predict_in_chunks(model, X, chunk_size=DEFAULT_CHUNK_SIZE):
+    # chunk_size 행씩 예측하며 (시작 행, 예측 클래스, 진출 확률)을 차례로 돌려줌
+    positive = list(model.classes_).index(1) if 1 in list(model.classes_) else -1
+    for start in range(0, len(X), chunk_size):
+        labels, proba = predict_with_proba(model, _model_input(model, X[start:start + chunk_size]))
+        yield start, labels, proba[:, positive]
+
+
+def score_frame(model, frame, chunk_size=DEFAULT_CHUNK_SIZE, on_progress=None):
+    # 표 전체를 예측해 식별 열 + 예측 결과 표를 반환
+    # on_progress(완료 행 수, 전체 행 수)로 실제 진행 상황을 알려줌
+    X, mapping = map_features(frame, list(model.feature_names_in_))
+    labels = np.empty(len(X), dtype=np.asarray(model.classes_).dtype)
+    probability = np.empty(len(X))
+    for start, chunk_labels, chunk_proba in predict_in_chunks(model, X, chunk_size):
+        end = start + len(chunk_labels)
+        labels[start:end] = chunk_labels
+        probability[start:end] = chunk_proba
+        if on_progress is not None:
+            on_progress(end, len(X))
+
+    result = frame[[c for c in ID_COLUMNS if c in frame.columns]].reset_index(drop=True).copy()
+    result["포스트시즌_진출_예측"] = np.where(labels == 1, "진출", "탈락")
+    result["진출_확률"] = np.round(probability, 4)
+    return result, mapping
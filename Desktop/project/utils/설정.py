@@ -0,0 +1,94 @@
+# 프로젝트 공통 설정 (파일 경로, 모델 목록 등)
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+
+# 프로젝트 루트 디렉토리 (데이터톤_메인.py가 있는 폴더)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 모델 및 스케일러 파일 경로 (이름 -> 파일명)
+MODEL_FILES = {
+    "rf_model": "rf_model.pkl",  # 포스트시즌 진출 예측 모델
+    "hitter_model": "hitter_model.pkl",  # 타자 모델
+    "hitter_scaler": "hitter_scaler.pkl",  # 타자 스케일러
+    "pitcher_model": "pitcher_model.pkl",  # 투수 모델
+    "pitcher_scaler": "pitcher_scaler.pkl",  # 투수 스케일러
+    "hitter_model_salary": "hitter_model_salary.pkl",  # 타자 연봉 모델
+    "hitter_scaler_salary": "hitter_scaler_salary.pkl",  # 타자 연봉 스케일러
+    "pitcher_model_salary": "pitcher_model_salary.pkl",  # 투수 연봉 모델
+    "pitcher_scaler_salary": "pitcher_scaler_salary.pkl",  # 투수 연봉 스케일러
+}
+
+# 스케일러와 트리 모델을 하나로 합친 예측 파이프라인 (이름 -> (스케일러, 모델))
+PIPELINES = {
+    "hitter_pipeline": ("hitter_scaler", "hitter_model"),
+    "pitcher_pipeline": ("pitcher_scaler", "pitcher_model"),
+    "hitter_salary_pipeline": ("hitter_scaler_salary", "hitter_model_salary"),
+    "pitcher_salary_pipeline": ("pitcher_scaler_salary", "pitcher_model_salary"),
+}
+
+
+
+def project_path(*parts):
+    # 프로젝트 루트 기준 절대 경로 반환 (실행 위치와 무관하게 동작)
+    return os.path.join(PROJECT_DIR, *parts)
+
+
+# 이미지 폴더와 크기별로 변환한 이미지(WebP) 폴더
+IMAGE_DIR = project_path("images")
+IMAGE_VARIANT_DIR = os.path.join(IMAGE_DIR, "variants")
+
+# 빌드 결과물(변환된 모델, 데이터 캐시 등)을 저장하는 폴더
+CACHE_DIR = project_path("cache")
+FOREST_DIR = os.path.join(CACHE_DIR, "models")  # flat 배열 형식으로 변환된 트리 모델
+DATA_CACHE_DIR = os.path.join(CACHE_DIR, "data")  # Feather 형식으로 변환된 CSV 데이터
+
+# 트리 모델 예측을 맡을 작업 프로세스 수 (기본 0: 풀 없이 Streamlit 프로세스 안에서 예측)
+# 예: BALAB_INFERENCE_WORKERS=4 streamlit run 데이터톤_메인.py
+INFERENCE_WORKERS = int(os.environ.get("BALAB_INFERENCE_WORKERS", 0))
+
+# 작업 프로세스의 예측 한 번을 기다리는 최대 시간(초). 넘으면 그 예측은 TimeoutError로 실패하고 풀을 다시 만듦
+INFERENCE_TIMEOUT = float(os.environ.get("BALAB_INFERENCE_TIMEOUT", 60))
+
+# 단계별 계측값을 Prometheus 형식으로 내보낼 localhost 포트 (0이면 끔, utils/계측.py)
+METRICS_PORT = int(os.environ.get("BALAB_METRICS_PORT", 9464))
+
+
+# 팀 성과 데이터 파일
+TEAM_METRICS_FILE = "팀_성과_지표_시각화.csv"  # 팀-시즌별 성과 지표 (레이더 차트용)
+TEAM_AVERAGES_FILE = "Team-Year_Averages_of_MLB_Performance_Metrics.csv"  # 팀-연도별 평균 지표
+
+# 레이더 차트에 필요한 열 정의
+COLUMNS_FOR_SPIDER = ['SLG', 'OPS', 'era', 'WP', 'PAR', 'PARA', 'BA', 'OBP']
+
+# 팀 이름 매핑
+TEAM_NAME_MAPPING = {
+    "CHN": "Chicago Cubs",
+    "PHI": "Philadelphia Phillies",
+    "PIT": "Pittsburgh Pirates",
+    "CIN": "Cincinnati Reds",
+    "SLN": "St. Louis Cardinals",
+    "WAS": "Washington Nationals",
+    "BOS": "Boston Red Sox",
+    "CHA": "Chicago White Sox",
+    "CLE": "Cleveland Indians",
+    "DET": "Detroit Tigers",
+    "NYA": "New York Yankees",
+    "BAL": "Baltimore Orioles",
+    "LAN": "Los Angeles Dodgers",
+    "SFN": "San Francisco Giants",
+    "LAA": "Los Angeles Angels",
+    "MIN": "Minnesota Twins",
+    "HOU": "Houston Astros",
+    "NYN": "New York Mets",
+    "ATL": "Atlanta Braves",
+    "OAK": "Oakland Athletics",
+    "KCA": "Kansas City Royals",
+    "SDN": "San Diego Padres",
+    "TEX": "Texas Rangers",
+    "SEA": "Seattle Mariners",
+    "TOR": "Toronto Blue Jays",
+    "COL": "Colorado Rockies",
+    "ARI": "Arizona Diamondbacks",
+    "MIL": "Milwaukee Brewers",
+    "TBA": "Tampa Bay Rays",
+    "MIA": "Miami Marlins"
+}
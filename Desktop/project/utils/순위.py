@@ -0,0 +1,100 @@
+# 팀 성과 지표의 리그 내 순위 (백분위, 표준 점수) (5, 6페이지 공용)
+#
+# 레이더 차트의 리그 평균 대비 차이(_diff)는 지표마다 단위가 달라 ERA, PAR 같은 지표는
+# 고정 축(-1~1)을 크게 벗어남. 모든 팀-시즌의 8개 지표를 (연도, 리그) 묶음별로 한 번에
+# groupby해서 리그 내 백분위와 표준 점수(z)를 구하고, float32 행렬 하나(팀-시즌 수 x 16)에
+# 담아 둠. 팀 하나의 순위 조회는 (연도, 리그, 팀) -> 행 번호 dict 조회 한 번.
+# ERA, PARA처럼 낮을수록 좋은 지표는 부호를 뒤집어 계산하므로 모든 지표가 "높을수록 좋음"으로 맞춰짐.
+# (리그 평균/차이 열과 같은 (연도, 리그) 묶음 기준)
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import TEAM_METRICS_FILE, COLUMNS_FOR_SPIDER, project_path
+from utils.공통함수 import load_once
+from utils.팀데이터 import get_team_store, team_metrics_version, RADAR_COLUMNS
+
+# 낮을수록 좋은 지표 (순위 계산 시 부호를 뒤집음)
+# PARA는 구장 효과로 보정한 실점(ra / ppf)이므로 ERA와 같이 낮을수록 좋음
+LOWER_IS_BETTER = ["era", "PARA"]
+
+# 레이더 차트 척도별 반올림 자릿수 (백분위는 0~100으로 표시)
+SCALE_DIGITS = {"percentile": 1, "zscore": 2}
+
+
+def rank_matrix(data, metrics=COLUMNS_FOR_SPIDER):
+    # (연도, 리그, 팀) 인덱스 DataFrame -> [백분위(0~1) 8열, 표준 점수 8열] float32 행렬
+    # 백분위는 묶음 안 순위 / 팀 수 (가장 좋은 팀이 1), 팀이 하나뿐이거나 값이 모두 같으면 표준 점수는 0
+    values = data[metrics].astype(float)
+    for col in LOWER_IS_BETTER:
+        if col in values.columns:
+            values[col] = -values[col]
+    grouped = values.groupby(
+        [data.index.get_level_values("year"), data.index.get_level_values("league_id")], observed=True, sort=False
+    )
+    percentile = grouped.rank(method="average", pct=True).to_numpy()
+    mean = grouped.transform("mean").to_numpy()
+    std = grouped.transform("std", ddof=0).to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        zscore = np.where(std > 0, (values.to_numpy() - mean) / std, 0.0)
+    return np.hstack([percentile, zscore]).astype(np.float32)
+
+
+class TeamRankings:
+    # (연도, 리그, 팀) -> 행 번호, 행마다 [백분위 8개, 표준 점수 8개]
+
+    def __init__(self, keys, matrix, metrics=COLUMNS_FOR_SPIDER):
+        self.metrics = list(metrics)
+        self.rows = {key: i for i, key in enumerate(keys)}
+        self.matrix = matrix
+
+    @classmethod
+    def from_store(cls, store, metrics=COLUMNS_FOR_SPIDER):
+        # 팀 성과 저장소(utils/팀데이터.py)의 모든 행을 한 번에 계산
+        return cls(store.keys_at(np.arange(len(store.data))), rank_matrix(store.data, metrics), metrics)
+
+    def get(self, year, league, team):
+        # 팀-시즌 하나의 [백분위 8개, 표준 점수 8개] (없으면 None)
+        i = self.rows.get((int(year), str(league), str(team)))
+        return None if i is None else self.matrix[i]
+
+    def percentiles(self, year, league, team):
+        row = self.get(year, league, team)
+        return None if row is None else row[:len(self.metrics)]
+
+    def zscores(self, year, league, team):
+        row = self.get(year, league, team)
+        return None if row is None else row[len(self.metrics):]
+
+    def scaled(self, keys, scale):
+        # 여러 팀-시즌의 레이더 차트 값 (scale: "percentile"은 0~100, "zscore"는 표준 점수)
+        n = len(self.metrics)
+        block = self.matrix[[self.rows[key] for key in keys]]
+        if scale == "percentile":
+            return block[:, :n].astype(float) * 100
+        return block[:, n:].astype(float)
+
+    def radar_values(self, year, league, team, scale):
+        # 팀-시즌 하나의 레이더 차트 값 목록 (없으면 None)
+        key = (int(year), str(league), str(team))
+        if key not in self.rows:
+            return None
+        return [round(val, SCALE_DIGITS[scale]) for val in self.scaled([key], scale)[0].tolist()]
+
+    def update(self, store, positions):
+        # 저장소의 positions 행(영향받은 (연도, 리그) 묶음 전체)만 다시 계산해 바꾸거나 추가한 새 순위를 반환
+        # (이 객체는 그대로 두므로 조회 중인 세션은 이전 순위로 끝까지 진행)
+        keys = store.keys_at(positions)
+        block = rank_matrix(store.data.iloc[positions], self.metrics)
+        found = np.array([self.rows.get(key, -1) for key in keys], dtype=np.intp)
+        existing = found >= 0
+        matrix = self.matrix.copy()
+        matrix[found[existing]] = block[existing]
+        added = [key for key, hit in zip(keys, existing) if not hit]
+        return TeamRankings(list(self.rows) + added, np.vstack([matrix, block[~existing]]), self.metrics)
+
+
+def get_team_rankings():
+    # 프로세스당 한 번만 계산해 모든 세션이 공유 (레이더 페이지용 저장소에서 계산, CSV가 바뀌면 다시 계산)
+    def loader():
+        return TeamRankings.from_store(get_team_store(RADAR_COLUMNS)), TEAM_METRICS_FILE, project_path(TEAM_METRICS_FILE)
+
+    return load_once("team_rankings", loader, team_metrics_version())
@@ -0,0 +1,190 @@
+# 새 팀-시즌 추가와 리그 평균(_league)/차이(_diff) 부분 재계산
+#
+# 팀 성과 CSV의 X_league는 같은 (연도, 리그) 팀들의 X 평균이고, X_diff는 X - X_league임.
+# 새 시즌 행을 추가하면 그 행이 속한 (연도, 리그) 묶음의 평균만 바뀌므로, 전체 73열 파일을
+# 다시 만들지 않고 해당 묶음의 행만 groupby로 다시 계산함.
+# 실행 중인 프로세스에서는 로드된 팀 성과 저장소, 레이더 차트 데이터, 리그 내 순위, 비슷한 팀-시즌
+# 검색 트리, 약점 분석 기준값을 새로 만들어 교체하고, save=True면 CSV와 레이더 차트 데이터 파일에도 반영함.
+# 명령줄로 실행해 CSV를 바꾸면, 이미 실행 중인 Streamlit 서버는 CSV 체크섬이 바뀐 것을 보고
+# 다음 페이지 실행 때 이 객체들을 다시 로드함 (utils/팀데이터.py의 team_metrics_version).
+#
+# 사용법 (프로젝트 폴더에서 실행):
+#   python -m utils.시즌추가 새_시즌.csv    # 팀 성과 CSV와 같은 열 이름의 CSV (연도, 리그, 팀 + 8개 지표 필수)
+import io  # CSV 줄 만들기
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import csv  # CSV 줄 만들기
+import sys  # 명령줄 인수
+import time  # 소요 시간 측정
+import threading  # 추가 작업이 겹치지 않도록 잠금
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+
+from utils.설정 import TEAM_METRICS_FILE, COLUMNS_FOR_SPIDER, project_path
+from utils.공통함수 import replace_loaded
+from utils.팀데이터 import (
+    INDEX_COLUMNS, RADAR_COLUMNS, get_team_store, loaded_stores, replace_stores, store_key, team_metrics_version,
+    map_team_names,
+)
+from utils.레이더 import DIFF_COLUMNS, get_radar_payloads
+from utils.순위 import get_team_rankings
+from utils.유사팀 import SimilarSeasons, get_similar_seasons
+from utils.팀분석 import WeaknessAnalyzer, get_weakness_analyzer
+
+GROUP_COLUMNS = ["year", "league_id"]
+
+_lock = threading.Lock()
+
+
+def validate_rows(rows):
+    # 필수 열과 값 확인 후 (연도, 리그, 팀 코드) 중복을 제거한 복사본 반환 (같은 팀-시즌은 마지막 행 사용)
+    missing = [col for col in INDEX_COLUMNS + COLUMNS_FOR_SPIDER if col not in rows.columns]
+    if missing:
+        raise ValueError(f"새 시즌 데이터에 필요한 열이 없습니다: {', '.join(missing)}")
+    rows = rows.copy()
+    rows["year"] = rows["year"].astype("int32")
+    rows["league_id"] = rows["league_id"].astype(str)
+    rows["team_id"] = rows["team_id"].astype(str)
+    values = rows[COLUMNS_FOR_SPIDER].apply(pd.to_numeric, errors="coerce")
+    if values.isna().any().any():
+        raise ValueError("새 시즌 데이터의 지표 값에 비어 있거나 숫자가 아닌 값이 있습니다")
+    rows[COLUMNS_FOR_SPIDER] = values
+    return rows.drop_duplicates(INDEX_COLUMNS, keep="last")
+
+
+def recompute_league_columns(frame, positions, metrics=COLUMNS_FOR_SPIDER):
+    # frame의 positions 행(영향받는 (연도, 리그) 묶음 전체)만 다시 계산해 그 자리에서 고침
+    # (연도, 리그)는 열이거나 인덱스 단계여도 됨. frame에 있는 _league/_diff 열만 씀
+    block = frame.iloc[positions]
+    keys = [
+        block.index.get_level_values(col) if col in (block.index.names or []) else block[col]
+        for col in GROUP_COLUMNS
+    ]
+    values = block[metrics].astype(float)
+    league = values.groupby(keys, observed=True, sort=False).transform("mean")
+    for col in metrics:
+        if f"{col}_league" in frame.columns:
+            frame.iloc[positions, frame.columns.get_loc(f"{col}_league")] = league[col].to_numpy()
+        if f"{col}_diff" in frame.columns:
+            frame.iloc[positions, frame.columns.get_loc(f"{col}_diff")] = (values[col] - league[col]).to_numpy()
+
+
+def _group_positions(store, groups):
+    # 저장소에서 (연도, 리그) 묶음들에 속한 모든 행 번호
+    return np.concatenate([store.season_positions(year, league) for year, league in groups])
+
+
+def _check_csv_columns(rows):
+    # CSV에 저장하려면 _league/_diff를 뺀 모든 열이 있어야 함 (정수 열에 빈 값이 생기지 않도록)
+    columns = pd.read_csv(project_path(TEAM_METRICS_FILE), nrows=0).columns
+    missing = [col for col in columns if col not in rows.columns and not col.endswith(("_league", "_diff"))]
+    if missing:
+        raise ValueError(f"CSV에 저장하려면 다음 열도 필요합니다: {', '.join(missing)}")
+
+
+def append_seasons(rows, save=False):
+    # 새 팀-시즌(또는 기존 팀-시즌의 수정본)을 반영하고 (영향받은 (연도, 리그) 묶음, 소요 시간) 반환
+    # rows는 팀 성과 CSV와 같은 열 이름의 DataFrame (team_id는 CSV와 같은 팀 코드)
+    rows = validate_rows(rows)
+    if save:
+        _check_csv_columns(rows)
+    groups = sorted(set(zip(rows["year"].astype(int), rows["league_id"])))
+    timings = {}
+
+    with _lock:
+        start = time.perf_counter()
+        # 레이더 차트 데이터와 순위는 레이더 페이지용 저장소에서 만들므로 먼저 로드해 둠
+        payloads = get_radar_payloads()
+        rankings = get_team_rankings()
+        get_similar_seasons()
+        get_weakness_analyzer()
+        get_team_store(RADAR_COLUMNS)
+
+        # 로드된 객체는 고치지 않고 새 시즌을 반영한 새 객체를 만든 뒤 참조만 교체
+        # (조회 중인 세션은 이전 객체로 끝까지 진행하고, 다음 조회부터 새 객체를 봄)
+        indexed = rows.assign(team_id=map_team_names(rows["team_id"])).set_index(INDEX_COLUMNS)
+        stores = {}
+        for key, store in loaded_stores().items():
+            store = store.upsert(indexed)
+            # 지표 원값이 없는 저장소(일부 열만 읽은 경우)는 행만 반영
+            if all(col in store.data.columns for col in COLUMNS_FOR_SPIDER):
+                recompute_league_columns(store.data, _group_positions(store, groups))
+                store.refresh()
+            stores[key] = store
+        radar_store = stores[store_key(RADAR_COLUMNS)]
+
+        # 영향받은 묶음의 레이더 차트 값과 순위만 다시 계산
+        positions = _group_positions(radar_store, groups)
+        payloads = payloads.update(radar_store.keys_at(positions), radar_store.matrix(DIFF_COLUMNS)[positions])
+        rankings = rankings.update(radar_store, positions)
+        # 검색 트리는 표준화 기준(전체 평균/표준편차)이 바뀌므로 새로 만듦
+        similar = SimilarSeasons.from_store(radar_store)
+        analyzer = WeaknessAnalyzer(radar_store, rankings)
+        timings["in_memory"] = time.perf_counter() - start
+
+        if save:
+            start = time.perf_counter()
+            _save_csv(rows, groups)
+            payloads.source_sha256 = team_metrics_version()
+            payloads.save()
+            timings["save"] = time.perf_counter() - start
+
+        # 바뀐 CSV의 체크섬으로 등록해 이 프로세스는 CSV를 다시 읽지 않음
+        # (저장하지 않았으면 CSV는 그대로이므로, 이후 CSV가 바뀌면 이 반영분은 버리고 CSV에서 다시 읽음)
+        replace_stores(stores, team_metrics_version())
+        replace_loaded({
+            "radar_payloads": payloads,
+            "team_rankings": rankings,
+            "similar_seasons": similar,
+            "weakness_analyzer": analyzer,
+        }, team_metrics_version())
+    return groups, timings
+
+
+def _format_line(values):
+    # CSV 한 줄 (빈 값은 비워 두고 실수는 원래 파일처럼 가장 짧은 표현으로)
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(
+        ["" if isinstance(value, float) and np.isnan(value) else value for value in values]
+    )
+    return out.getvalue()
+
+
+def _save_csv(rows, groups):
+    # CSV 원본(팀 코드 그대로)에 행을 반영하고 영향받은 (연도, 리그) 묶음의 줄만 다시 씀
+    # 기존 팀-시즌은 제자리에서 값만 바꾸고 새 팀-시즌은 파일 끝에 추가 (나머지 줄은 글자 그대로 유지)
+    path = project_path(TEAM_METRICS_FILE)
+    data = pd.read_csv(path, dtype={"team_id": str, "league_id": str}, keep_default_na=False, na_values=[""])
+    with open(path, encoding="utf-8", newline="") as f:
+        lines = f.readlines()
+    if len(lines) != len(data) + 1:
+        raise ValueError(f"{TEAM_METRICS_FILE}: 줄 수와 행 수가 맞지 않아 부분 저장할 수 없습니다")
+
+    found = pd.MultiIndex.from_frame(data[INDEX_COLUMNS]).get_indexer(pd.MultiIndex.from_frame(rows[INDEX_COLUMNS]))
+    existing = found >= 0
+    for col in rows.columns.intersection(data.columns):
+        data.iloc[found[existing], data.columns.get_loc(col)] = rows[col].to_numpy()[existing]
+    data = pd.concat([data, rows[~existing].reindex(columns=data.columns)], ignore_index=True)
+
+    changed = np.flatnonzero(
+        pd.MultiIndex.from_arrays([data["year"].astype(int), data["league_id"].astype(str)]).isin(groups)
+    )
+    recompute_league_columns(data, changed)
+    lines += [""] * (len(data) + 1 - len(lines))
+    for i, values in zip(changed, data.iloc[changed].itertuples(index=False, name=None)):
+        lines[i + 1] = _format_line(values)
+
+    # 다른 프로세스가 쓰는 도중의 파일을 읽지 않도록 다 쓴 뒤 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.writelines(lines)
+    os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    new_rows = pd.read_csv(sys.argv[1])
+    affected, took = append_seasons(new_rows, save=True)
+    print(
+        f"{len(new_rows)}행 반영, 다시 계산한 (연도, 리그) 묶음: {', '.join(f'{y} {l}' for y, l in affected)} "
+        f"(메모리 {took['in_memory'] * 1000:.1f}ms, 파일 저장 {took['save'] * 1000:.1f}ms)"
+    )
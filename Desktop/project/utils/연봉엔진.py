@@ -0,0 +1,102 @@
+# 로스터 단위 연봉 일괄 예측 (연봉 전용 모델: *_model_salary.pkl, *_scaler_salary.pkl)
+#
+# 업로드한 로스터 CSV를 타자/투수로 나눈 뒤, 유형마다 모델이 요구하는 너비(타자 80, 투수 67)의
+# 피처 행렬을 한 번에 만들고 스케일러가 합쳐진 파이프라인으로 행렬당 한 번씩만 예측함.
+# 입력하지 않은 피처는 단일 예측 화면과 같은 평균값으로 채움 (utils/피처벡터.py의 스키마).
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+
+from utils.공통함수 import get_pipeline
+from utils.피처벡터 import get_schema
+
+# 선수 유형을 나타내는 열 이름 후보와 값
+PLAYER_TYPE_COLUMNS = ['선수유형', '유형', 'player_type', 'type']
+PLAYER_TYPE_VALUES = {
+    '타자': '타자', 'hitter': '타자', 'batter': '타자', 'h': '타자',
+    '투수': '투수', 'pitcher': '투수', 'p': '투수',
+}
+
+# 유형별 입력 스키마(utils/피처벡터.py)와 업로드 CSV에서 함께 받는 영문 열 이름
+SALARY_SCHEMAS = {
+    '타자': {
+        'schema': 'hitter_salary_roster',
+        'pipeline': 'hitter_salary_pipeline',
+        'aliases': {
+            '볼넷 횟수': 'Walks',
+            '삼진 횟수': 'Strikeouts',
+            '홈런': 'Home Runs',
+            '도루 성공 횟수': 'Stolen Bases',
+            '도루 실패 횟수': 'Caught Stealing',
+            '경기수': 'Games',
+            '타석수': 'At Bats',
+            '장타율': 'Slugging Percentage',
+            '타율': 'Batting Average',
+            '출루율': 'On Base Percentage',
+        },
+    },
+    '투수': {
+        'schema': 'pitcher_salary_roster',
+        'pipeline': 'pitcher_salary_pipeline',
+        'aliases': {
+            '평균자책점': 'ERA',
+            'WHIP': 'WHIP',
+            '삼진/볼넷 비율': 'K/BB',
+            '투구 이닝': 'Innings Pitched',
+            '세이브': 'Saves',
+            '삼진': 'Strikeouts',
+        },
+    },
+}
+
+
+def _player_type_column(roster):
+    for column in PLAYER_TYPE_COLUMNS:
+        if column in roster.columns:
+            return column
+    raise ValueError(f"선수 유형 열이 없습니다 ({', '.join(PLAYER_TYPE_COLUMNS)} 중 하나 필요)")
+
+
+def split_roster(roster):
+    # 로스터를 {'타자': DataFrame, '투수': DataFrame}으로 나눔 (유형을 알 수 없는 행은 제외)
+    column = _player_type_column(roster)
+    kinds = roster[column].astype(str).str.strip().str.lower().map(PLAYER_TYPE_VALUES)
+    return {kind: roster[kinds == kind] for kind in SALARY_SCHEMAS}
+
+
+def build_matrix(players, kind):
+    # 입력 열을 스키마의 열 번호에 채우고 나머지(와 비어 있는 값)는 평균값인 (선수 수 x 피처 수) 행렬
+    aliases = SALARY_SCHEMAS[kind]['aliases']
+    columns = {}
+    for korean, english in aliases.items():
+        column = korean if korean in players.columns else english
+        if column in players.columns:
+            columns[korean] = pd.to_numeric(players[column], errors="coerce").to_numpy(dtype=np.float64)
+    return get_schema(SALARY_SCHEMAS[kind]['schema']).matrix(columns, len(players))
+
+
+def estimate_kind(players, kind):
+    # 한 유형의 선수 전체를 행렬 하나로 예측 (연봉 단위: 천 달러)
+    X = build_matrix(players, kind)
+    return np.asarray(get_pipeline(SALARY_SCHEMAS[kind]['pipeline']).predict(X), dtype=float)
+
+
+def estimate_roster(roster):
+    # 로스터 전체의 예상 연봉 표 (원래 행 순서 유지, 유형을 알 수 없는 행은 비워 둠)
+    roster = roster.reset_index(drop=True)
+    result = roster.copy()
+    result['예상_연봉($)'] = np.nan
+    for kind, players in split_roster(roster).items():
+        if len(players):
+            result.loc[players.index, '예상_연봉($)'] = np.round(estimate_kind(players, kind)) * 1000
+    return result
+
+
+def roster_template():
+    # 업로드용 예시 로스터 (타자/투수 입력 열을 모두 포함)
+    columns = ['선수명', '선수유형'] + [k for kind in SALARY_SCHEMAS for k in SALARY_SCHEMAS[kind]['aliases']]
+    hitter = {'선수명': '타자 예시', '선수유형': '타자', '볼넷 횟수': 50, '삼진 횟수': 50, '홈런': 10,
+              '도루 성공 횟수': 20, '도루 실패 횟수': 5, '경기수': 50, '타석수': 50,
+              '장타율': 0.5, '타율': 0.3, '출루율': 0.4}
+    pitcher = {'선수명': '투수 예시', '선수유형': '투수', '평균자책점': 2.30, 'WHIP': 0.95,
+               '삼진/볼넷 비율': 5.0, '투구 이닝': 220, '세이브': 20, '삼진': 210}
+    return pd.DataFrame([hitter, pitcher], columns=columns)
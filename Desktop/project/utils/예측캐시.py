@@ -0,0 +1,145 @@
+# 예측 결과 캐시 (모든 세션이 공유하는 LRU + TTL)
+#
+# 예측 버튼은 같은 입력(기본값 그대로 누르는 경우 등)으로 반복해서 눌리는 일이 많음.
+# 패딩까지 끝난 입력 벡터와 모델 파일 버전(체크섬 또는 크기/수정 시각)으로 키를 만들어 결과를 저장해 두고,
+# 같은 키가 다시 오면 스케일링과 트리 순회를 건너뛰고 저장된 결과를 돌려줌.
+# 모델 파일이 바뀌면 버전이 달라지므로 이전 결과는 자연히 쓰이지 않음.
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import time  # 만료 시간 계산
+import hashlib  # 캐시 키 해시
+import threading  # 여러 세션이 동시에 접근하므로 잠금 사용
+from collections import OrderedDict  # 최근 사용 순서 유지
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import MODEL_FILES, PIPELINES, project_path
+from utils.계측 import record_cache
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 60 * 60
+
+
+class PredictionCache:
+    # 최대 max_entries개까지, 저장 후 ttl_seconds 동안만 유효한 결과 캐시
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._entries = OrderedDict()  # 키 -> (저장 시각, 결과)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        # 유효한 결과가 있으면 (True, 결과), 없으면 (False, None)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key, value):
+        # 결과를 저장하고 가장 오래 쓰이지 않은 항목부터 정리
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        # 적중/실패 횟수와 현재 저장된 항목 수
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 프로세스 공용 캐시 (import된 모듈은 재실행 사이에도 유지되므로 모든 세션이 공유)
+_cache = PredictionCache()
+
+_checksums = {}  # 모델 이름 -> ((크기, 수정 시각), 체크섬)
+_checksums_lock = threading.Lock()
+
+
+def _recorded_checksum(name, signature):
+    # 변환된 모델(utils/모델저장.py)의 meta.json에 기록된 원본 체크섬
+    # (기록된 크기/수정 시각이 지금 파일과 같을 때만, 스케일러는 파이프라인 변환본에 기록됨)
+    from utils.모델저장 import read_meta
+
+    for artifact in [name] + [pipeline for pipeline, parts in PIPELINES.items() if name in parts]:
+        meta = read_meta(artifact)
+        for prefix in ("source", "scaler"):
+            if meta and meta.get(f"{prefix}_file") == MODEL_FILES[name] \
+                    and (meta[f"{prefix}_size"], meta[f"{prefix}_mtime_ns"]) == signature:
+                return meta[f"{prefix}_sha256"]
+    return None
+
+
+def model_checksum(name):
+    # 예측 캐시 키에 넣는 모델 파일 버전 (파일 크기와 수정 시각이 그대로면 다시 계산하지 않음)
+    # 변환본에 기록된 체크섬이 있으면 그것을 쓰고, 없으면 수백 MB pickle 전체를 읽어 해시하는 대신
+    # 크기/수정 시각을 그대로 씀 (캐시는 프로세스 안에만 있으므로 파일이 바뀐 것만 알면 됨)
+    path = project_path(MODEL_FILES[name])
+    try:
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        # 원본 pickle 없이 변환된 모델만 배포한 경우 변환 당시의 체크섬 사용
+        from utils.모델저장 import read_meta
+        meta = read_meta(name)
+        return meta["source_sha256"] if meta else name
+
+    with _checksums_lock:
+        cached = _checksums.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    checksum = _recorded_checksum(name, signature) or f"{signature[0]}:{signature[1]}"
+    with _checksums_lock:
+        _checksums[name] = (signature, checksum)
+    return checksum
+
+
+def prediction_key(model_names, vector):
+    # 패딩된 입력 벡터(float64로 정규화)와 사용한 모델/스케일러 체크섬으로 만든 키
+    values = np.ascontiguousarray(vector, dtype=np.float64)
+    digest = hashlib.sha256()
+    for name in model_names:
+        digest.update(name.encode("utf-8"))
+        digest.update(model_checksum(name).encode("ascii"))
+    digest.update(str(values.shape).encode("ascii"))
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def cached_predict(model_names, vector, compute):
+    # 같은 입력/모델의 결과가 있으면 재사용하고, 없으면 compute()를 실행해 저장
+    # 반환: (결과, 캐시 적중 여부)
+    key = prediction_key(model_names, vector)
+    hit, value = _cache.get(key)
+    record_cache("prediction_cache", hit)
+    if hit:
+        return value, True
+    value = compute()
+    _cache.put(key, value)
+    return value, False
+
+
+def cache_stats():
+    return _cache.stats()
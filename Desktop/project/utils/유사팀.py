@@ -0,0 +1,63 @@
+# 비슷한 팀-시즌 찾기 (5페이지)
+#
+# 팀-시즌마다 8개 지표의 리그 평균 대비 차이(_diff)를 열별로 표준화(평균 0, 표준편차 1)해
+# KD-트리(sklearn.neighbors.KDTree)를 프로세스당 한 번 만들어 둠. 선택한 팀-시즌과 가장
+# 가까운(유클리드 거리) k개 팀-시즌은 트리 조회 한 번으로 찾으므로 전체 데이터를 훑지 않음.
+# 표준화하지 않으면 단위가 큰 ERA, PAR 차이가 거리를 거의 다 결정하게 됨.
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+from sklearn.neighbors import KDTree  # 최근접 이웃 검색
+
+from utils.설정 import TEAM_METRICS_FILE, project_path
+from utils.공통함수 import load_once
+from utils.팀데이터 import get_team_store, team_metrics_version, RADAR_COLUMNS
+from utils.레이더 import DIFF_COLUMNS
+
+
+class _Index:
+    # 트리와 표준화 기준을 함께 묶은 검색 상태
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.rows = {key: i for i, key in enumerate(keys)}
+        self.mean = values.mean(axis=0)
+        std = values.std(axis=0)
+        self.std = np.where(std > 0, std, 1.0)
+        self.features = (values - self.mean) / self.std
+        self.tree = KDTree(self.features)
+
+
+class SimilarSeasons:
+    # (연도, 리그, 팀) -> 표준화한 지표 차이가 가장 가까운 팀-시즌들
+
+    def __init__(self, keys, values):
+        self._index = _Index(list(keys), np.asarray(values, dtype=float))
+
+    @classmethod
+    def from_store(cls, store):
+        # 팀 성과 저장소(utils/팀데이터.py)의 모든 행으로 트리를 만듦
+        return cls(store.keys_at(np.arange(len(store.data))), store.matrix(DIFF_COLUMNS))
+
+    def __len__(self):
+        return len(self._index.keys)
+
+    def query(self, year, league, team, k=5):
+        # 팀-시즌 자신을 뺀 가장 비슷한 k개의 [(연도, 리그, 팀), 거리] (가까운 순, 없는 팀-시즌이면 빈 목록)
+        index = self._index
+        i = index.rows.get((int(year), str(league), str(team)))
+        if i is None:
+            return []
+        # 자신까지 k + 1개를 찾은 뒤 자신을 뺌 (거리가 0인 다른 팀-시즌이 있어도 k개 유지)
+        distances, found = index.tree.query(index.features[i:i + 1], k=min(k + 1, len(index.keys)))
+        return [
+            (index.keys[j], float(distance))
+            for j, distance in zip(found[0], distances[0])
+            if j != i
+        ][:k]
+
+
+def get_similar_seasons():
+    # 프로세스당 한 번만 트리를 만들어 모든 세션이 공유 (레이더 페이지용 저장소에서 만듦, CSV가 바뀌면 다시 만듦)
+    def loader():
+        return SimilarSeasons.from_store(get_team_store(RADAR_COLUMNS)), TEAM_METRICS_FILE, project_path(TEAM_METRICS_FILE)
+
+    return load_once("similar_seasons", loader, team_metrics_version())
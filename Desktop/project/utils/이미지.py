@@ -0,0 +1,222 @@
+# 이미지 관련 공통 함수 (바랩 포스터 슬라이더, 크기별 이미지 변환 등)
+#
+# 포스터와 로고는 원본 PNG(0.6~2.4MB)를 그대로 보내면 표시 크기(700px)에 비해 너무 무거움.
+# 미리 표시 너비별 WebP 이미지와 manifest.json을 images/variants/에 만들어 두고,
+# 페이지에서는 표시 너비에 맞는 가장 작은 변환본을 사용함 (없거나 원본이 바뀌면 원본 사용).
+#
+# 사용법 (프로젝트 폴더에서 실행):
+#   python -m utils.이미지    # images/*.png -> images/variants/*.webp + manifest.json
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import json  # 변환 목록(manifest) 저장
+import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
+import threading  # 여러 세션이 동시에 만들지 않도록 잠금
+
+from utils.설정 import IMAGE_DIR, IMAGE_VARIANT_DIR
+from utils.공통함수 import file_sha256
+
+# 만들 이미지 너비 (원본보다 큰 너비는 만들지 않고 원본 너비 변환본을 하나 추가)
+VARIANT_WIDTHS = [350, 700]
+WEBP_QUALITY = 80
+MANIFEST_FILE = os.path.join(IMAGE_VARIANT_DIR, "manifest.json")
+
+MIME_TYPES = {".png": "image/png", ".webp": "image/webp", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+_slider_cache = {}  # (이미지 경로, 수정 시간, 크기) 목록 + 캡션 -> 완성된 슬라이더 HTML
+_slider_lock = threading.Lock()
+
+
+# Base64로 이미지 변환 함수
+def image_to_base64(image_path):
+    with open(image_path, "rb") as img_file:
+        return base64.b64encode(img_file.read()).decode()
+
+
+def build_slider_html(image_files, captions):
+    # HTML로 이미지 슬라이더 생성
+    return f"""
+    <div style="display: flex; align-items: center; justify-content: center; padding: 100px;">
+      <div style="max-width: 891px; max-height: 1260px; border: 2px solid #ddd; border-radius: 10px; overflow: hidden;">
+        <div class="slideshow-container">
+            {''.join(f'''
+            <div class="mySlides fade">
+                <img src="data:{MIME_TYPES[os.path.splitext(img)[1].lower()]};base64,{image_to_base64(img)}" style="width: 100%; height: auto; object-fit: contain;">
+                <div class="caption">{caption}</div>
+            </div>
+            ''' for img, caption in zip(image_files, captions))}
+        </div>
+      </div>
+    </div>
+
+    <style>
+    .slideshow-container {{
+      position: relative;
+      max-width: 700px; /* 컨테이너 너비를 제한 */
+      margin: auto;
+    }}
+
+    .mySlides {{
+      display: none;
+      text-align: center; /* 캡션을 중앙 정렬 */
+    }}
+
+    .fade {{
+      -webkit-animation-name: fade;
+      -webkit-animation-duration: 1.5s;
+      animation-name: fade;
+      animation-duration: 1.5s;
+    }}
+
+    @-webkit-keyframes fade {{
+      from {{opacity: .4}} 
+      to {{opacity: 1}}
+    }}
+
+    @keyframes fade {{
+      from {{opacity: .4}} 
+      to {{opacity: 1}}
+    }}
+
+    .slideshow-container img {{
+      border-radius: 10px;
+    }}
+
+    .caption {{
+      background-color: rgba(0, 0, 0, 0.5); /* 반투명한 검정 배경 */
+      color: white; /* 텍스트 색상 */
+      padding: 10px;
+      font-size: 16px;
+      position: absolute;
+      bottom: 0; /* 이미지 하단에 배치 */
+      width: 100%; /* 캡션 너비를 이미지에 맞춤 */
+      text-align: center; /* 중앙 정렬 */
+      box-sizing: border-box; /* 패딩 포함 크기 계산 */
+    }}
+    </style>
+
+    <script>
+    var slideIndex = 0;
+    showSlides();
+
+    function showSlides() {{
+      var i;
+      var slides = document.getElementsByClassName("mySlides");
+      for (i = 0; i < slides.length; i++) {{
+        slides[i].style.display = "none";
+      }}
+      slideIndex++;
+      if (slideIndex > slides.length) {{slideIndex = 1}}
+      slides[slideIndex-1].style.display = "block";
+      setTimeout(showSlides, 5000); // Change image every 5 seconds
+    }}
+    </script>
+    """
+
+
+def get_slider_html(image_files, captions):
+    # 슬라이더 HTML을 프로세스당 한 번만 만들어 재사용
+    # 이미지 파일이 바뀌면(수정 시간/크기 변경) 다시 만듦
+    stats = [os.stat(path) for path in image_files]
+    key = (
+        tuple((path, stat.st_mtime_ns, stat.st_size) for path, stat in zip(image_files, stats)),
+        tuple(captions),
+    )
+    html = _slider_cache.get(key)
+    if html is None:
+        with _slider_lock:
+            html = _slider_cache.get(key)
+            if html is None:
+                html = build_slider_html(image_files, captions)
+                # 예전 이미지로 만든 HTML은 버림
+                _slider_cache.clear()
+                _slider_cache[key] = html
+    return html
+
+
+# ---------------------------------------------------------------
+# 크기별 이미지 변환 (오프라인)
+# ---------------------------------------------------------------
+def build_variants(image_dir=IMAGE_DIR, out_dir=IMAGE_VARIANT_DIR, widths=VARIANT_WIDTHS, quality=WEBP_QUALITY):
+    # image_dir의 PNG마다 너비별 WebP를 만들고 manifest.json에 기록
+    from PIL import Image  # 이미지 변환 (Streamlit과 함께 설치됨)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+    for file_name in sorted(os.listdir(image_dir)):
+        if not file_name.lower().endswith(".png"):
+            continue
+        source = os.path.join(image_dir, file_name)
+        stem = os.path.splitext(file_name)[0]
+        with Image.open(source) as image:
+            image.load()
+            original_width, original_height = image.size
+            targets = sorted({w for w in widths if w < original_width} | {original_width})
+
+            variants = []
+            for width in targets:
+                height = round(original_height * width / original_width)
+                resized = image if width == original_width else image.resize((width, height), Image.LANCZOS)
+                variant_name = f"{stem}_w{width}.webp"
+                variant_path = os.path.join(out_dir, variant_name)
+                resized.save(variant_path, "WEBP", quality=quality, method=6)
+                variants.append({
+                    "width": width,
+                    "height": height,
+                    "file": variant_name,
+                    "bytes": os.path.getsize(variant_path),
+                })
+
+        manifest[file_name] = {
+            "width": original_width,
+            "height": original_height,
+            "bytes": os.path.getsize(source),
+            "sha256": file_sha256(source),
+            "variants": variants,
+        }
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+_manifest_cache = {}  # manifest 수정 시간 -> 내용
+_source_checksums = {}  # (원본 경로, 수정 시간, 크기) -> 체크섬
+
+
+def _load_manifest():
+    # manifest.json을 읽어 캐시 (파일이 바뀌면 다시 읽음, 없으면 빈 dict)
+    try:
+        mtime = os.stat(MANIFEST_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    if mtime not in _manifest_cache:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            _manifest_cache.clear()
+            _manifest_cache[mtime] = json.load(f)
+    return _manifest_cache[mtime]
+
+
+def _source_checksum(path):
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _source_checksums:
+        _source_checksums[key] = file_sha256(path)
+    return _source_checksums[key]
+
+
+def best_image(path, display_width):
+    # 표시 너비 이상인 변환본 중 가장 작은 파일 경로를 반환
+    # (변환본이 없거나 원본이 바뀌었으면 원본 경로를 그대로 반환)
+    entry = _load_manifest().get(os.path.basename(path))
+    if entry is None or entry["sha256"] != _source_checksum(path):
+        return path
+    candidates = [v for v in entry["variants"] if v["width"] >= display_width] or entry["variants"][-1:]
+    best = min(candidates, key=lambda v: v["bytes"])
+    variant_path = os.path.join(IMAGE_VARIANT_DIR, best["file"])
+    return variant_path if os.path.exists(variant_path) else path
+
+
+if __name__ == "__main__":
+    manifest = build_variants()
+    for file_name, entry in manifest.items():
+        sizes = ", ".join(f"{v['width']}px {v['bytes'] / 1024:.0f}KB" for v in entry["variants"])
+        print(f"{file_name}: 원본 {entry['bytes'] / 1024:.0f}KB -> {sizes}")
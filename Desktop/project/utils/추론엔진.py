@@ -0,0 +1,201 @@
+# flat 배열(utils/모델저장.py 형식) 위에서 동작하는 벡터화 포레스트 추론 엔진
+#
+# sklearn은 predict/predict_proba를 부를 때마다 트리 수만큼 estimator를 Python에서 돌며
+# 입력 검증과 변환을 반복함. 여기서는 (행 수 x 트리 수) 칸의 노드 번호 배열 하나를
+# 깊이 방향으로 한 단계씩 이동시켜 모든 트리를 한 번에 순회하고 (리프에 도착한 칸은 제외),
+# 분류 모델은 한 번의 순회로 클래스와 확률을 같이 돌려줌.
+import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
+import json  # 메타 정보 읽기
+import time  # 단계별 소요 시간 측정
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+ARRAY_NAMES = ["left", "right", "feature", "threshold", "value", "roots"]
+
+# 한 번에 만드는 (행 x 트리) 노드 행렬의 최대 크기 (메모리 사용량 제한)
+MAX_CELLS_PER_CHUNK = 1 << 20
+
+
+class ParityError(Exception):
+    # 변환한 엔진의 예측이 원본 sklearn 모델과 다를 때 (utils/모델저장.py는 이 모델의 변환을 건너뜀)
+    pass
+
+
+class FlatForest:
+    # 메모리 맵으로 연 flat 배열 위에서 예측하는 가벼운 포레스트
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = np.asarray(arrays["roots"], dtype=np.int64)
+        self.n_features_in_ = meta["n_features"]
+        if meta.get("feature_names"):
+            self.feature_names_in_ = np.asarray(meta["feature_names"], dtype=object)
+        if meta["kind"] == "classifier":
+            self.classes_ = np.asarray(meta["classes"])
+        # 스케일러를 기준값에 합친 모델은 원래 단위의 입력을 float64 그대로 비교
+        self.input_dtype = np.dtype(meta.get("input_dtype", "float32"))
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            key: np.load(os.path.join(directory, f"{key}.npy"), mmap_mode=mmap_mode)
+            for key in ARRAY_NAMES
+        }
+        return cls(arrays, meta)
+
+    @property
+    def is_classifier(self):
+        return self.meta["kind"] == "classifier"
+
+    def _check_input(self, X):
+        # sklearn과 같이 float32로 변환한 뒤 float64 기준값과 비교 (스케일러를 합친 모델은 float64)
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"피처 수가 맞지 않습니다: {X.shape[1]} (모델은 {self.n_features_in_}개 필요)")
+        return X
+
+    def _leaf_values(self, X):
+        # 모든 트리를 한 번에 순회해 트리 평균 리프 값을 반환 (n_samples, n_outputs)
+        n_trees = len(self.roots)
+        n_features = X.shape[1]
+        out = np.empty((X.shape[0], self.value.shape[1]))
+        chunk = max(1, MAX_CELLS_PER_CHUNK // n_trees)
+        for start in range(0, X.shape[0], chunk):
+            X_chunk = X[start:start + chunk]
+            n = X_chunk.shape[0]
+            flat_X = X_chunk.ravel()
+
+            # (행, 트리) 칸마다 현재 노드 번호와 그 행의 시작 위치를 1차원으로 펼침
+            node = np.tile(self.roots, n)
+            row_offset = np.repeat(np.arange(n, dtype=np.intp) * n_features, n_trees)
+            active = np.arange(node.size)  # 아직 리프에 도달하지 않은 칸
+            for _ in range(self.meta["max_depth"]):
+                current = node[active]
+                left = self.left.take(current)
+                # 리프는 자기 자신을 가리키므로 도착한 칸은 다음 단계부터 제외
+                moving = left != current
+                if not moving.all():
+                    active, current, left = active[moving], current[moving], left[moving]
+                    if active.size == 0:
+                        break
+                go_left = flat_X.take(row_offset[active] + self.feature.take(current)) <= self.threshold.take(current)
+                node[active] = np.where(go_left, left, self.right.take(current))
+
+            # sklearn과 같은 순서로 트리별 값을 누적해야 확률 동점 처리까지 일치
+            leaf_values = self.value.take(node, axis=0).reshape(n, n_trees, -1)
+            total = np.zeros((n, self.value.shape[1]))
+            for t in range(n_trees):
+                total += leaf_values[:, t]
+            out[start:start + chunk] = total / n_trees
+        return out
+
+    def predict_with_proba(self, X):
+        # 분류 모델: 한 번의 순회로 (예측 클래스, 클래스별 확률) 반환
+        if not self.is_classifier:
+            raise TypeError("predict_with_proba는 분류 모델에서만 사용할 수 있습니다")
+        proba = self._leaf_values(self._check_input(X))
+        return self.classes_[proba.argmax(axis=1)], proba
+
+    def predict_proba(self, X):
+        return self.predict_with_proba(X)[1]
+
+    def predict(self, X):
+        if self.is_classifier:
+            return self.predict_with_proba(X)[0]
+        values = self._leaf_values(self._check_input(X))
+        return values[:, 0] if values.shape[1] == 1 else values
+
+
+class ScaledModel:
+    # 스케일러와 모델을 따로 가진 예측기 (스케일러를 합친 변환본이 없을 때 사용)
+
+    def __init__(self, scaler, model):
+        self.scaler = scaler
+        self.model = model
+        self.n_features_in_ = scaler.n_features_in_
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+
+def predict_with_proba(model, X):
+    # FlatForest와 sklearn 분류 모델 모두에서 (예측 클래스, 확률)을 얻는 공용 함수
+    if hasattr(model, "predict_with_proba"):
+        return model.predict_with_proba(X)
+    proba = model.predict_proba(X)
+    return model.classes_[proba.argmax(axis=1)], proba
+
+
+def predict_with_proba_timed(model, X):
+    # predict_with_proba와 같지만 단계별 소요 시간(초)도 함께 반환
+    # 검증: 모양/값 확인, 변환: 모델 입력 형식(float32 배열 또는 sklearn용 DataFrame)으로 변환,
+    # 트리 순회: 예측 클래스와 확률을 한 번에 계산
+    start = time.perf_counter()
+    X = np.asarray(X)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.ndim != 2 or X.shape[1] != model.n_features_in_:
+        raise ValueError(f"피처 수가 맞지 않습니다: {X.shape[-1]} (모델은 {model.n_features_in_}개 필요)")
+    if not np.isfinite(X).all():
+        raise ValueError("입력에 NaN 또는 무한대 값이 있습니다")
+    validated = time.perf_counter()
+
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    if not hasattr(model, "predict_with_proba") and hasattr(model, "feature_names_in_"):
+        # sklearn 모델은 피처 이름으로 학습됐으면 DataFrame으로 넘겨야 경고 없이 동작
+        import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+        X = pd.DataFrame(X, columns=model.feature_names_in_)
+    converted = time.perf_counter()
+
+    labels, proba = predict_with_proba(model, X)
+    finished = time.perf_counter()
+    return labels, proba, {
+        "validation": validated - start,
+        "conversion": converted - validated,
+        "traversal": finished - converted,
+    }
+
+
+def sample_inputs(forest, n_samples=2000, seed=0):
+    # 각 피처의 분기 기준값 근처에서 입력을 뽑아 모든 분기 방향이 고르게 나오도록 함
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n_samples, forest.n_features_in_))
+    is_split = np.asarray(forest.left) != np.arange(len(forest.left))
+    features = np.asarray(forest.feature)[is_split]
+    thresholds = np.asarray(forest.threshold)[is_split]
+    for j in range(forest.n_features_in_):
+        t = thresholds[features == j]
+        if len(t):
+            X[:, j] = rng.choice(t, n_samples) + rng.normal(scale=np.std(t) + 1e-6, size=n_samples)
+    return X
+
+
+def check_parity(model, forest, X=None, rtol=1e-9):
+    # 변환한 엔진이 원본 sklearn 모델과 같은 결과를 내는지 확인 (최대 상대 오차 반환)
+    if X is None:
+        X = sample_inputs(forest)
+    X_model = X
+    if hasattr(model, "feature_names_in_"):
+        # 피처 이름으로 학습된 모델은 DataFrame으로 넣어야 경고 없이 예측
+        import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+        X_model = pd.DataFrame(X, columns=model.feature_names_in_)
+
+    if forest.is_classifier:
+        labels, result = forest.predict_with_proba(X)
+        expected = model.predict_proba(X_model)
+        if not np.array_equal(labels, model.predict(X_model)):
+            raise ParityError("예측 클래스가 sklearn 결과와 다릅니다")
+    else:
+        result, expected = forest.predict(X), model.predict(X_model)
+    error = float(np.abs(result - expected).max() / max(1.0, np.abs(expected).max()))
+    if error > rtol:
+        raise ParityError(f"sklearn 결과와 차이가 큽니다 (최대 상대 오차 {error:.3g})")
+    return error
@@ -0,0 +1,260 @@
+# 팀 성과 지표 데이터 저장소 (레이더 차트 페이지 공용)
+#
+# CSV를 프로세스당 한 번만 읽고 (year, league_id, team_id) MultiIndex로 정렬해 두어
+# 팀 하나를 찾는 데 전체 데이터를 훑는 불리언 마스크 대신 .loc 조회 한 번이면 되도록 함.
+# 사이드바 선택지(연도, 리그, 연도/리그별 팀 목록)도 미리 계산해 둠.
+import copy  # 새 시즌을 반영한 저장소 복사본 만들기
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+import pandas as pd  # 데이터 처리 및 분석을 위한 라이브러리
+
+from utils.설정 import TEAM_METRICS_FILE, TEAM_AVERAGES_FILE, TEAM_NAME_MAPPING, COLUMNS_FOR_SPIDER, project_path
+from utils.공통함수 import load_once, replace_loaded, file_version
+from utils.데이터캐시 import read_table
+
+INDEX_COLUMNS = ["year", "league_id", "team_id"]
+
+# 포스트시즌 진출 여부 열 (지구 우승, 와일드카드, 리그 우승, 월드시리즈 우승: "Y"/"N"/"unk")
+POSTSEASON_COLUMNS = ["div_win", "wc_win", "lg_win", "ws_win"]
+
+# 레이더 차트 페이지가 사용하는 열
+# (지표 원값 + 리그 평균 대비 차이 + 여러 팀 비교에 쓰는 구단/지구 + 약점 분석에 쓰는 포스트시즌 진출 여부)
+RADAR_COLUMNS = (
+    COLUMNS_FOR_SPIDER + [col + '_diff' for col in COLUMNS_FOR_SPIDER] + ["franchise_id", "div_id"] + POSTSEASON_COLUMNS
+)
+
+# 지구 구분이 없던 시즌(1968년 이전)의 div_id
+NO_DIVISION = "unk"
+
+# 문자열 열은 category로 읽어 메모리와 비교 비용을 줄임
+CATEGORY_COLUMNS = [
+    "league_id", "franchise_id", "div_id", "div_win", "wc_win", "lg_win", "ws_win",
+    "name", "park", "team_id_br", "team_id_lahman45", "team_id_retro",
+]
+INT_COLUMNS = [
+    "year", "rank", "g", "w", "l", "r", "ab", "h", "double", "triple", "hr", "bb",
+    "ra", "er", "cg", "sho", "sv", "ipouts", "ha", "hra", "bba", "soa", "e", "bpf", "ppf",
+]
+
+
+def read_team_metrics(path=None):
+    # CSV를 명시적인 자료형으로 읽고 팀 이름 매핑을 적용 (인덱스는 아직 설정하지 않음)
+    dtypes = {col: "category" for col in CATEGORY_COLUMNS}
+    dtypes.update({col: "int32" for col in INT_COLUMNS})
+    dtypes["team_id"] = str  # 매핑 후 category로 변환
+    data = pd.read_csv(path or project_path(TEAM_METRICS_FILE), dtype=dtypes)
+
+    data["team_id"] = map_team_names(data["team_id"]).astype("category")
+    return data
+
+
+def map_team_names(team_ids):
+    # 팀 이름 매핑 적용 (매핑에 없는 옛 구단은 원래 코드를 그대로 사용)
+    team_ids = team_ids.astype(str)
+    return team_ids.map(TEAM_NAME_MAPPING).fillna(team_ids)
+
+
+def read_team_averages(path=None):
+    # 팀-연도별 평균 지표 CSV를 명시적인 자료형으로 읽음
+    return pd.read_csv(
+        path or project_path(TEAM_AVERAGES_FILE),
+        dtype={"Team": "category", "Year": "int32"},
+    )
+
+
+class TeamMetricsStore:
+    # (year, league_id, team_id)로 색인된 팀 성과 데이터와 미리 계산한 선택지 목록
+
+    def __init__(self, data):
+        # 선택지는 CSV 순서를 유지 (기존 페이지의 unique() 순서와 동일)
+        self.years = sorted(int(year) for year in data["year"].unique())
+        self.year_set = set(self.years)
+        self.leagues = [str(league) for league in pd.unique(data["league_id"].astype(str))]
+        self.teams_by_year_league = {
+            (int(year), str(league)): [str(team) for team in pd.unique(group["team_id"].astype(str))]
+            for (year, league), group in data.groupby(["year", "league_id"], sort=False, observed=True)
+        }
+
+        self.data = data.set_index(INDEX_COLUMNS).sort_index()
+        self._matrices = {}
+        self._groups = {}
+        self._years = self.data.index.get_level_values("year").to_numpy()
+        if not self.data.index.is_unique:
+            raise ValueError("(year, league_id, team_id) 조합이 중복된 행이 있습니다")
+
+    def upsert(self, rows):
+        # (연도, 리그, 팀) 인덱스의 행들을 반영한 새 저장소를 반환: 있는 팀-시즌은 값을 바꾸고 없는 팀-시즌은 추가
+        # (저장소가 갖고 있는 열만 반영). 이 저장소는 그대로 두므로 조회 중인 세션은 이전 데이터로 끝까지 진행
+        rows = rows[[col for col in self.data.columns if col in rows.columns]]
+        data = self.data.copy()
+        found = data.index.get_indexer(rows.index)
+        existing = found >= 0
+        if existing.any():
+            at = found[existing]
+            for col in rows.columns:
+                values = rows[col].to_numpy()[existing]
+                if isinstance(data[col].dtype, pd.CategoricalDtype):
+                    new = set(pd.Series(values).dropna().astype(str)) - set(data[col].cat.categories)
+                    if new:
+                        data[col] = data[col].cat.add_categories(sorted(new))
+                data.iloc[at, data.columns.get_loc(col)] = values
+        added = rows[~existing].reindex(columns=data.columns)
+        if len(added):
+            data = pd.concat([data, added]).sort_index()
+            # 새 값이 섞인 category 열은 다시 category로
+            for col in self.data.columns:
+                if isinstance(self.data[col].dtype, pd.CategoricalDtype):
+                    data[col] = data[col].astype("category")
+
+        store = copy.copy(self)
+        store.data = data
+        store.years = list(self.years)
+        store.year_set = set(self.year_set)
+        store.leagues = list(self.leagues)
+        store.teams_by_year_league = {key: list(teams) for key, teams in self.teams_by_year_league.items()}
+        store._matrices = {}
+        store._groups = {}
+        store._years = data.index.get_level_values("year").to_numpy()
+        for year, league, team in added.index:
+            store._add_choice(int(year), str(league), str(team))
+        return store
+
+    def refresh(self):
+        # data의 값을 직접 고친 뒤 호출: 만들어 둔 행렬을 버리고 다음 조회 때 다시 만듦
+        self._matrices = {}
+
+    def _add_choice(self, year, league, team):
+        # 새 팀-시즌을 사이드바 선택지에 추가
+        if year not in self.year_set:
+            self.year_set.add(year)
+            self.years = sorted(self.year_set)
+        if league not in self.leagues:
+            self.leagues = self.leagues + [league]
+        teams = self.teams_by_year_league.setdefault((year, league), [])
+        if team not in teams:
+            teams.append(team)
+
+    def teams(self, year, league):
+        # 해당 연도/리그의 팀 목록 (없으면 빈 목록)
+        return self.teams_by_year_league.get((int(year), str(league)), [])
+
+    def row(self, year, league, team):
+        # 팀-시즌 한 행 조회 (없으면 None)
+        try:
+            return self.data.loc[(int(year), str(league), str(team))]
+        except KeyError:
+            return None
+
+    def position(self, year, league, team):
+        # 팀-시즌의 행 번호 (없으면 None)
+        try:
+            return self.data.index.get_loc((int(year), str(league), str(team)))
+        except (KeyError, TypeError):
+            return None
+
+    def matrix(self, columns):
+        # 지정한 열들을 float 행렬로 (열 조합마다 한 번만 만들어 재사용)
+        key = tuple(columns)
+        if key not in self._matrices:
+            self._matrices[key] = self.data[list(columns)].to_numpy(dtype=float)
+        return self._matrices[key]
+
+    def positions(self, keys):
+        # 여러 (연도, 리그, 팀)의 행 번호를 한 번에 조회 (없는 조합은 제외)
+        keys = [(int(year), str(league), str(team)) for year, league, team in keys]
+        if not keys:
+            return np.empty(0, dtype=np.intp)
+        found = self.data.index.get_indexer(keys)
+        return found[found >= 0]
+
+    def _group_index(self, column):
+        # column 값 -> 행 번호 배열 (연도순, 열마다 처음 한 번만 묶어 둠)
+        if column not in self._groups:
+            self._groups[column] = {
+                str(key): np.sort(rows)
+                for key, rows in self.data.groupby(column, observed=True).indices.items()
+            }
+        return self._groups[column]
+
+    def group_positions(self, column, value):
+        # column 값이 value인 행 번호
+        return self._group_index(column).get(str(value), np.empty(0, dtype=np.intp))
+
+    def group_values(self, column):
+        # column의 값 목록 (정렬)
+        return sorted(self._group_index(column))
+
+    def season_positions(self, year, league):
+        # 해당 연도/리그의 행 번호 (인덱스가 정렬돼 있어 연속 구간)
+        start, stop = self.data.index.slice_locs((int(year), str(league)), (int(year), str(league)))
+        return np.arange(start, stop)
+
+    def division_positions(self, year, league, division):
+        # 해당 연도/리그/지구에 속한 팀들의 행 번호
+        return np.intersect1d(self.season_positions(year, league), self.group_positions("div_id", division))
+
+    def divisions(self, year, league):
+        # 해당 연도/리그의 지구 목록 (지구 구분이 없던 시즌이면 빈 목록)
+        rows = self.season_positions(year, league)
+        divisions = self.data["div_id"].iloc[rows].astype(str).unique() if len(rows) else []
+        return sorted(division for division in divisions if division != NO_DIVISION)
+
+    def franchise_positions(self, franchise, start_year=None, end_year=None):
+        # 구단의 시즌별 행 번호 (연도 범위로 제한 가능)
+        rows = self.group_positions("franchise_id", franchise)
+        years = self._years[rows]
+        keep = np.ones(len(rows), dtype=bool)
+        if start_year is not None:
+            keep &= years >= start_year
+        if end_year is not None:
+            keep &= years <= end_year
+        return rows[keep]
+
+    def keys_at(self, positions):
+        # 행 번호 -> (연도, 리그, 팀) 목록
+        return [(int(year), str(league), str(team)) for year, league, team in self.data.index[positions]]
+
+    def values(self, year, league, team, columns):
+        # 팀-시즌 한 행에서 지정한 열의 값만 배열로 반환 (없으면 None)
+        pos = self.position(year, league, team)
+        if pos is None:
+            return None
+        return self.matrix(columns)[pos]
+
+
+_stores = {}  # 이 프로세스에서 만든 저장소 (새 시즌 추가 시 모두 교체, utils/시즌추가.py)
+
+
+def team_metrics_version():
+    # 팀 성과 CSV의 체크섬: 파일이 바뀌면 (다른 프로세스에서 시즌 추가 등) 저장소와 그로부터 만든 객체를 다시 로드
+    return file_version(project_path(TEAM_METRICS_FILE))
+
+
+def store_key(columns=None):
+    # 모델 레지스트리(utils/공통함수.py)에 등록하는 저장소 이름
+    return "team_metrics" if columns is None else f"team_metrics[{','.join(columns)}]"
+
+
+def get_team_store(columns=None):
+    # 프로세스당 한 번만 데이터를 읽어 모든 세션이 공유 (CSV가 바뀌면 다시 읽음)
+    # columns를 주면 Feather 캐시에서 (연도, 리그, 팀) + 해당 열만 읽음
+    key = store_key(columns)
+
+    def loader():
+        wanted = None if columns is None else INDEX_COLUMNS + [c for c in columns if c not in INDEX_COLUMNS]
+        data = read_table(TEAM_METRICS_FILE, read_team_metrics, wanted)
+        _stores[key] = TeamMetricsStore(data)
+        return _stores[key], TEAM_METRICS_FILE, project_path(TEAM_METRICS_FILE)
+
+    return load_once(key, loader, team_metrics_version())
+
+
+def replace_stores(stores, version):
+    # 새 시즌을 반영해 새로 만든 저장소들로 교체 ({이름: 저장소}, version은 반영 후 CSV 체크섬)
+    _stores.update(stores)
+    replace_loaded(stores, version)
+
+
+def loaded_stores():
+    # 지금까지 로드된 팀 성과 저장소 {이름: 저장소}
+    return dict(_stores)
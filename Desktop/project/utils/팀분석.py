@@ -0,0 +1,142 @@
+# 팀 성과지표 약점 분석 (5페이지 "바랩! 분석해줘!")
+#
+# 선택한 팀-시즌의 8개 지표를 리그 내 백분위(utils/순위.py)로 보고, 리그 중간(백분위 50)보다
+# 낮은 지표를 약점으로 고름. 약점은 포스트시즌 진출 팀-시즌들의 리그 평균 대비 차이(_diff)
+# 중앙값과의 격차가 큰 순서로 정렬함. 격차는 지표마다 단위가 달라 전체 팀-시즌의 표준편차로
+# 나눠 비교하고, ERA, PARA처럼 낮을수록 좋은 지표는 부호를 뒤집음.
+# 8개 지표를 한 행 배열 연산으로 계산하고, 결과는 (연도, 리그, 팀)마다 한 번만 만들어 보관함.
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import TEAM_METRICS_FILE, COLUMNS_FOR_SPIDER, project_path
+from utils.공통함수 import load_once
+from utils.팀데이터 import get_team_store, team_metrics_version, RADAR_COLUMNS, POSTSEASON_COLUMNS
+from utils.레이더 import DIFF_COLUMNS
+from utils.순위 import LOWER_IS_BETTER, get_team_rankings
+
+# 리그 내 백분위가 이보다 낮으면 약점, SEVERE_PERCENTILE보다 낮으면 큰 약점
+WEAK_PERCENTILE = 0.5
+SEVERE_PERCENTILE = 0.25
+
+# 강점으로 표시할 백분위
+STRONG_PERCENTILE = 0.75
+
+# 지표별 (이름, 표시 자릿수, 제안)
+METRIC_ADVICE = {
+    "SLG": ("장타력", 3, "장타력 있는 타자를 보강하고 타구 속도와 발사각 중심의 타격 훈련으로 장타 비중을 높이세요."),
+    "OPS": ("종합 공격력", 3, "출루와 장타를 함께 끌어올리도록 타순과 타격 전략을 다시 짜세요."),
+    "era": ("평균자책점", 2, "선발 로테이션과 불펜을 보강해 자책점을 낮추세요. 경기 후반을 맡을 불펜 투수 보강을 우선 고려하세요."),
+    "WP": ("승률", 3, "접전 상황의 불펜 기용과 대타/대주자 활용을 세밀하게 다듬어 승리로 연결하세요."),
+    "PAR": ("구장 보정 득점", 2, "구장 효과를 감안해도 득점이 부족합니다. 득점권 타격과 주루로 득점 생산을 늘리세요."),
+    "PARA": ("구장 보정 실점", 2, "구장 효과를 감안해도 실점이 많습니다. 투수진과 함께 수비 보강도 검토하세요."),
+    "BA": ("타율", 3, "컨택 능력이 좋은 타자를 기용하고 삼진을 줄이는 타석 접근을 훈련하세요."),
+    "OBP": ("출루율", 3, "선구안 훈련과 볼넷을 얻는 타석 접근으로 출루율을 높이세요."),
+}
+
+
+def postseason_mask(data):
+    # 포스트시즌 진출 팀-시즌 (지구/리그/월드시리즈 우승 또는 와일드카드)
+    return (data[POSTSEASON_COLUMNS].astype(str) == "Y").any(axis=1).to_numpy()
+
+
+class WeaknessAnalyzer:
+    # (연도, 리그, 팀) -> 약점/강점 분석 결과
+
+    def __init__(self, store, rankings, metrics=COLUMNS_FOR_SPIDER):
+        self.store = store
+        self.rankings = rankings
+        self.metrics = list(metrics)
+        self.sign = np.array([-1.0 if col in LOWER_IS_BETTER else 1.0 for col in self.metrics])
+        self._reports = {}
+        self._baseline = self._compute_baseline()
+
+    def _compute_baseline(self):
+        # 포스트시즌 진출 팀들의 지표 차이 중앙값과 지표별 표준편차
+        diffs = self.store.matrix(DIFF_COLUMNS)
+        postseason = postseason_mask(self.store.data)
+        return np.median(diffs[postseason], axis=0), diffs.std(axis=0), postseason
+
+    def analyze(self, year, league, team):
+        # 분석 결과 dict (없는 팀-시즌이면 None)
+        key = (int(year), str(league), str(team))
+        if key in self._reports:
+            return self._reports[key]
+        pos = self.store.position(*key)
+        percentile = self.rankings.percentiles(*key)
+        if pos is None or percentile is None:
+            return None
+
+        target, scale, postseason = self._baseline
+        value = self.store.matrix(self.metrics)[pos]
+        diff = self.store.matrix(DIFF_COLUMNS)[pos]
+        percentile = percentile.astype(float)
+        # 포스트시즌 팀 중앙값보다 얼마나 뒤처지는지 (표준편차 단위, 양수면 부족)
+        gap = (target - diff) * self.sign / np.where(scale > 0, scale, 1.0)
+
+        weak = np.flatnonzero(percentile < WEAK_PERCENTILE)
+        weak = weak[np.argsort(-gap[weak], kind="mergesort")]
+        strong = np.flatnonzero(percentile >= STRONG_PERCENTILE)
+        strong = strong[np.argsort(-percentile[strong], kind="mergesort")]
+
+        def item(j):
+            return {
+                "metric": self.metrics[j],
+                "value": float(value[j]),
+                "league": float(value[j] - diff[j]),
+                "diff": float(diff[j]),
+                "target": float(target[j]),
+                "percentile": float(percentile[j]),
+                "gap": float(gap[j]),
+            }
+
+        report = {
+            "postseason": bool(postseason[pos]),
+            "weaknesses": [item(j) for j in weak],
+            "strengths": [item(j) for j in strong],
+        }
+        report["markdown"] = report_markdown(report, team, year)
+        self._reports[key] = report
+        return report
+
+
+def _format_metric(entry):
+    name, digits, _ = METRIC_ADVICE[entry["metric"]]
+    return (
+        f"{entry['metric']}({name}) {entry['value']:.{digits}f} "
+        f"(리그 평균 {entry['league']:.{digits}f}, 리그 내 백분위 {entry['percentile'] * 100:.0f})"
+    )
+
+
+def report_markdown(report, team, year):
+    # 분석 결과를 페이지에 표시할 마크다운으로
+    lines = []
+    if report["postseason"]:
+        lines.append(f"{team} ({year})는 포스트시즌에 진출한 시즌입니다.")
+    if report["strengths"]:
+        lines.append("### 💪 강점")
+        lines += [f"- {_format_metric(entry)}" for entry in report["strengths"]]
+
+    lines.append("### 📋 개선이 필요한 지표")
+    if not report["weaknesses"]:
+        lines.append("- 모든 지표가 리그 중간 이상입니다. 현재 전력을 유지하는 데 집중하세요.")
+    for rank, entry in enumerate(report["weaknesses"], start=1):
+        _, digits, advice = METRIC_ADVICE[entry["metric"]]
+        level = "크게 부족" if entry["percentile"] < SEVERE_PERCENTILE else "부족"
+        direction = "낮아야" if entry["metric"] in LOWER_IS_BETTER else "높아야"
+        lines.append(f"{rank}. **{_format_metric(entry)}**: {level}")
+        lines.append(
+            f"   - 포스트시즌 진출 팀들의 중앙값은 리그 평균 대비 {entry['target']:+.{digits + 1}f}, "
+            f"이 팀은 {entry['diff']:+.{digits + 1}f}"
+            + (f" (리그 평균 대비 {abs(entry['target'] - entry['diff']):.{digits + 1}f}만큼 더 {direction} 함)"
+               if entry["gap"] > 0 else " (포스트시즌 팀 수준은 넘음)")
+        )
+        lines.append(f"   - {advice}")
+    return "\n".join(lines)
+
+
+def get_weakness_analyzer():
+    # 프로세스당 한 번만 기준값을 계산해 모든 세션이 공유 (분석 결과도 공유, CSV가 바뀌면 다시 계산)
+    def loader():
+        analyzer = WeaknessAnalyzer(get_team_store(RADAR_COLUMNS), get_team_rankings())
+        return analyzer, TEAM_METRICS_FILE, project_path(TEAM_METRICS_FILE)
+
+    return load_once("weakness_analyzer", loader, team_metrics_version())
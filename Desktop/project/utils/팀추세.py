@@ -0,0 +1,153 @@
+# 팀-연도별 평균 지표 추세 저장소 (팀 지표 추세 페이지)
+#
+# Team-Year_Averages_of_MLB_Performance_Metrics.csv를 팀마다 연도순 배열로 나눠 두고,
+# 지표별 누적합/제곱 누적합을 함께 보관함. 이동 평균과 이동 표준편차는 누적합의 차이로
+# 바로 얻을 수 있어 창 크기를 바꿔도 다시 계산할 것이 없고, 특정 연도 구간은
+# searchsorted로 찾은 배열 조각만 넘기면 됨. 새 시즌은 누적합에 한 행씩 이어 붙임.
+# 긴 시계열은 Plotly로 보내기 전에 LTTB 방식으로 점 수를 줄임.
+import threading  # 새 시즌 추가와 조회가 겹치지 않도록 잠금
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.설정 import TEAM_AVERAGES_FILE, TEAM_NAME_MAPPING, project_path
+from utils.공통함수 import load_once, file_version
+from utils.데이터캐시 import read_table
+from utils.팀데이터 import read_team_averages
+
+TREND_METRICS = ["Average_OPS", "Average_ERA", "Average_WP", "Average_PAR", "Average_PARA", "Average_BA", "Average_OBP"]
+
+# 차트 하나에 그릴 최대 점 수 (시리즈마다)
+MAX_POINTS = 80
+
+
+class TeamSeries:
+    # 한 팀의 연도순 지표 값과 누적합 (누적합은 맨 앞에 0 행이 있어 길이가 시즌 수 + 1)
+
+    def __init__(self, years, values):
+        self.years = np.asarray(years, dtype=np.int32)
+        self.values = np.asarray(values, dtype=float)
+        self.csum = np.vstack([np.zeros((1, self.values.shape[1])), np.cumsum(self.values, axis=0)])
+        self.csum2 = np.vstack([np.zeros((1, self.values.shape[1])), np.cumsum(self.values ** 2, axis=0)])
+
+    def __len__(self):
+        return len(self.years)
+
+    def span(self, start_year=None, end_year=None):
+        # 연도 구간에 해당하는 행 범위 [start, stop)
+        start = 0 if start_year is None else int(np.searchsorted(self.years, start_year, side="left"))
+        stop = len(self.years) if end_year is None else int(np.searchsorted(self.years, end_year, side="right"))
+        return start, stop
+
+    def rolling(self, metric_index, window, start=0, stop=None):
+        # [start, stop) 행의 이동 평균과 이동 표준편차 (시즌 수 기준 창, 앞쪽은 있는 시즌만으로 계산)
+        stop = len(self.years) if stop is None else stop
+        ends = np.arange(start + 1, stop + 1)
+        begins = np.maximum(ends - window, 0)
+        counts = ends - begins
+        total = self.csum[ends, metric_index] - self.csum[begins, metric_index]
+        total2 = self.csum2[ends, metric_index] - self.csum2[begins, metric_index]
+        mean = total / counts
+        # 누적합 차이로 구한 분산은 반올림 오차로 아주 작은 음수가 될 수 있음
+        std = np.sqrt(np.maximum(total2 / counts - mean ** 2, 0.0))
+        return mean, std
+
+    def append(self, year, row):
+        # 마지막 시즌 뒤에 한 시즌을 이어 붙임 (누적합은 마지막 행에 더하기만 함)
+        row = np.asarray(row, dtype=float).reshape(1, -1)
+        self.years = np.append(self.years, np.int32(year))
+        self.values = np.vstack([self.values, row])
+        self.csum = np.vstack([self.csum, self.csum[-1:] + row])
+        self.csum2 = np.vstack([self.csum2, self.csum2[-1:] + row ** 2])
+
+
+class TeamTrendStore:
+    # 팀 코드 -> TeamSeries
+
+    def __init__(self, data, metrics=TREND_METRICS):
+        self.metrics = list(metrics)
+        self._metric_index = {metric: j for j, metric in enumerate(self.metrics)}
+        self._lock = threading.Lock()
+        data = data.sort_values(["Team", "Year"], kind="mergesort")
+        teams = data["Team"].astype(str).to_numpy()
+        years = data["Year"].to_numpy()
+        values = data[self.metrics].to_numpy(dtype=float)
+        # 정렬된 팀 코드가 바뀌는 위치로 팀별 구간을 나눔 (팀마다 한 번만 잘라 둠)
+        boundaries = np.flatnonzero(teams[1:] != teams[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(teams)]])
+        self.series = {
+            teams[start]: TeamSeries(years[start:stop], values[start:stop])
+            for start, stop in zip(starts, stops)
+        }
+
+    @property
+    def teams(self):
+        # 시즌이 많은 팀부터 (같으면 팀 코드순)
+        return sorted(self.series, key=lambda team: (-len(self.series[team]), team))
+
+    def label(self, team):
+        name = TEAM_NAME_MAPPING.get(team)
+        return f"{team} ({name})" if name else team
+
+    def year_range(self, team):
+        years = self.series[team].years
+        return int(years[0]), int(years[-1])
+
+    def trend(self, team, metric, window=5, start_year=None, end_year=None):
+        # 연도 구간의 (연도, 값, 이동 평균, 이동 표준편차) (앞의 셋은 저장된 배열의 조각)
+        with self._lock:
+            series = self.series[team]
+            j = self._metric_index[metric]
+            start, stop = series.span(start_year, end_year)
+            mean, std = series.rolling(j, window, start, stop)
+            return series.years[start:stop], series.values[start:stop, j], mean, std
+
+    def append(self, team, year, values):
+        # 새 시즌 추가: values는 {지표: 값}. 팀의 마지막 시즌보다 뒤면 이어 붙이고,
+        # 중간 연도이거나 이미 있는 시즌이면 그 팀만 다시 만듦
+        row = [values[metric] for metric in self.metrics]
+        with self._lock:
+            series = self.series.get(team)
+            if series is None:
+                self.series[team] = TeamSeries([year], [row])
+            elif year > series.years[-1]:
+                series.append(year, row)
+            else:
+                keep = series.years != year
+                years = np.append(series.years[keep], year)
+                rows = np.vstack([series.values[keep], row])
+                order = np.argsort(years, kind="mergesort")
+                self.series[team] = TeamSeries(years[order], rows[order])
+
+
+def downsample_lttb(x, y, max_points=MAX_POINTS):
+    # Largest-Triangle-Three-Buckets: 처음과 끝 점을 두고, 구간마다 앞뒤 점과 만드는
+    # 삼각형 넓이가 가장 큰 점을 골라 선 모양을 유지하며 점 수를 줄임. 고른 점의 위치를 반환
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    picked = np.empty(max_points, dtype=np.intp)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 구간의 평균 점 (마지막 구간은 끝 점)
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def get_trend_store():
+    # 프로세스당 한 번만 데이터를 읽어 모든 세션이 공유 (CSV가 바뀌면 다시 읽음)
+    def loader():
+        data = read_table(TEAM_AVERAGES_FILE, read_team_averages, ["Team", "Year"] + TREND_METRICS)
+        return TeamTrendStore(data), TEAM_AVERAGES_FILE, project_path(TEAM_AVERAGES_FILE)
+
+    return load_once("team_trends", loader, file_version(project_path(TEAM_AVERAGES_FILE)))
+
@@ -0,0 +1,167 @@
+# 트리 모델 예측을 맡는 작업 프로세스 풀
+#
+# 트리 순회는 GIL을 쥔 채 실행되는 부분이 많아서, Streamlit 프로세스 안에서 큰 모델로
+# 예측하면 같은 서버의 다른 세션 화면까지 멈춤. INFERENCE_WORKERS개의 작업 프로세스에
+# 예측을 넘기면 여러 코어에서 실행되고 Streamlit 스레드는 결과만 기다림.
+#
+# 리눅스에서는 Streamlit 프로세스를 fork해서 작업 프로세스를 띄움.
+# (spawn/forkserver는 작업 프로세스가 __main__을 다시 import하는데, Streamlit은 실행 중인 페이지
+# 스크립트를 __main__으로 바꿔 두므로 작업 프로세스마다 페이지 전체가 다시 실행됨)
+# fork 시점에 세션/배치/메트릭 스레드가 쥐고 있던 잠금은 작업 프로세스에 잠긴 채로 복사되므로,
+# 작업 프로세스가 예측 중에 쓰는 모듈 잠금(모델 레지스트리, 계측)은 fork 직후 새로 만듦.
+# 풀을 만들기 전에 배치 서비스가 쓰는 모델(BATCHED_MODELS)을 Streamlit 프로세스에 먼저 로드하므로,
+# 작업 프로세스는 fork 시점의 모델을 copy-on-write로 공유하고 각자 다시 로드하지 않음.
+# (flat 배열 변환본이 없어 pickle 모델을 쓰는 경우에도 모델 메모리는 한 벌만 사용)
+# fork를 쓸 수 없는 환경(맥, 윈도우)에서는 풀 없이 Streamlit 프로세스 안에서 예측함.
+# 예측이 INFERENCE_TIMEOUT초 안에 끝나지 않으면 그 예측만 TimeoutError로 실패시키고 풀을 다시 만듦.
+# 이때 함께 종료된 다른 세션의 예측은 새 풀에 다시 넘기며, Streamlit 프로세스 안에서 대신 예측하지 않음.
+import gc  # fork 전 로드한 객체를 가비지 컬렉터 추적에서 제외
+import os  # fork 후 처리 등록
+import sys  # 실행 환경 확인
+import threading  # 풀 생성 잠금, 시간 초과 감시
+import multiprocessing  # 작업 프로세스 시작 방식 선택
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.설정 import INFERENCE_WORKERS, INFERENCE_TIMEOUT
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _use_fork():
+    # 맥은 fork 후 시스템 라이브러리가 멈출 수 있어 제외
+    return "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+
+
+def _reinit_after_fork():
+    # fork 직후 작업 프로세스에서 실행: 부모의 다른 스레드가 쥐고 있었을 수 있는 잠금을 새로 만듦
+    import utils.계측 as metrics  # 이미 import된 모듈 (fork 후 import 잠금은 Python이 다시 만듦)
+    import utils.공통함수 as common
+
+    global _pool, _pool_lock
+    metrics._lock = threading.Lock()
+    common._locks_guard = threading.Lock()
+    common._locks = {}
+    _pool, _pool_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def _preload_models():
+    # 작업 프로세스가 fork로 공유하도록 배치 서비스의 모델을 현재 프로세스에 로드
+    from utils.공통함수 import get_predictor, get_pipeline
+    from utils.배치서버 import BATCHED_MODELS
+
+    for name, pipeline_name in BATCHED_MODELS.items():
+        if pipeline_name is None:
+            get_predictor(name)
+        else:
+            get_pipeline(pipeline_name)
+    # 로드한 객체를 가비지 컬렉터가 훑으며 참조 정보를 고치면 작업 프로세스마다 페이지가 복사되므로 고정
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def get_pool():
+    # 프로세스당 하나의 작업 프로세스 풀 (INFERENCE_WORKERS가 0이거나 fork를 쓸 수 없으면 None)
+    global _pool
+    if INFERENCE_WORKERS <= 0 or not _use_fork():
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _preload_models()
+            _pool = ProcessPoolExecutor(INFERENCE_WORKERS, mp_context=multiprocessing.get_context("fork"))
+        return _pool
+
+
+def _reset_pool(pool, terminate=False):
+    # 작업 프로세스가 비정상 종료됐거나 응답이 없는 풀은 버리고 다음 요청 때 새로 만듦
+    # terminate: 멈춘 작업 프로세스를 종료 (shutdown은 실행 중인 작업을 기다리지 않을 뿐 끝내지는 않음)
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    if terminate:
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False)
+
+
+def _run_local(result, func, args):
+    try:
+        result.set_result(func(*args))
+    except Exception as e:
+        result.set_exception(e)
+
+
+def submit(func, *args, timeout=INFERENCE_TIMEOUT):
+    # func(*args)를 작업 프로세스에서 실행하고 결과를 받을 Future를 바로 반환 (풀을 쓰지 않으면 바로 실행)
+    # 결과는 작업 프로세스가 끝낸 시점에 풀의 결과 스레드에서 채워지므로 호출한 스레드는 기다리지 않음
+    # timeout초 안에 끝나지 않으면 Future는 TimeoutError로 실패함
+    result = Future()
+    if get_pool() is None:
+        _run_local(result, func, args)
+        return result
+    _submit_to_pool(result, func, args, timeout, retries=1)
+    return result
+
+
+def _submit_to_pool(result, func, args, timeout, retries):
+    # 풀에 넘기고 결과를 result에 채움. 풀이 깨지면 (다른 예측의 시간 초과로 종료된 경우 등)
+    # retries번까지 새 풀에 다시 넘김
+    pool = get_pool()
+    try:
+        inner = pool.submit(func, *args)
+    except (BrokenProcessPool, RuntimeError) as e:
+        # 깨졌거나 이미 닫힌 풀
+        _reset_pool(pool)
+        if retries > 0:
+            _submit_to_pool(result, func, args, timeout, retries - 1)
+        else:
+            result.set_exception(e)
+        return
+
+    # 작업 완료와 시간 초과 중 먼저 일어난 쪽만 결과를 채움
+    claim = threading.Lock()
+
+    def on_timeout():
+        if claim.acquire(blocking=False):
+            result.set_exception(TimeoutError(f"예측이 {timeout:.0f}초 안에 끝나지 않았습니다. 잠시 후 다시 시도해 주세요"))
+            # 멈춘 작업 프로세스를 끝내려면 풀 전체를 종료해야 함 (다음 요청부터 새 풀 사용)
+            _reset_pool(pool, terminate=True)
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.daemon = True
+    timer.start()
+
+    def on_done(future):
+        timer.cancel()
+        if not claim.acquire(blocking=False):
+            return
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool) and retries > 0:
+            _reset_pool(pool)
+            _submit_to_pool(result, func, args, timeout, retries - 1)
+        elif error is not None:
+            result.set_exception(error)
+        else:
+            result.set_result(future.result())
+
+    inner.add_done_callback(on_done)
+
+
+def run_in_pool(func, *args):
+    # 작업 프로세스에서 실행하고 결과를 기다림 (시간 초과 시 TimeoutError)
+    return submit(func, *args).result()
+
+
+def pool_info():
+    # 풀 설정 요약 (모델 로드 정보 표시용)
+    return {
+        "workers": max(INFERENCE_WORKERS, 0) if _use_fork() else 0,
+        "start_method": "fork",
+        "started": _pool is not None,
+    }
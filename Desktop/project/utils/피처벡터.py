@@ -0,0 +1,146 @@
+# 모델 입력 벡터 조립 (예측 페이지 공용)
+#
+# 페이지마다 평균값 배열 복사, np.zeros 패딩, 전체 피처 dict -> 한 행 DataFrame 생성 등
+# 서로 다른 방식으로 입력을 만들던 부분을 스키마 하나로 모음.
+# 스키마는 모델(또는 스케일러)이 요구하는 피처 수와 각 입력이 들어갈 열 번호를 갖고 있고,
+# 한 행은 스레드마다 재사용하는 버퍼에, 여러 행은 행렬 하나에 채움.
+import threading  # 스레드별 버퍼와 스키마 생성 잠금
+
+import numpy as np  # 수치 연산 및 배열 계산을 위한 라이브러리
+
+from utils.공통함수 import load_model, get_predictor
+
+# 스키마 정의: 이름 -> (모델, 피처 수를 알려줄 스케일러, 입력하지 않은 피처 값, 입력 피처 목록, 자료형)
+# 피처 이름으로 학습된 모델은 이름으로, 그 외에는 입력 순서대로 앞쪽 열부터 채움
+# 스케일러를 거치지 않는 모델은 트리가 비교하는 float32로 바로 만들어 변환을 생략
+SCHEMAS = {
+    # 포스트시즌 진출 예측 (rf_model.feature_names_in_ 기준)
+    "postseason": {
+        "model": "rf_model",
+        "scaler": None,
+        "fill_value": 0.0,
+        "inputs": ['승률', '승리횟수', '세이브_횟수', '총_실점수', '홈런횟수', '2루타횟수', '타자_삼진횟수'],
+        "dtype": np.float32,
+    },
+    # 선수 연봉 예측 (나머지 피처는 평균값으로 채움)
+    "hitter_salary": {
+        "model": "hitter_model",
+        "scaler": "hitter_scaler",
+        "fill_value": 100.0,
+        "inputs": ['볼넷 횟수', '삼진 횟수', '홈런', '도루 성공 횟수', '도루 실패 횟수',
+                   '경기수', '타석수', '장타율', '타율', '출루율'],
+    },
+    "pitcher_salary": {
+        "model": "pitcher_model",
+        "scaler": "pitcher_scaler",
+        "fill_value": 50.0,
+        "inputs": ['평균자책점', 'WHIP', '삼진/볼넷 비율', '투구 이닝', '세이브', '삼진'],
+    },
+    # 로스터 일괄 연봉 예측 (연봉 전용 모델, 입력은 연봉 예측 화면과 동일)
+    "hitter_salary_roster": {
+        "model": "hitter_model_salary",
+        "scaler": "hitter_scaler_salary",
+        "fill_value": 100.0,
+        "inputs": ['볼넷 횟수', '삼진 횟수', '홈런', '도루 성공 횟수', '도루 실패 횟수',
+                   '경기수', '타석수', '장타율', '타율', '출루율'],
+    },
+    "pitcher_salary_roster": {
+        "model": "pitcher_model_salary",
+        "scaler": "pitcher_scaler_salary",
+        "fill_value": 50.0,
+        "inputs": ['평균자책점', 'WHIP', '삼진/볼넷 비율', '투구 이닝', '세이브', '삼진'],
+    },
+    # 선수 커리어 예측 (나머지 피처는 0으로 채움)
+    "hitter_career": {
+        "model": "hitter_model",
+        "scaler": "hitter_scaler",
+        "fill_value": 0.0,
+        "inputs": ['통산 경기', '출생 연도', '데뷔 당시 나이', '포지션 다양성 비율', '연도',
+                   '몸무게', '마지막 경기 일수', '데뷔 이후 경과 일수', '키', '마지막 경기 월'],
+    },
+    "pitcher_career": {
+        "model": "pitcher_model",
+        "scaler": "pitcher_scaler",
+        "fill_value": 0.0,
+        "inputs": ['통산 투구 이닝', '출생 연도', '데뷔 당시 나이', '통산 삼진 개수', '통산 승리 수',
+                   '평균자책점', '몸무게', '마지막 경기 일수', '데뷔 이후 경과 일수', '키'],
+    },
+}
+
+
+class FeatureSchema:
+    # 모델 입력 한 행의 모양 (피처 수, 입력별 열 번호, 기본값)
+
+    def __init__(self, name, inputs, n_features, fill_value=0.0, feature_names=None, dtype=np.float64):
+        self.name = name
+        self.inputs = list(inputs)
+        self.n_features = n_features
+        self.fill_value = fill_value
+        self.dtype = np.dtype(dtype)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        if self.feature_names is not None:
+            index = {feature: i for i, feature in enumerate(self.feature_names)}
+            missing = [feature for feature in self.inputs if feature not in index]
+            if missing:
+                raise KeyError(f"{name}: 모델에 없는 피처입니다: {', '.join(missing)}")
+            self.columns = np.array([index[feature] for feature in self.inputs], dtype=np.intp)
+        else:
+            if len(self.inputs) > n_features:
+                raise ValueError(f"{name}: 입력 {len(self.inputs)}개가 모델 피처 수 {n_features}보다 많습니다")
+            self.columns = np.arange(len(self.inputs), dtype=np.intp)
+        self._template = np.full(n_features, fill_value, dtype=self.dtype)
+        self._local = threading.local()
+
+    def _values(self, values):
+        # 입력 순서의 목록 또는 {입력 이름: 값} dict를 입력 순서의 목록으로
+        if isinstance(values, dict):
+            return [values[feature] for feature in self.inputs]
+        if len(values) != len(self.inputs):
+            raise ValueError(f"{self.name}: 입력값 {len(self.inputs)}개가 필요합니다 (받은 값 {len(values)}개)")
+        return values
+
+    def row(self, values):
+        # 한 행 입력 벡터 (스레드마다 하나의 버퍼를 재사용하므로, 보관하려면 copy() 필요)
+        buffer = getattr(self._local, "row", None)
+        if buffer is None:
+            buffer = self._local.row = np.empty_like(self._template)
+        buffer[:] = self._template
+        buffer[self.columns] = self._values(values)
+        return buffer
+
+    def matrix(self, columns, n_rows, out=None):
+        # 여러 행 입력 행렬: columns는 {입력 이름: 값 배열}, 없는 입력과 비어 있는 값(NaN)은 기본값
+        X = out if out is not None else np.empty((n_rows, self.n_features), dtype=self.dtype)
+        X[:] = self._template
+        for feature, j in zip(self.inputs, self.columns):
+            if feature in columns:
+                values = np.asarray(columns[feature], dtype=self.dtype)
+                X[:, j] = np.where(np.isnan(values), self.fill_value, values)
+        return X
+
+
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def _build_schema(name):
+    # 피처 이름이 있으면 모델에서, 없으면 스케일러의 n_features_in_에서 피처 수를 가져옴
+    spec = SCHEMAS[name]
+    if spec["scaler"] is not None:
+        n_features = load_model(spec["scaler"]).n_features_in_
+        feature_names = None
+    else:
+        model = get_predictor(spec["model"])
+        feature_names = list(model.feature_names_in_)
+        n_features = len(feature_names)
+    return FeatureSchema(name, spec["inputs"], n_features, spec["fill_value"], feature_names, spec.get("dtype", np.float64))
+
+
+def get_schema(name):
+    # 이름으로 스키마를 가져옴 (프로세스당 한 번만 만들어 모든 세션이 공유)
+    if name not in SCHEMAS:
+        raise KeyError(f"등록되지 않은 피처 스키마입니다: {name}")
+    with _schemas_lock:
+        if name not in _schemas:
+            _schemas[name] = _build_schema(name)
+        return _schemas[name]
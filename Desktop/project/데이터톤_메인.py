@@ -10,6 +10,7 @@ from streamlit_echarts import st_echarts  # Echarts 기반의 데이터 시각
 import os  # 운영 체제 작업 (파일 경로, 디렉토리 작업 등)
 import base64  # 데이터 인코딩 및 디코딩 (파일 다운로드 링크 생성 등에 사용)
 import streamlit.components.v1 as components  # HTML/CSS/JS를 삽입하여 Streamlit 확장
+from utils.계측 import begin_rerun  # 페이지 재실행 소요 시간 기록
 
 
 # 페이지 설정
@@ -19,6 +20,15 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이번 재실행의 전체 소요 시간 기록 (관리자 화면: 메인 페이지 주소 뒤에 ?admin=1)
+page_run = begin_rerun("main")
+
+# 숨겨진 관리자 화면: 단계별 소요 시간/메모리/캐시 적중 통계
+if st.query_params.get("admin") == "1":
+    from utils.계측 import render_admin_panel
+    render_admin_panel()
+    st.stop()
+
 
 
 # 사이드바 상단에 제목 추가
@@ -93,4 +103,4 @@ menu = st.sidebar.radio(
     )
 )
 
-
+page_run.finish()